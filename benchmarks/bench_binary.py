@@ -0,0 +1,44 @@
+"""Benchmark of the binary encoding against pickle and YAML.
+
+This encodes and decodes a document with mixed reference types in
+each way, and reports the times and the size of the result.
+
+Run with ``python benchmarks/bench_binary.py``.
+"""
+import pickle
+import timeit
+
+from corpus import generate_cff
+from pycff import pycff
+from pycff.binary import decode, encode
+
+
+def _time(func, number: int = 5) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+if __name__ == '__main__':
+    num_references = 500
+    cff = pycff.load(generate_cff(
+            seed=1, num_references=num_references, num_identifiers=2,
+            reference_types={
+                'article': 4, 'book': 2, 'conference-paper': 2,
+                'software': 1}))
+
+    methods = [
+            ('binary', encode, decode),
+            ('pickle',
+             lambda cff: pickle.dumps(cff, pickle.HIGHEST_PROTOCOL),
+             pickle.loads),
+            ('yaml', pycff.dumps, pycff.load)]
+
+    print('{} references:'.format(num_references))
+    print('{:8} {:>12} {:>12} {:>12}'.format(
+        'format', 'encode', 'decode', 'size'))
+    for name, encode_func, decode_func in methods:
+        data = encode_func(cff)
+        print('{:8} {:9.2f} ms {:9.2f} ms {:9.1f} kB'.format(
+            name,
+            _time(lambda: encode_func(cff)) * 1e3,
+            _time(lambda: decode_func(data), 1) * 1e3,
+            len(data) / 1e3))
@@ -0,0 +1,44 @@
+"""Benchmark of converting references to columns.
+
+This converts the references of many copies of a document with mixed
+reference types to columns, and compares with converting each
+reference to a dict.
+
+Run with ``python benchmarks/bench_columnar.py``.
+"""
+import time
+
+from corpus import generate_cff
+from pycff import pycff
+from pycff.columnar import to_columns
+
+
+if __name__ == '__main__':
+    num_documents = 20
+    cff = pycff.load(generate_cff(
+            seed=1, num_references=5000, num_identifiers=2,
+            reference_types={
+                'article': 4, 'book': 2, 'conference-paper': 2,
+                'software': 1}))
+    documents = [cff] * num_documents
+    num_references = len(cff.references) * num_documents
+    print('Converting {} references:'.format(num_references))
+
+    def report(name: str, elapsed: float) -> None:
+        print('{:16} {:8.1f} ms {:8.2f} us per reference'.format(
+            name, elapsed * 1e3, elapsed / num_references * 1e6))
+
+    start = time.perf_counter()
+    rows = [
+            reference.to_dict()
+            for document in documents for reference in document.references]
+    report('to_dict', time.perf_counter() - start)
+    del rows
+
+    start = time.perf_counter()
+    to_columns(documents)
+    report('all fields', time.perf_counter() - start)
+
+    start = time.perf_counter()
+    to_columns(documents, ['typ', 'year', 'doi', 'journal', 'license'])
+    report('five fields', time.perf_counter() - start)
@@ -0,0 +1,57 @@
+"""Benchmark of finding duplicate references.
+
+This generates references of which about a fifth are duplicates of
+another one, with a differently cased DOI or title, and measures the
+time taken to index them and to find the groups of duplicates.
+
+Run with ``python benchmarks/bench_dedup.py [number of references]``.
+"""
+import random
+import sys
+import time
+
+from pycff import pycff
+from pycff.dedup import ReferenceIndex
+
+
+def _make_references(number: int):
+    rng = random.Random(0)
+    authors = [pycff.Person(name, 'J.') for name in ('Doe', 'Wu', 'Jansen')]
+    references = list()
+    for i in range(number):
+        if i > 0 and rng.random() < 0.2:
+            # duplicate of an earlier one, same DOI or same title
+            j = rng.randrange(i)
+            if rng.random() < 0.5:
+                doi = '10.1234/REF.{}'.format(j)
+                title = 'Other title {}'.format(i)
+            else:
+                doi = None
+                title = 'INTERESTING RESULTS, PART {}'.format(j)
+            year = 1990 + j % 30
+        else:
+            doi = '10.1234/ref.{}'.format(i)
+            title = 'Interesting results, part {}'.format(i)
+            year = 1990 + i % 30
+        references.append(pycff.Reference(
+            'article', [authors[i % 3 if doi else j % 3]], title, doi=doi,
+            year=year))
+    return references
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    references = _make_references(number)
+
+    start = time.perf_counter()
+    index = ReferenceIndex(references)
+    indexed = time.perf_counter()
+    duplicates = index.duplicates()
+    grouped = time.perf_counter()
+
+    print('{} references, {} groups of duplicates'.format(
+        number, len(duplicates)))
+    print('indexing: {:8.2f} s, {:5.2f} us per reference'.format(
+        indexed - start, (indexed - start) / number * 1e6))
+    print('grouping: {:8.2f} s, {:5.2f} us per reference'.format(
+        grouped - indexed, (grouped - indexed) / number * 1e6))
@@ -0,0 +1,34 @@
+"""Benchmark of exporting references to other formats.
+
+This exports a document with many references of mixed types to each
+format, streaming the output to a null stream.
+
+Run with ``python benchmarks/bench_export.py``.
+"""
+import io
+import time
+
+from corpus import generate_cff
+from pycff import pycff
+from pycff.export import export, formats
+
+
+class _NullStream(io.TextIOBase):
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+if __name__ == '__main__':
+    num_references = 5000
+    cff = pycff.load(generate_cff(
+            seed=1, num_references=num_references, num_identifiers=2,
+            reference_types={
+                'article': 4, 'book': 2, 'conference-paper': 2,
+                'software': 1}))
+    print('Exporting {} references:'.format(num_references))
+    for output_format in formats:
+        start = time.perf_counter()
+        export(cff, output_format, _NullStream())
+        elapsed = time.perf_counter() - start
+        print('{:10} {:8.1f} ms {:8.2f} us per reference'.format(
+            output_format, elapsed * 1e3, elapsed / num_references * 1e6))
@@ -0,0 +1,57 @@
+"""Benchmark of importing references from BibTeX and CSL-JSON.
+
+This writes a large library in each format to a temporary file, and
+imports it again, reporting the time taken and the peak memory used
+while importing, which stays small because the file is read a piece
+at a time and the references are not kept.
+
+Run with ``python benchmarks/bench_import.py [jobs]``.
+"""
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from corpus import generate_cff
+from pycff import pycff
+from pycff.export import export
+from pycff.importers import iter_bibtex, iter_csl_json
+
+
+if __name__ == '__main__':
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    # loading a document this large would take a while, so repeat a
+    # smaller one
+    cff = pycff.load(generate_cff(
+            seed=1, num_references=5000, reference_types={
+                'article': 4, 'book': 2, 'conference-paper': 2,
+                'software': 1}))
+    num_references = 10 * len(cff.references)
+
+    print('Importing {} references using {} process(es):'.format(
+        num_references, jobs))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, iter_import in (
+                ('bibtex', iter_bibtex), ('csl-json', iter_csl_json)):
+            path = Path(tmp_dir) / 'library'
+            with path.open('w', encoding='utf-8') as f:
+                export(cff.references * 10, name, f)
+            size = path.stat().st_size
+
+            start = time.perf_counter()
+            count = sum(1 for _ in iter_import(path, jobs))
+            elapsed = time.perf_counter() - start
+            assert count == num_references
+
+            # tracing slows things down a lot, so do a separate run
+            tracemalloc.start()
+            for _ in iter_import(path, jobs):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            print('{:10} {:6.1f} MB {:8.2f} s {:6.1f} us per reference,'
+                  ' peak {:.1f} MB'.format(
+                      name, size / 1e6, elapsed, elapsed / count * 1e6,
+                      peak / 1e6))
@@ -0,0 +1,34 @@
+"""Benchmark of reloading an edited document.
+
+This compares loading a document with many references in full, with
+reloading it incrementally after changing a single reference.
+
+Run with ``python benchmarks/bench_incremental.py``.
+"""
+import time
+
+from corpus import generate_cff
+from pycff import pycff
+from pycff.incremental import IncrementalLoader
+
+
+if __name__ == '__main__':
+    print('{:>10} {:>12} {:>12}'.format(
+        'references', 'full', 'incremental'))
+    for num_references in (100, 500, 2000):
+        text = generate_cff(seed=1, num_references=num_references)
+        edited = text.replace('part 7\n', 'part seven\n')
+
+        start = time.perf_counter()
+        pycff.load(edited)
+        full = time.perf_counter() - start
+
+        loader = IncrementalLoader()
+        loader.load(text)
+        start = time.perf_counter()
+        loader.load(edited)
+        incremental = time.perf_counter() - start
+        assert loader.rebuilt_references == 1
+
+        print('{:10} {:9.1f} ms {:9.1f} ms'.format(
+            num_references, full * 1e3, incremental * 1e3))
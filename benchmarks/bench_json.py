@@ -0,0 +1,35 @@
+"""Benchmark of the JSON paths against the YAML ones.
+
+This compares load_json() with load(), and dumps_json() with dumps(),
+on identical content.
+
+Run with ``python benchmarks/bench_json.py``.
+"""
+import json
+import timeit
+
+import yaml
+
+from corpus import generate_cff
+from pycff import pycff
+
+
+def _time(func, number: int = 20) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+if __name__ == '__main__':
+    print('{:>10} {:>12} {:>12} {:>12} {:>12}'.format(
+        'references', 'load', 'load_json', 'dumps', 'dumps_json'))
+    for num_references in (0, 10, 100):
+        yaml_text = generate_cff(seed=1, num_references=num_references)
+        json_text = json.dumps(yaml.safe_load(yaml_text), default=str)
+        cff = pycff.load(yaml_text)
+        assert pycff.load_json(json_text).title == cff.title
+
+        print('{:10} {:9.2f} ms {:9.2f} ms {:9.2f} ms {:9.2f} ms'.format(
+            num_references,
+            _time(lambda: pycff.load(yaml_text)) * 1e3,
+            _time(lambda: pycff.load_json(json_text)) * 1e3,
+            _time(lambda: pycff.dumps(cff)) * 1e3,
+            _time(lambda: cff.dumps_json()) * 1e3))
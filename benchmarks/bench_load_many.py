@@ -0,0 +1,49 @@
+"""Benchmark of loading a corpus of files with load_many().
+
+This generates a corpus of CITATION.cff files in a temporary
+directory, then loads it with an increasing number of workers.
+
+Run with ``python benchmarks/bench_load_many.py [num_files]``.
+"""
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+from corpus import generate_cff
+from pycff.batch import load_many
+
+
+def _write_corpus(directory: Path, num_files: int) -> list:
+    paths = []
+    for i in range(num_files):
+        path = directory / 'CITATION{}.cff'.format(i)
+        path.write_text(generate_cff(seed=i, num_references=i % 5))
+        paths.append(path)
+    return paths
+
+
+if __name__ == '__main__':
+    num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = _write_corpus(Path(tmp_dir), num_files)
+
+        workers = 1
+        baseline = None
+        while workers <= (os.cpu_count() or 1):
+            for chunksize in (1, 16):
+                begin = time.perf_counter()
+                results = load_many(
+                        paths, workers=workers, chunksize=chunksize)
+                elapsed = time.perf_counter() - begin
+                assert all(result.ok for result in results)
+                if baseline is None:
+                    baseline = elapsed
+                print((
+                    '{:3} workers, chunksize {:2}: {:7.2f} s,'
+                    ' {:8.1f} files/s, speedup {:5.2f}').format(
+                        workers, chunksize, elapsed, num_files / elapsed,
+                        baseline / elapsed))
+            workers *= 2
@@ -0,0 +1,55 @@
+"""Benchmark of the memory footprint of model objects.
+
+This measures the memory used per object with tracemalloc, both for
+the model classes, which use __slots__, and for equivalent objects
+that keep their attributes in a per-instance __dict__, as the model
+classes used to.
+
+Run with ``python benchmarks/bench_memory.py``.
+"""
+import tracemalloc
+
+from pycff import pycff
+
+
+class _DictObject:
+    """An object holding attributes in a __dict__, for comparison."""
+    def __init__(self, obj: object) -> None:
+        for name in type(obj).__slots__:
+            setattr(self, name, getattr(obj, name))
+
+
+def _make_person(i: int) -> pycff.Person:
+    return pycff.Person('Doe', 'John', email='j.doe{}@example.com'.format(i))
+
+
+def _make_entity(i: int) -> pycff.Entity:
+    return pycff.Entity('Science \'r Us Ltd. {}'.format(i), city='Amsterdam')
+
+
+def _make_reference(i: int) -> pycff.Reference:
+    return pycff.Reference(
+            'article', [], 'Interesting results {}'.format(i),
+            doi='10.1234/{}'.format(i), year=2020)
+
+
+def _measure(make, number: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [make(i) for i in range(number)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / number
+
+
+if __name__ == '__main__':
+    number = 10000
+    print('{:12} {:>12} {:>12}'.format('Class', '__dict__', '__slots__'))
+    for make in (_make_person, _make_entity, _make_reference):
+        # Construct the strings for each object separately in both
+        # cases, so that the difference is due to the objects alone.
+        with_dict = _measure(lambda i: _DictObject(make(i)), number)
+        with_slots = _measure(make, number)
+        print('{:12} {:10.0f} B {:10.0f} B'.format(
+            make(0).__class__.__name__, with_dict, with_slots))
@@ -0,0 +1,54 @@
+"""Benchmark of loading many documents with and without pooling.
+
+This loads several copies of a few distinct documents, and measures
+the memory that the loaded documents take up, with tracemalloc. With
+pooling, this should grow with the number of distinct documents
+rather than with the number of copies.
+
+Run with ``python benchmarks/bench_pooling.py``.
+"""
+import gc
+import time
+import tracemalloc
+
+from corpus import generate_cff
+from pycff import pycff
+from pycff.pooling import pooling
+
+
+def _load(texts, pooled: bool):
+    if pooled:
+        with pooling():
+            return [pycff.load(text) for text in texts]
+    return [pycff.load(text) for text in texts]
+
+
+def _time(texts, pooled: bool) -> float:
+    start = time.perf_counter()
+    _load(texts, pooled)
+    return time.perf_counter() - start
+
+
+def _memory(texts, pooled: bool) -> int:
+    # tracemalloc slows down loading, so this is a separate run
+    gc.collect()
+    tracemalloc.start()
+    documents = _load(texts, pooled)
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del documents
+    return memory
+
+
+if __name__ == '__main__':
+    distinct = [
+            generate_cff(seed=seed, num_references=20, num_identifiers=2)
+            for seed in range(4)]
+    print('{:>10} {:>12} {:>12} {:>12} {:>12}'.format(
+        'documents', 'time', 'pooled time', 'memory', 'pooled memory'))
+    for copies in (1, 4, 16):
+        texts = distinct * copies
+        print('{:10} {:9.2f} s {:9.2f} s {:9.0f} kB {:9.0f} kB'.format(
+            len(texts), _time(texts, False), _time(texts, True),
+            _memory(texts, False) / 1e3, _memory(texts, True) / 1e3))
@@ -0,0 +1,152 @@
+"""Benchmark suite for the load, validate and dump hot paths.
+
+This generates documents of various shapes with the corpus generator,
+and measures for each of them the time taken to parse the YAML, to
+load it into objects (parsing, recognition and validation together),
+to validate the loaded objects, and to dump them again, as well as the
+peak memory use while loading.
+
+Results can be saved to a JSON file, and compared against a saved
+baseline, e.g. that of the previous release, in which case the exit
+status is non-zero if anything got slower or bigger by more than the
+given threshold.
+
+Run with ``python benchmarks/bench_suite.py [--save FILE]
+[--compare FILE [--threshold FRACTION]]``.
+"""
+import argparse
+from collections import OrderedDict
+import json
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+import yaml
+
+from corpus import generate_cff
+from pycff import pycff
+from pycff.validation import check_object
+
+
+_mixed_types = {
+        'article': 3.0, 'book': 2.0, 'conference-paper': 1.0,
+        'software': 1.0}
+
+
+# name -> arguments for generate_cff()
+_scenarios = [
+        ('small', dict(num_authors=3)),
+        ('authors', dict(num_authors=200)),
+        ('articles', dict(num_references=300)),
+        ('mixed', dict(
+            num_references=300, num_identifiers=20,
+            reference_types=_mixed_types)),
+        ('books', dict(num_references=300, reference_types={'book': 1.0})),
+        ('identifiers', dict(num_identifiers=500)),
+        ]   # type: List[Tuple[str, Dict[str, Any]]]
+
+
+_phases = ['parse', 'load', 'validate', 'dump']
+
+
+def _time(func: Callable[[], Any]) -> float:
+    """Measures the time per call, in seconds."""
+    # aim for about a tenth of a second per repeat
+    number = max(1, int(0.1 / max(timeit.timeit(func, number=1), 1e-6)))
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def _peak_memory(func: Callable[[], Any]) -> int:
+    """Measures the peak memory allocated during a call, in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_scenario(kwargs: Dict[str, Any]) -> Dict[str, float]:
+    """Runs the benchmarks for a single scenario.
+
+    Returns:
+        The size of the document in bytes, the time per phase in
+        seconds, and the peak memory use when loading in bytes.
+    """
+    text = generate_cff(seed=1, **kwargs)
+    cff = pycff.load(text)
+    assert not check_object(cff)
+
+    results = {'size': len(text.encode('utf-8'))}  # type: Dict[str, float]
+    results['parse'] = _time(
+            lambda: yaml.compose(text, Loader=yaml.SafeLoader))
+    results['load'] = _time(lambda: pycff.load(text))
+    results['validate'] = _time(lambda: check_object(cff))
+    results['dump'] = _time(lambda: pycff.dumps(cff))
+    results['memory'] = _peak_memory(lambda: pycff.load(text))
+    return results
+
+
+def _print_results(results: Dict[str, Dict[str, float]]) -> None:
+    print('{:12} {:>9}'.format('scenario', 'size') + ''.join(
+        '{:>14}'.format(phase) for phase in _phases) + '{:>12}'.format(
+            'memory'))
+    for name, result in results.items():
+        line = '{:12} {:6.0f} kB'.format(name, result['size'] / 1e3)
+        for phase in _phases:
+            line += '{:9.2f} MB/s'.format(
+                    result['size'] / result[phase] / 1e6)
+        line += '{:9.1f} MB'.format(result['memory'] / 1e6)
+        print(line)
+
+
+def _compare(
+        results: Dict[str, Dict[str, float]],
+        baseline: Dict[str, Dict[str, float]],
+        threshold: float) -> bool:
+    """Compares results to a baseline, and reports regressions.
+
+    Returns:
+        True iff nothing regressed by more than the threshold.
+    """
+    ok = True
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for measure in _phases + ['memory']:
+            ratio = result[measure] / baseline[name][measure]
+            if ratio > 1.0 + threshold:
+                print('Regression: {} {} is {:.0f}% worse than baseline'
+                      .format(name, measure, (ratio - 1.0) * 100.0))
+                ok = False
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--save', help='Save the results to this file.')
+    parser.add_argument('--compare', help='Compare to results in this file.')
+    parser.add_argument(
+            '--threshold', type=float, default=0.2,
+            help='Fraction by which results may be worse than the baseline.')
+    args = parser.parse_args()
+
+    results = OrderedDict()     # type: Dict[str, Dict[str, float]]
+    for name, kwargs in _scenarios:
+        results[name] = run_scenario(kwargs)
+    _print_results(results)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if not _compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
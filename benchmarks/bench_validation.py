@@ -0,0 +1,130 @@
+"""Micro-benchmark of per-object validation cost.
+
+This compares validating fields by matching against the raw pattern
+strings through the re module (the old way, which depends on the re
+module's cache), against the precompiled validators in the registry.
+It also shows the worst time per field over some hostile inputs.
+
+Run with ``python benchmarks/bench_validation.py``.
+"""
+from datetime import datetime
+import re
+import time
+import timeit
+
+from pycff import pycff
+
+
+_url = 'https://github.com/citation-file-format/pycff/releases/v1.0.0'
+
+_doi = '10.5281/zenodo.1234567'
+
+_orcid = 'https://orcid.org/0000-0002-1825-0097'
+
+
+def _check_arg_regex(value: str, regex: str) -> None:
+    # How fields used to be validated, before the registry
+    if re.fullmatch(regex, value) is None:
+        raise RuntimeError('Invalid value "{}".'.format(value))
+
+
+def _legacy_reference_checks() -> None:
+    # The regex checks the Reference constructor used to do
+    _check_arg_regex(_doi, pycff._regex_doi)
+    _check_arg_regex('1a2b3c4d', pycff._regex_commit)
+    _check_arg_regex(_doi, pycff._regex_doi)
+    for _ in range(4):
+        _check_arg_regex(_url, pycff._regex_url)
+
+
+def _legacy_reference_checks_cold() -> None:
+    # Same, but with the re cache thrashed as it is when many
+    # different patterns are in use
+    re.purge()
+    _legacy_reference_checks()
+
+
+def _registry_reference_checks() -> None:
+    pycff._validators['doi'](_doi)
+    pycff._validators['commit']('1a2b3c4d')
+    pycff._validators['doi'](_doi)
+    for _ in range(4):
+        pycff._validators['url'](_url)
+
+
+def _make_person() -> pycff.Person:
+    return pycff.Person(
+            'Doe', 'John', country='NL', orcid=_orcid,
+            email='j.doe@example.com', website=_url)
+
+
+def _make_entity() -> pycff.Entity:
+    return pycff.Entity(
+            'Science \'r Us Ltd.', email='info@example.com', website=_url,
+            date_start=datetime(2020, 1, 1))
+
+
+def _make_reference() -> pycff.Reference:
+    return pycff.Reference(
+            'software', [], 'pycff', collection_doi=_doi, commit='1a2b3c4d',
+            doi=_doi, license='Apache-2.0', license_url=_url,
+            repository=_url, repository_code=_url, repository_artifact=_url,
+            url=_url)
+
+
+def _make_citation_cff() -> pycff.CitationCFF:
+    return pycff.CitationCFF(
+            '1.1.0', 'Please cite this', 'pycff', '1.0.0', [],
+            datetime(2020, 1, 1), commit='1a2b3c4d', doi=_doi,
+            license='Apache-2.0', license_url=_url, repository=_url,
+            repository_code=_url, repository_artifact=_url, url=_url)
+
+
+# Inputs that take long for naive patterns, of up to 100k characters
+_hostile = {
+        'url': [
+            'http://' + 'aa.' * 33333 + '1', 'http://' + ':' * 100000,
+            'http://' + 'a' * 100000 + '!', 'http://' + 'a-' * 50000,
+            'http://' + 'a:' * 50000 + '@',
+            'http://a.com/' + 'x' * 100000 + ' '],
+        'doi': ['10.' + '1' * 100000, '10.1234/' + '.' * 100000 + ' '],
+        'orcid': ['https://orcid.org/' + '0' * 100000],
+        'email': ['a@' + 'a.' * 50000 + ' ', '@' * 100000, 'a@' * 50000]}
+
+
+def _worst_case(rule: str) -> float:
+    worst = 0.0
+    for value in _hostile[rule]:
+        start = time.perf_counter()
+        try:
+            pycff._validators[rule](value)
+        except RuntimeError:
+            pass
+        worst = max(worst, time.perf_counter() - start)
+    return worst
+
+
+def _report(name: str, func, number: int) -> None:
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    print('{:40} {:8.2f} us'.format(name, best / number * 1e6))
+
+
+if __name__ == '__main__':
+    number = 10000
+    print('Validating the fields of a Reference, per object:')
+    _report('re.fullmatch with pattern strings', _legacy_reference_checks,
+            number)
+    _report('re.fullmatch, cold re cache', _legacy_reference_checks_cold,
+            number // 10)
+    _report('precompiled validator registry', _registry_reference_checks,
+            number)
+    print()
+    print('Constructing objects, per object:')
+    _report('Person', _make_person, number)
+    _report('Entity', _make_entity, number)
+    _report('Reference', _make_reference, number)
+    _report('CitationCFF', _make_citation_cff, number)
+    print()
+    print('Worst case over hostile inputs, per field:')
+    for rule in _hostile:
+        print('{:40} {:8.2f} us'.format(rule, _worst_case(rule) * 1e6))
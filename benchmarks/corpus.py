@@ -0,0 +1,180 @@
+"""Generator for synthetic CITATION.cff documents.
+
+The output is deterministic for a given seed, so that benchmark runs
+can be compared.
+"""
+import random
+from typing import Dict, Optional
+
+
+_family_names = [
+        'Doe', 'Wu', 'Jansen', 'Garcia', 'Smith', 'Müller', 'Kowalski',
+        'Nakamura', 'Okafor', 'Rossi', 'Silva', 'Novak']
+
+_given_names = [
+        'John', 'Jane', 'Stacey', 'Pieter', 'Maria', 'Ahmed', 'Yuki',
+        'Chidi', 'Giulia', 'Ana', 'Tomas', 'Li']
+
+_licenses = ['Apache-2.0', 'MIT', 'GPL-3.0-or-later', 'BSD-3-Clause']
+
+
+def _orcid(rng: random.Random) -> str:
+    digits = '0000000{}{:04d}{:03d}'.format(
+            rng.randint(1, 3), rng.randint(0, 9999),
+            rng.randint(0, 9999) // 10)
+    total = 0
+    for digit in digits:
+        total = (total + int(digit)) * 2
+    check = (12 - total % 11) % 11
+    digits += 'X' if check == 10 else str(check)
+    return '-'.join(digits[i:i + 4] for i in range(0, 16, 4))
+
+
+def _person(rng: random.Random, indent: str) -> str:
+    return (
+            '{0}- family-names: {1}\n'
+            '{0}  given-names: {2}\n'
+            '{0}  orcid: https://orcid.org/{3}\n'
+            ).format(
+                indent, rng.choice(_family_names), rng.choice(_given_names),
+                _orcid(rng))
+
+
+def _authors(rng: random.Random) -> str:
+    text = '    authors:\n'
+    for _ in range(rng.randint(1, 4)):
+        text += _person(rng, '      ')
+    return text
+
+
+def _article(rng: random.Random, i: int) -> str:
+    return (
+            '  - type: article\n'
+            '    title: Interesting results, part {0}\n'
+            '    doi: 10.{1}/{2}\n'
+            '    year: {3}\n'
+            '    journal: Journal of Interesting Results\n').format(
+                i, rng.randint(1000, 9999), rng.randint(1, 10**6),
+                rng.randint(1990, 2020)) + _authors(rng)
+
+
+def _book(rng: random.Random, i: int) -> str:
+    return (
+            '  - type: book\n'
+            '    title: Introduction to Interesting Things, volume {0}\n'
+            '    year: {1}\n'
+            '    edition: "{2}"\n'
+            '    isbn: 978-{3:010d}\n'
+            '    publisher:\n'
+            '      name: Science \'r Us Ltd.\n'
+            '      city: Amsterdam\n').format(
+                i, rng.randint(1950, 2020), rng.randint(1, 5),
+                rng.randint(0, 10**10 - 1)) + _authors(rng)
+
+
+def _software(rng: random.Random, i: int) -> str:
+    return (
+            '  - type: software\n'
+            '    title: library{0}\n'
+            '    version: {1}.{2}.{3}\n'
+            '    license: {4}\n'
+            '    repository-code: https://github.com/example/library{0}\n'
+            '    commit: {5:040x}\n').format(
+                i, rng.randint(0, 3), rng.randint(0, 20), rng.randint(0, 9),
+                rng.choice(_licenses), rng.getrandbits(160)) + _authors(rng)
+
+
+def _conference_paper(rng: random.Random, i: int) -> str:
+    return (
+            '  - type: conference-paper\n'
+            '    title: Interesting results, presentation {0}\n'
+            '    collection-title: Proceedings of Interesting Results {1}\n'
+            '    collection-doi: 10.{2}/{3}\n'
+            '    year: {1}\n'
+            '    start: {4}\n'
+            '    end: {5}\n').format(
+                i, rng.randint(1990, 2020), rng.randint(1000, 9999),
+                rng.randint(1, 10**6), rng.randint(1, 100),
+                rng.randint(101, 200)) + _authors(rng)
+
+
+_reference_generators = {
+        'article': _article,
+        'book': _book,
+        'conference-paper': _conference_paper,
+        'software': _software}
+
+
+def _identifier(rng: random.Random, i: int) -> str:
+    typ = rng.choice(['doi', 'url', 'swh'])
+    if typ == 'doi':
+        value = '10.{}/zenodo.{}'.format(
+                rng.randint(1000, 9999), rng.randint(1, 10**7))
+    elif typ == 'url':
+        value = 'https://example.com/project/releases/{}'.format(i)
+    else:
+        value = 'swh:1:rel:{:040x}'.format(rng.getrandbits(160))
+    return '  - type: {}\n    value: {}\n'.format(typ, value)
+
+
+def generate_cff(
+        seed: int = 0, num_authors: int = 3, num_references: int = 0,
+        num_identifiers: int = 0,
+        reference_types: Optional[Dict[str, float]] = None
+        ) -> str:
+    """Generate a CITATION.cff document.
+
+    Args:
+        seed: Seed for the random number generator.
+        num_authors: Number of authors to generate.
+        num_references: Number of references to generate.
+        num_identifiers: Number of identifiers to generate.
+        reference_types: Maps reference types to their relative
+                frequency. Supported types are article, book,
+                conference-paper and software. Defaults to articles
+                only.
+
+    Returns:
+        The document, as YAML text.
+    """
+    if reference_types is None:
+        reference_types = {'article': 1.0}
+    types = sorted(reference_types)
+    weights = [reference_types[typ] for typ in types]
+    for typ in types:
+        if typ not in _reference_generators:
+            raise ValueError('Unsupported reference type {}'.format(typ))
+
+    rng = random.Random(seed)
+    text = (
+            'cff-version: "1.1.0"\n'
+            'message: If you use this software, please cite it.\n'
+            'title: Project {}\n'
+            'version: {}.{}.{}\n'
+            'date-released: 2020-{:02d}-{:02d}\n'
+            'license: {}\n'
+            'repository-code: https://github.com/example/project{}\n'
+            'authors:\n').format(
+                seed, rng.randint(0, 3), rng.randint(0, 20),
+                rng.randint(0, 9), rng.randint(1, 12), rng.randint(1, 28),
+                rng.choice(_licenses), seed)
+    for _ in range(num_authors):
+        text += _person(rng, '  ')
+    if num_references:
+        text += 'references:\n'
+        for i in range(num_references):
+            if len(types) == 1:
+                typ = types[0]
+            else:
+                # cumulative weights, as random.choices() is 3.6+
+                pick = rng.random() * sum(weights)
+                for typ, weight in zip(types, weights):
+                    pick -= weight
+                    if pick < 0.0:
+                        break
+            text += _reference_generators[typ](rng, i)
+    if num_identifiers:
+        text += 'identifiers:\n'
+        for i in range(num_identifiers):
+            text += _identifier(rng, i)
+    return text
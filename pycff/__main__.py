@@ -0,0 +1,6 @@
+import sys
+
+from pycff.cli import main
+
+
+sys.exit(main())
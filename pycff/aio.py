@@ -0,0 +1,277 @@
+"""Loading and dumping CFF documents from asyncio code.
+
+Parsing and validating a large document takes a while, and doing it in
+a coroutine would block the event loop. The functions here read the
+input asynchronously, and then do the work in an executor. By default,
+that is the event loop's default thread pool. A ProcessPoolExecutor
+keeps the event loop more responsive, because the work then does not
+compete for the GIL.
+
+To keep a burst of large documents from taking up all the workers, an
+:class:`AsyncLoader` limits the number of documents being processed at
+the same time. Further requests wait before reading their input, so
+that the backpressure propagates to whoever is sending it.
+
+The work is done in the modes of the coroutine that asks for it. If it
+runs within :func:`pycff.pycff.lazy_validation`, documents are loaded
+lazily, within :func:`pycff.instrumentation.instrument` the work is
+included in the metrics, and within :func:`pycff.pooling.pooling`
+loaded documents are added to the pool. Pools cannot be shared with
+other processes and are not thread-safe, so documents are added to
+the pool after they have been loaded, in the event loop's thread.
+"""
+import asyncio
+from concurrent.futures import Executor
+from contextlib import ExitStack
+import inspect
+import os
+from pathlib import Path
+from typing import (
+        Any, Callable, Iterable, List, Optional, Tuple, TypeVar, Union)
+
+from pycff import instrumentation as _instrumentation
+from pycff.batch import LoadResult
+from pycff.pycff import (
+        _lazy_mode, _pool_mode, CitationCFF, dumps, lazy_validation)
+from pycff.versions import _named_text, load
+
+
+T = TypeVar('T')
+
+# A string containing YAML, a path, or a stream with a read() method,
+# which may be a coroutine.
+AsyncSource = Union[str, Path, Any]
+
+
+def _load_text(text: str, name: Optional[str] = None) -> CitationCFF:
+    """Loads a document in the executor."""
+    return load(_named_text(text, name))
+
+
+def _load_path(path: str) -> CitationCFF:
+    """Loads a file in the executor."""
+    return load(Path(path))
+
+
+def _call(
+        lazy: bool, instrumented: bool, func: Callable[..., T], *args: Any
+        ) -> Tuple[T, Optional[_instrumentation.Metrics]]:
+    """Calls a function in the executor, in the modes of the caller.
+
+    Returns:
+        The result, and the metrics collected if instrumented.
+    """
+    with ExitStack() as stack:
+        if lazy:
+            stack.enter_context(lazy_validation())
+        metrics = None
+        if instrumented:
+            metrics = stack.enter_context(_instrumentation.instrument())
+        return func(*args), metrics
+
+
+async def _read(stream: Any) -> str:
+    """Reads all of a sync or async stream."""
+    data = stream.read()
+    if inspect.isawaitable(data):
+        data = await data
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return data
+
+
+async def _write(stream: Any, text: str) -> None:
+    """Writes to a sync or async stream."""
+    if isinstance(stream, asyncio.StreamWriter):
+        stream.write(text.encode('utf-8'))
+        await stream.drain()
+    else:
+        result = stream.write(text)
+        if inspect.isawaitable(result):
+            await result
+
+
+class AsyncLoader:
+    """Loads and dumps documents, with bounded concurrency.
+
+    An AsyncLoader must only be used with a single event loop.
+    """
+    def __init__(
+            self,
+            executor: Optional[Executor] = None,
+            max_concurrency: Optional[int] = None
+            ) -> None:
+        """Create an AsyncLoader.
+
+        Args:
+            executor: Executor to do the work in. Defaults to the event
+                    loop's default executor.
+            max_concurrency: Maximum number of documents to process at
+                    the same time. Defaults to the number of CPUs.
+        """
+        if max_concurrency is None:
+            max_concurrency = os.cpu_count() or 1
+        if max_concurrency < 1:
+            raise ValueError('Invalid maximum concurrency {}'.format(
+                max_concurrency))
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        # created on first use, so that it belongs to the running loop
+        self._semaphore = None  # type: Optional[asyncio.Semaphore]
+
+    async def load(self, source: AsyncSource) -> CitationCFF:
+        """Load a document.
+
+        Like with :func:`pycff.pycff.load`, a ``str`` is taken to be
+        YAML text, not a path.
+
+        Args:
+            source: A string containing YAML, a path to a file, or a
+                    stream. The stream's read() may be a coroutine,
+                    as with asyncio.StreamReader, and may return bytes,
+                    which are decoded as UTF-8.
+
+        Returns:
+            The loaded document.
+
+        Raises:
+            yatiml.RecognitionError: If the document is invalid.
+        """
+        pool = getattr(_pool_mode, 'pool', None)
+        async with self._limit():
+            if isinstance(source, Path):
+                cff = await self._run(_load_path, str(source))
+            elif isinstance(source, str):
+                cff = await self._run(_load_text, source)
+            else:
+                cff = await self._run(
+                        _load_text, await _read(source),
+                        getattr(source, 'name', None))
+        return cff if pool is None else pool.add(cff)
+
+    async def load_many(self, sources: Iterable[AsyncSource]
+                        ) -> List[LoadResult]:
+        """Load many documents.
+
+        Sources are taken from the iterable only as capacity becomes
+        available. An error in one document does not affect the
+        others, instead it is reported in the corresponding result.
+
+        Like with :func:`pycff.batch.load_many`, a ``str`` is taken to
+        be a path, not YAML text.
+
+        Args:
+            sources: Paths to files, or streams as accepted by
+                    :meth:`load`.
+
+        Returns:
+            One LoadResult for each source, in the same order.
+        """
+        results = list()    # type: List[Optional[LoadResult]]
+        numbered = enumerate(sources)
+
+        async def worker() -> None:
+            # the iterator is shared, and not advanced while waiting
+            for number, source in numbered:
+                results.extend([None] * (number + 1 - len(results)))
+                if isinstance(source, str):
+                    path_or_stream = Path(source)   # type: AsyncSource
+                else:
+                    path_or_stream = source
+                try:
+                    results[number] = LoadResult(
+                            source, await self.load(path_or_stream), None)
+                except Exception as e:
+                    results[number] = LoadResult(source, None, e)
+
+        await asyncio.gather(*[
+            worker() for _ in range(self.max_concurrency)])
+        return results  # type: ignore
+
+    async def dump(
+            self, cff: CitationCFF, stream: Optional[Any] = None) -> str:
+        """Dump a document to YAML.
+
+        Args:
+            cff: The document to dump.
+            stream: A stream to write to, if any. Its write() may be a
+                    coroutine, and asyncio.StreamWriters are drained.
+
+        Returns:
+            The YAML text.
+        """
+        async with self._limit():
+            text = await self._run(dumps, cff)
+        if stream is not None:
+            await _write(stream, text)
+        return text
+
+    def _limit(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Runs a function in the executor, in the caller's modes."""
+        lazy = getattr(_lazy_mode, 'enabled', False)
+        metrics = getattr(_instrumentation._active, 'metrics', None)
+        loop = asyncio.get_event_loop()
+        result, collected = await loop.run_in_executor(
+                self.executor, _call, lazy, metrics is not None, func, *args)
+        if collected is not None:
+            metrics._add(collected)
+        return result
+
+
+async def aload(
+        source: AsyncSource, executor: Optional[Executor] = None
+        ) -> CitationCFF:
+    """Load a document, without blocking the event loop.
+
+    To limit the number of documents processed at the same time, use
+    an :class:`AsyncLoader` instead.
+
+    Args:
+        source: See :meth:`AsyncLoader.load`.
+        executor: Executor to do the work in. Defaults to the event
+                loop's default executor.
+
+    Returns:
+        The loaded document.
+    """
+    return await AsyncLoader(executor, 1).load(source)
+
+
+async def aload_many(
+        sources: Iterable[AsyncSource], executor: Optional[Executor] = None,
+        max_concurrency: Optional[int] = None) -> List[LoadResult]:
+    """Load many documents, without blocking the event loop.
+
+    Args:
+        sources: See :meth:`AsyncLoader.load_many`.
+        executor: Executor to do the work in. Defaults to the event
+                loop's default executor.
+        max_concurrency: Maximum number of documents to process at
+                the same time. Defaults to the number of CPUs.
+
+    Returns:
+        One LoadResult for each source, in the same order.
+    """
+    return await AsyncLoader(executor, max_concurrency).load_many(sources)
+
+
+async def adump(
+        cff: CitationCFF, stream: Optional[Any] = None,
+        executor: Optional[Executor] = None) -> str:
+    """Dump a document to YAML, without blocking the event loop.
+
+    Args:
+        cff: The document to dump.
+        stream: See :meth:`AsyncLoader.dump`.
+        executor: Executor to do the work in. Defaults to the event
+                loop's default executor.
+
+    Returns:
+        The YAML text.
+    """
+    return await AsyncLoader(executor, 1).dump(cff, stream)
@@ -0,0 +1,141 @@
+"""Loading many CFF files in one go."""
+from concurrent.futures import ProcessPoolExecutor
+import os
+from pathlib import Path
+from typing import IO, Iterable, List, Optional, Tuple, Union
+
+from pycff.binary import decode, encode
+from pycff.pycff import _add_to_pool, CitationCFF
+from pycff.versions import _named_text, load
+
+
+Source = Union[str, Path, IO[str]]
+
+
+class LoadResult:
+    """The result of loading a single document in a batch.
+
+    Exactly one of ``cff`` and ``error`` is set.
+
+    Attributes:
+        source: The path or stream the document was loaded from.
+        cff: The loaded document, or None if loading failed.
+        error: The exception raised while loading, or None.
+    """
+    def __init__(
+            self,
+            source: Source,
+            cff: Optional[CitationCFF],
+            error: Optional[Exception]
+            ) -> None:
+        """Create a LoadResult.
+
+        Args:
+            source: The path or stream the document was loaded from.
+            cff: The loaded document, if successful.
+            error: The exception raised, if not.
+        """
+        self.source = source
+        self.cff = cff
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the document was loaded successfully."""
+        return self.error is None
+
+
+# Whether the source is a path, the path or the text, and the name of
+# the stream the text came from, if any
+_Job = Tuple[bool, str, Optional[str]]
+
+
+def _to_job(source: Source) -> _Job:
+    """Turn a source into something we can send to a worker process.
+
+    Paths are sent as is and opened by the worker, streams cannot be
+    sent to another process, so we read them here, and send their name
+    along so that it appears in error messages.
+    """
+    if isinstance(source, (str, Path)):
+        return True, str(source), None
+    return False, source.read(), getattr(source, 'name', None)
+
+
+def _load_job(
+        job: _Job
+        ) -> Tuple[Optional[CitationCFF], Optional[Exception]]:
+    """Load a single document, catching any errors.
+
+    This runs in a worker process.
+    """
+    is_path, path_or_text, name = job
+    try:
+        if is_path:
+            return load(Path(path_or_text)), None
+        return load(_named_text(path_or_text, name)), None
+    except Exception as e:
+        return None, e
+
+
+def _load_job_encoded(
+        job: _Job
+        ) -> Tuple[Optional[bytes], Optional[Exception]]:
+    """Like _load_job, but returns the document in binary form.
+
+    This is smaller and quicker to send back than a pickle.
+    """
+    cff, error = _load_job(job)
+    if cff is None:
+        return None, error
+    return encode(cff), None
+
+
+def load_many(
+        sources: Iterable[Source],
+        workers: Optional[int] = None,
+        chunksize: int = 1
+        ) -> List[LoadResult]:
+    """Load many CFF documents in parallel.
+
+    Documents are parsed and validated in a pool of worker processes.
+    An error in one document does not affect the others, instead it
+    is reported in the corresponding result.
+
+    Note that unlike with :func:`pycff.pycff.load`, a ``str`` is taken
+    to be a path, not YAML text. Error messages include the path of
+    the file, or the name of the stream, that the document came from.
+
+    Args:
+        sources: Paths to files, or open streams, to load from.
+        workers: Number of worker processes, defaults to the number of
+                CPUs. If 1, the documents are loaded in this process.
+        chunksize: Number of documents to send to a worker at a time.
+                Increasing this lowers the overhead for small files.
+
+    Returns:
+        One LoadResult for each source, in the same order.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('Need at least one worker, got {}'.format(workers))
+    if chunksize < 1:
+        raise ValueError('Invalid chunk size {}'.format(chunksize))
+
+    sources = list(sources)
+    jobs = [_to_job(source) for source in sources]
+
+    if workers == 1:
+        outcomes = list(map(_load_job, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outcomes = [
+                    (None if data is None else _add_to_pool(decode(data)),
+                     error)
+                    for data, error in executor.map(
+                        _load_job_encoded, jobs, chunksize=chunksize)]
+
+    return [
+            LoadResult(source, cff, error)
+            for source, (cff, error) in zip(sources, outcomes)]
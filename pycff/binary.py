@@ -0,0 +1,326 @@
+"""A compact binary encoding of CFF objects.
+
+Model objects have many optional fields, most of which are usually
+None. :func:`encode` stores only the fields that are set, with a bitmap
+per object saying which ones those are. Each distinct string is stored
+once, in a table at the start of the data, and referred to by its index
+elsewhere, so that repeated values like licenses, country codes and
+publisher names take only a byte or two each time.
+
+The data starts with a header containing a format version, and
+:func:`decode` rejects data of other versions. The format is as
+follows, with all numbers stored as unsigned LEB128 variable-length
+integers:
+
+* The magic bytes ``PCFF`` and the format version, a single byte.
+* The number of strings, then each string as its length in bytes
+  followed by its UTF-8 encoding.
+* A value, as a one-byte tag followed by its content. A string is its
+  index in the table, an integer is zigzag-encoded, a date is its
+  proleptic Gregorian ordinal, a datetime is the ordinal of its date
+  followed by the microseconds since midnight and, for a datetime with
+  a time zone, the zigzag-encoded UTC offset in microseconds, a list is
+  its length followed by its items, and an object is the tag of its
+  class, a bitmap of the fields that are not None in the order of the
+  constructor arguments, and the values of those fields. An object
+  that occurs more than once is encoded once, and after that as the
+  number of objects that were encoded before it, so that shared
+  objects stay shared.
+
+Decoding does not validate the objects again, so like with pickle,
+only decode data from trusted sources. Lazily validated objects are
+validated while they are encoded, and decode to the eager class.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Type
+
+from pycff.pycff import (
+        _class_info, _lazy_classes, _shared_classes, BookReference,
+        CitationCFF, CitationCFF12, Entity, Identifier, Person, Reference)
+
+
+_magic = b'PCFF'
+
+_format_version = 2
+
+_tag_none = 0
+_tag_str = 1
+_tag_int = 2
+_tag_date = 3
+_tag_datetime = 4
+_tag_list = 5
+_tag_shared = 6
+_tag_datetime_tz = 7
+
+# Object tags are this plus the index of the class in _classes
+_tag_object = 16
+
+# The classes that can be encoded. Append only, a change in their
+# order or fields requires a new format version.
+_classes = (
+        Identifier, Person, Entity, Reference, BookReference, CitationCFF,
+        CitationCFF12)
+
+
+class _ClassCodec:
+    """Precomputed information for encoding objects of a class.
+
+    Attributes:
+        class_: The class.
+        tag: The tag of the class.
+        fields: The names of the fields, in order.
+        field_bits: Pairs of field name and its bit in the bitmap.
+        getter: Gets a tuple of the values of the fields.
+        bitmap_size: Size of the field-presence bitmap in bytes.
+    """
+    def __init__(self, class_: Type, tag: int) -> None:
+        self.class_ = class_
+        self.tag = tag
+        self.fields = tuple(name for name, _ in _class_info[class_].keys)
+        self.field_bits = tuple(
+                (name, 1 << i) for i, name in enumerate(self.fields))
+        self.getter = attrgetter(*self.fields)
+        self.bitmap_size = (len(self.fields) + 7) // 8
+
+
+_codecs = [
+        _ClassCodec(class_, _tag_object + i)
+        for i, class_ in enumerate(_classes)]
+
+_codec_by_class = {codec.class_: codec for codec in _codecs}
+_codec_by_class.update({
+        lazy_class: _codec_by_class[class_]
+        for class_, lazy_class in _lazy_classes.items()})
+_codec_by_class.update({
+        shared_class: _codec_by_class[class_]
+        for class_, shared_class in _shared_classes.items()})
+
+
+def _write_uint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_int(out: bytearray, value: int) -> None:
+    _write_uint(out, value << 1 if value >= 0 else (~value << 1) | 1)
+
+
+def _microseconds(delta: timedelta) -> int:
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+class _Encoder:
+    """Writes values to a buffer, collecting strings as it goes."""
+    def __init__(self) -> None:
+        self.out = bytearray()
+        self.strings = dict()   # type: Dict[str, int]
+        self.objects = dict()   # type: Dict[int, int]
+
+    def value(self, value: Any) -> None:
+        out = self.out
+        type_ = type(value)
+        if type_ is str:
+            index = self.strings.get(value)
+            if index is None:
+                index = self.strings[value] = len(self.strings)
+            out.append(_tag_str)
+            _write_uint(out, index)
+        elif type_ is list:
+            out.append(_tag_list)
+            _write_uint(out, len(value))
+            for item in value:
+                self.value(item)
+        elif type_ is int:
+            out.append(_tag_int)
+            _write_int(out, value)
+        elif type_ is date:
+            out.append(_tag_date)
+            _write_uint(out, value.toordinal())
+        elif type_ is datetime:
+            # date fields hold naive midnights, but other fields can hold
+            # any timestamp that YAML allows
+            offset = value.utcoffset()
+            out.append(_tag_datetime if offset is None else _tag_datetime_tz)
+            _write_uint(out, value.toordinal())
+            _write_uint(out, _microseconds(
+                value.replace(tzinfo=None) -
+                datetime.combine(value.date(), time())))
+            if offset is not None:
+                _write_int(out, _microseconds(offset))
+        elif value is None:
+            out.append(_tag_none)
+        else:
+            codec = _codec_by_class.get(type_)
+            if codec is None:
+                raise ValueError('Cannot encode object of type {}'.format(
+                    type_.__name__))
+            self.object(codec, value)
+
+    def object(self, codec: _ClassCodec, obj: Any) -> None:
+        index = self.objects.get(id(obj))
+        if index is not None:
+            self.out.append(_tag_shared)
+            _write_uint(self.out, index)
+            return
+        self.objects[id(obj)] = len(self.objects)
+
+        values = codec.getter(obj)
+        bitmap = 0
+        for i, value in enumerate(values):
+            if value is not None:
+                bitmap |= 1 << i
+        self.out.append(codec.tag)
+        self.out += bitmap.to_bytes(codec.bitmap_size, 'little')
+        for value in values:
+            if value is not None:
+                self.value(value)
+
+
+def encode(value: Any) -> bytes:
+    """Encode a CFF object, or a list of them.
+
+    Encoding a list of documents stores each distinct string only
+    once for all of them.
+
+    Args:
+        value: A model object like a CitationCFF or Reference, a list
+                of them, or any value that can occur in a field.
+
+    Returns:
+        The encoded value.
+
+    Raises:
+        ValueError: If the value contains something other than model
+                objects, lists, strings, integers and dates.
+        RuntimeError: If a lazily validated object turns out to be
+                invalid.
+    """
+    encoder = _Encoder()
+    encoder.value(value)
+
+    out = bytearray(_magic)
+    out.append(_format_version)
+    _write_uint(out, len(encoder.strings))
+    for string in encoder.strings:
+        data = string.encode('utf-8')
+        _write_uint(out, len(data))
+        out += data
+    out += encoder.out
+    return bytes(out)
+
+
+class _Decoder:
+    """Reads values from encoded data."""
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.pos = 0
+        self.strings = list()   # type: List[str]
+        self.objects = list()   # type: List[Any]
+        self.readers = {
+                _tag_none: lambda: None,
+                _tag_str: lambda: self.strings[self.uint()],
+                _tag_int: self.int,
+                _tag_date: lambda: date.fromordinal(self.uint()),
+                _tag_datetime: self.timestamp,
+                _tag_datetime_tz: self.timestamp_tz,
+                _tag_list: self.list,
+                _tag_shared: lambda: self.objects[self.uint()]
+                }   # type: Dict[int, Callable[[], Any]]
+
+    def uint(self) -> int:
+        data = self.data
+        byte = data[self.pos]
+        self.pos += 1
+        if byte < 0x80:
+            return byte
+        result = byte & 0x7f
+        shift = 7
+        while True:
+            byte = data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def int(self) -> int:
+        value = self.uint()
+        return value >> 1 if not value & 1 else ~(value >> 1)
+
+    def timestamp(self) -> datetime:
+        day = datetime.fromordinal(self.uint())
+        return day + timedelta(microseconds=self.uint())
+
+    def timestamp_tz(self) -> datetime:
+        local = self.timestamp()
+        offset = timedelta(microseconds=self.int())
+        return local.replace(tzinfo=timezone(offset))
+
+    def list(self) -> List[Any]:
+        return [self.value() for _ in range(self.uint())]
+
+    def value(self) -> Any:
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _tag_str:
+            # strings are by far the most common, so skip the dispatch
+            return self.strings[self.uint()]
+        if tag >= _tag_object:
+            return self.object(_codecs[tag - _tag_object])
+        return self.readers[tag]()
+
+    def object(self, codec: _ClassCodec) -> Any:
+        start = self.pos
+        self.pos += codec.bitmap_size
+        if self.pos > len(self.data):
+            raise IndexError()
+        bitmap = int.from_bytes(self.data[start:self.pos], 'little')
+        obj = codec.class_.__new__(codec.class_)
+        self.objects.append(obj)
+        value = self.value
+        for name, bit in codec.field_bits:
+            setattr(obj, name, value() if bitmap & bit else None)
+        return obj
+
+
+def decode(data: bytes) -> Any:
+    """Decode a value encoded by :func:`encode`.
+
+    The objects are of the same classes as the ones that were encoded,
+    and are not validated again.
+
+    Args:
+        data: The encoded value.
+
+    Returns:
+        The decoded value.
+
+    Raises:
+        ValueError: If the data is not in this format, is of a
+                different version of it, or is damaged.
+    """
+    if data[:len(_magic)] != _magic:
+        raise ValueError('Not a binary CFF encoding')
+    if data[len(_magic):len(_magic) + 1] != bytes([_format_version]):
+        raise ValueError('Unsupported binary CFF format version')
+
+    decoder = _Decoder(data)
+    decoder.pos = len(_magic) + 1
+    try:
+        for _ in range(decoder.uint()):
+            size = decoder.uint()
+            end = decoder.pos + size
+            if end > len(data):
+                raise IndexError()
+            decoder.strings.append(
+                    data[decoder.pos:end].decode('utf-8'))
+            decoder.pos = end
+        value = decoder.value()
+    except (IndexError, KeyError, UnicodeDecodeError, OverflowError):
+        raise ValueError('Damaged binary CFF data')
+    if decoder.pos != len(data):
+        raise ValueError('Damaged binary CFF data, trailing bytes')
+    return value
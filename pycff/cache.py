@@ -0,0 +1,327 @@
+"""Caching of loaded CFF documents."""
+from collections import OrderedDict
+from copy import deepcopy
+import hashlib
+import os
+from pathlib import Path
+import tempfile
+import threading
+from typing import Callable, Dict, IO, List, Optional, Tuple, Union
+
+from pycff import __version__
+from pycff.binary import decode, encode
+from pycff.pycff import _add_to_pool, CitationCFF
+from pycff.versions import _read_source, load, peek_version
+
+
+_Entry = Tuple[CitationCFF, int]
+
+# extension of the files of DiskCache entries
+_suffix = '.pcff'
+
+
+def content_hash(text: str) -> str:
+    """Calculate the hash of a document, which identifies it in a cache.
+
+    Args:
+        text: The text of the document.
+
+    Returns:
+        A hexadecimal SHA-256 digest of the UTF-8 encoded text.
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class LoadCache:
+    """An in-memory cache of loaded documents.
+
+    Documents are identified by a hash of their text, so that the same
+    document is only parsed and validated once, regardless of where it
+    came from. When the cache is full, the least recently used
+    documents are evicted.
+
+    Unless ``copy`` is set, the same objects are returned every time a
+    document is requested, so they must not be modified.
+
+    Attributes:
+        hits: Number of loads served from the cache.
+        misses: Number of loads that had to parse the document.
+        evictions: Number of documents evicted to make space.
+    """
+    def __init__(
+            self,
+            max_entries: Optional[int] = 128,
+            max_bytes: Optional[int] = None,
+            copy: bool = False,
+            load_function: Callable[[str], CitationCFF] = load
+            ) -> None:
+        """Create a LoadCache.
+
+        Args:
+            max_entries: Maximum number of documents to keep, or None
+                    for no limit.
+            max_bytes: Maximum total length of the cached documents'
+                    text in bytes, or None for no limit.
+            copy: Whether to return a deep copy of the cached objects,
+                    rather than the objects themselves.
+            load_function: Function to load documents from text with.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.copy = copy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load = load_function
+        # maps content hashes to (document, size in bytes)
+        self._entries = OrderedDict()   # type: Dict[str, _Entry]
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """The total size of the cached documents' text in bytes."""
+        return self._size_bytes
+
+    def load(self, source: Union[str, Path, IO[str]]) -> CitationCFF:
+        """Load a document, using the cache if possible.
+
+        Args:
+            source: A string containing YAML, a path to a file, or an
+                    open stream, like the argument of
+                    :func:`pycff.pycff.load`.
+
+        Returns:
+            The loaded document.
+
+        Raises:
+            yatiml.RecognitionError: If the document is invalid. Errors
+                    are not cached.
+        """
+        text = _read_source(source)
+        key = content_hash(text)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            return deepcopy(entry[0]) if self.copy else entry[0]
+
+        cff = self._load(text)
+        size = len(text.encode('utf-8'))
+
+        with self._lock:
+            self.misses += 1
+            if key not in self._entries:
+                self._entries[key] = (cff, size)
+                self._size_bytes += size
+                self._evict()
+        return deepcopy(cff) if self.copy else cff
+
+    def clear(self) -> None:
+        """Remove all documents from the cache.
+
+        This does not reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def _evict(self) -> None:
+        """Evict documents until the cache is within bounds.
+
+        Must be called with the lock held.
+        """
+        while self._entries and (
+                (self.max_entries is not None and
+                    len(self._entries) > self.max_entries) or
+                (self.max_bytes is not None and
+                    self._size_bytes > self.max_bytes)):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._size_bytes -= size
+            self.evictions += 1
+
+
+class DiskCache:
+    """A cache of loaded documents on disk.
+
+    This stores loaded documents in a directory, so that they can be
+    reused by later runs, or by other processes, without parsing and
+    validating them again. Documents are identified by a hash of their
+    text, the pycff version and their cff-version, so that upgrading
+    pycff invalidates the cache.
+
+    Entries are stored in the compact format of :mod:`pycff.binary`,
+    and written atomically, so several processes can safely share a
+    cache directory. The cache keeps track of the size of the entries
+    it writes, and when that goes beyond its maximum size, it looks at
+    the directory and removes the least recently used entries until the
+    cache is at 90% of its maximum size.
+
+    Decoding an entry does not run any code from it, but its contents
+    are not validated again, so the directory should not be writable
+    by anyone you would not trust to give you a valid document.
+
+    Attributes:
+        hits: Number of loads served from the cache.
+        misses: Number of loads that had to parse the document.
+    """
+    def __init__(
+            self,
+            directory: Union[str, Path],
+            max_bytes: Optional[int] = 100 * 2**20,
+            load_function: Callable[[str], CitationCFF] = load
+            ) -> None:
+        """Create a DiskCache.
+
+        The directory is created if it does not exist.
+
+        Args:
+            directory: The directory to store the cache in.
+            max_bytes: Maximum total size of the cache files in
+                    bytes, or None for no limit.
+            load_function: Function to load documents from text with.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._load = load_function
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # size of the entries, or None if the directory was not scanned
+        # yet. Entries written by other processes are only seen when
+        # it is scanned again.
+        self._size_bytes = None     # type: Optional[int]
+
+    def load(self, source: Union[str, Path, IO[str]]) -> CitationCFF:
+        """Load a document, using the cache if possible.
+
+        Args:
+            source: A string containing YAML, a path to a file, or an
+                    open stream, like the argument of
+                    :func:`pycff.pycff.load`.
+
+        Returns:
+            The loaded document.
+
+        Raises:
+            yatiml.RecognitionError: If the document is invalid. Errors
+                    are not cached.
+        """
+        text = _read_source(source)
+        path = self._entry_path(text)
+
+        cff = self._read_entry(path)
+        if cff is not None:
+            self.hits += 1
+            return cff
+
+        cff = self._load(text)
+        self.misses += 1
+        size = self._write_entry(path, cff)
+        if self.max_bytes is not None:
+            if self._size_bytes is None:
+                self._size_bytes = self._scan()[1]
+            else:
+                self._size_bytes += size
+            if self._size_bytes > self.max_bytes:
+                self._evict()
+        return cff
+
+    def clear(self) -> None:
+        """Remove all documents from the cache."""
+        for entry in os.scandir(str(self.directory)):
+            if entry.name.endswith(_suffix):
+                self._remove(entry.path)
+        self._size_bytes = 0
+
+    def _entry_path(self, text: str) -> Path:
+        key = content_hash('{}\0{}\0{}'.format(
+            __version__, peek_version(text), text))
+        return self.directory / (key + _suffix)
+
+    def _read_entry(self, path: Path) -> Optional[CitationCFF]:
+        """Read an entry, returning None if it is not available."""
+        try:
+            with path.open('rb') as f:
+                cff = decode(f.read())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # damaged somehow, get rid of it and load from scratch
+            self._remove(str(path))
+            return None
+
+        try:
+            # mark as recently used
+            os.utime(str(path))
+        except OSError:
+            pass
+        return _add_to_pool(cff)
+
+    def _write_entry(self, path: Path, cff: CitationCFF) -> int:
+        """Write an entry atomically, and return its size.
+
+        The data is written to a temporary file, which is then renamed,
+        so that other processes never see a partially written entry.
+        """
+        data = encode(cff)
+        fd, tmp_path = tempfile.mkstemp(
+                dir=str(self.directory), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, str(path))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        return len(data)
+
+    def _scan(self) -> Tuple[List[Tuple[float, int, str]], int]:
+        """List the entries in the directory.
+
+        Returns:
+            The modification time, size and path of each entry, and
+            their total size.
+        """
+        entries = list()
+        total_size = 0
+        for entry in os.scandir(str(self.directory)):
+            if entry.name.endswith(_suffix):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+        return entries, total_size
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until within bounds.
+
+        This removes more than needed, so that the directory does not
+        have to be scanned again for every entry that is written.
+        """
+        entries, total_size = self._scan()
+        target = self.max_bytes * 9 // 10
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= target:
+                break
+            self._remove(path)
+            total_size -= size
+        self._size_bytes = total_size
+
+    def _remove(self, path: str) -> None:
+        """Remove a file, which another process may have removed."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,194 @@
+"""The pycff command line interface.
+
+This module is imported on every invocation of the ``pycff`` command,
+so it must stay cheap to import. In particular, the YAML machinery is
+only imported where documents are actually loaded.
+"""
+import argparse
+from collections import OrderedDict
+from concurrent.futures import as_completed, ProcessPoolExecutor
+import glob
+import json
+import os
+import sys
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+_cff_file_name = 'CITATION.cff'
+
+# path, error message or None if valid
+_Result = Tuple[str, Optional[str]]
+
+
+def _find_in_dir(directory: str) -> Iterator[str]:
+    """Finds CITATION.cff files in a directory, recursively.
+
+    Hidden directories, e.g. .git, are skipped.
+    """
+    for dir_path, dir_names, file_names in os.walk(directory):
+        dir_names[:] = sorted(
+                name for name in dir_names if not name.startswith('.'))
+        if _cff_file_name in file_names:
+            yield os.path.join(dir_path, _cff_file_name)
+
+
+def find_cff_files(args: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """Finds the files to validate.
+
+    Args:
+        args: Paths to files or directories, or glob patterns.
+                Directories are searched recursively for CITATION.cff
+                files, and ``**`` in patterns matches any number of
+                directories.
+
+    Returns:
+        A list of files found, without duplicates, and a list of
+        arguments that did not match anything.
+    """
+    found = OrderedDict()       # used as an ordered set
+    not_found = list()
+    for arg in args:
+        if os.path.exists(arg):
+            paths = [arg]
+        else:
+            paths = sorted(glob.glob(arg, recursive=True))
+            if not paths:
+                not_found.append(arg)
+
+        for path in paths:
+            if os.path.isdir(path):
+                for file_path in _find_in_dir(path):
+                    found[file_path] = None
+            else:
+                found[path] = None
+    return list(found), not_found
+
+
+def _validate_files(paths: Sequence[str]) -> List[_Result]:
+    """Validates CFF files.
+
+    This runs in worker processes.
+    """
+    from pathlib import Path
+    from pycff.versions import load
+
+    results = list()
+    for path in paths:
+        try:
+            load(Path(path))
+            results.append((path, None))
+        except Exception as e:
+            results.append((path, str(e) or type(e).__name__))
+    return results
+
+
+def _validate_parallel(
+        paths: List[str], jobs: int) -> Iterator[_Result]:
+    """Validates files in parallel, yielding results as they come in."""
+    # Send a few files at a time to amortise overhead, but keep the
+    # chunks small enough that results stream out and all workers
+    # have something to do.
+    chunk_size = max(1, min(16, len(paths) // (jobs * 4)))
+    chunks = [
+            paths[i:i + chunk_size]
+            for i in range(0, len(paths), chunk_size)]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+                executor.submit(_validate_files, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def validate(paths: List[str], jobs: int) -> Iterator[_Result]:
+    """Validates files, yielding results as they come in.
+
+    Args:
+        paths: The files to validate.
+        jobs: Number of processes to use.
+
+    Yields:
+        Tuples of the path and an error message, or None if the file
+        is valid.
+    """
+    if jobs == 1 or len(paths) < 2:
+        for path in paths:
+            yield from _validate_files([path])
+    else:
+        yield from _validate_parallel(paths, min(jobs, len(paths)))
+
+
+def _make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+            prog='pycff',
+            description='Tools for Citation File Format (CFF) files.')
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+
+    validate_parser = subparsers.add_parser(
+            'validate', help='Check that CFF files are valid.',
+            description=(
+                'Check that CFF files are valid. Directories are searched'
+                ' recursively for {} files.'.format(_cff_file_name)))
+    validate_parser.add_argument(
+            'paths', nargs='+', metavar='path',
+            help='A file, a directory, or a glob pattern.')
+    validate_parser.add_argument(
+            '-j', '--jobs', type=int, default=os.cpu_count() or 1,
+            help='Number of files to validate in parallel.'
+                 ' Defaults to the number of CPUs.')
+    validate_parser.add_argument(
+            '-f', '--format', choices=['human', 'json'], default='human',
+            help='Output format, json gives one JSON object per line.')
+    validate_parser.add_argument(
+            '-q', '--quiet', action='store_true',
+            help='Only report files that are not valid, also with -f json.')
+    return parser
+
+
+def _print_result(
+        path: str, error: Optional[str], args: argparse.Namespace) -> None:
+    if error is None and args.quiet:
+        return
+    if args.format == 'json':
+        print(json.dumps(
+            {'path': path, 'valid': error is None, 'error': error}))
+    elif error is not None:
+        print('{}: invalid'.format(path))
+        for line in error.splitlines():
+            print('    {}'.format(line))
+    else:
+        print('{}: ok'.format(path))
+    sys.stdout.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs the pycff command.
+
+    Args:
+        argv: The command line arguments, without the program name.
+                Defaults to sys.argv[1:].
+
+    Returns:
+        The exit code, 0 if all files are valid, 1 if any are not or
+        if nothing was found to validate.
+    """
+    parser = _make_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    paths, not_found = find_cff_files(args.paths)
+    for arg in not_found:
+        _print_result(arg, 'No such file or directory', args)
+    if not paths and not not_found:
+        print('No {} files found'.format(_cff_file_name), file=sys.stderr)
+        return 1
+
+    num_invalid = len(not_found)
+    for path, error in validate(paths, args.jobs):
+        if error is not None:
+            num_invalid += 1
+        _print_result(path, error, args)
+
+    return 1 if num_invalid > 0 else 0
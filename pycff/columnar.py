@@ -0,0 +1,262 @@
+"""Converting collections of references to columns, for analysis.
+
+:func:`to_columns` turns the references of many documents into a
+:class:`ReferenceColumns`, which holds a list of values for each field,
+rather than an object for each reference. This is the layout that data
+frame libraries use, so the result can be passed on to them without
+converting it row by row.
+
+The references are collected in a single pass over the input, and
+then each column is filled in one go. This does not create an
+intermediate object per reference, and if all references have a field,
+its column is read by a single call of ``map``. The authors of the
+references are stored in columns of their own, with offsets that say
+which authors belong to which reference, as Apache Arrow does for
+lists.
+
+NumPy and Arrow are optional. They are only imported when
+:meth:`ReferenceColumns.to_numpy` or :meth:`ReferenceColumns.to_arrow`
+is called.
+"""
+from datetime import date
+from functools import lru_cache
+from operator import attrgetter
+from typing import (
+        Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Type,
+        Union)
+
+from yatiml.util import generic_type_args, is_generic_union
+
+from pycff.pycff import (
+        _class_info, CitationCFF, Entity, Person, Reference)
+
+
+Columnable = Union[CitationCFF, Reference]
+
+
+def _column_type(type_: Any) -> Optional[Type]:
+    """Gets the column type for a field type, if it has a column.
+
+    Fields of type Entity are stored as the name of the entity, fields
+    holding lists have no column.
+    """
+    if is_generic_union(type_):
+        args = [arg for arg in generic_type_args(type_)
+                if arg is not type(None)]
+        if len(args) != 1:
+            return None
+        type_ = args[0]
+    if type_ is Entity:
+        return str
+    if type_ in (str, int, date):
+        return type_
+    return None
+
+
+def _fields(*classes: Type) -> Dict[str, Type]:
+    """Gets the fields with a column of the given classes, in order."""
+    fields = dict()     # type: Dict[str, Type]
+    for class_ in classes:
+        for name, type_ in _class_info[class_].types.items():
+            column_type = _column_type(type_)
+            if column_type is not None:
+                fields.setdefault(name, column_type)
+    return fields
+
+
+# Fields of references and of authors, and the types of their columns
+reference_fields = _fields(Reference)
+
+author_fields = _fields(Person, Entity)
+
+# Reference fields that contain an Entity, of which we store the name
+_entity_fields = frozenset(
+        name for name, type_ in _class_info[Reference].types.items()
+        if is_generic_union(type_) and Entity in generic_type_args(type_))
+
+
+@lru_cache(maxsize=None)
+def _class_fields(class_: Type) -> FrozenSet[str]:
+    """Gets the names of the fields of a class, once per class."""
+    return frozenset(_class_info[class_].types)
+
+
+def _columns(
+        objects: List[Any], fields: Sequence[str]) -> Dict[str, List[Any]]:
+    """Reads the given fields of objects into columns.
+
+    A column is read with a single attrgetter call per object if all
+    the objects have the field, which they usually do. Otherwise, it
+    is None for objects that do not have the field.
+    """
+    classes = [_class_fields(class_) for class_ in set(map(type, objects))]
+    columns = dict()    # type: Dict[str, List[Any]]
+    for name in fields:
+        if all(name in class_fields for class_fields in classes):
+            columns[name] = list(map(attrgetter(name), objects))
+        else:
+            columns[name] = [getattr(obj, name, None) for obj in objects]
+    return columns
+
+
+class ReferenceColumns:
+    """A collection of references, stored as columns.
+
+    Attributes:
+        columns: Maps field names to lists with a value for each
+                reference, or None where the field is not set. Entity
+                fields like ``publisher`` hold the name of the entity.
+                The ``document`` column holds the position of the
+                document the reference came from in the input.
+        author_offsets: The authors of reference i are at positions
+                ``author_offsets[i]`` up to ``author_offsets[i + 1]``
+                of the author columns.
+        author_columns: Maps Person and Entity field names to lists with
+                a value for each author. Persons have no ``name``, and
+                entities no ``family_names`` and ``given_names``.
+    """
+    def __init__(
+            self, columns: Dict[str, Any], author_offsets: Any,
+            author_columns: Dict[str, Any]) -> None:
+        """Create a ReferenceColumns.
+
+        Args:
+            columns: Columns of reference fields.
+            author_offsets: Offsets into the author columns.
+            author_columns: Columns of author fields.
+        """
+        self.columns = columns
+        self.author_offsets = author_offsets
+        self.author_columns = author_columns
+
+    def __len__(self) -> int:
+        return len(self.author_offsets) - 1
+
+    def to_numpy(self) -> 'ReferenceColumns':
+        """Convert the columns to NumPy arrays.
+
+        Integer columns with missing values become floating point
+        columns with NaN, date columns have type ``datetime64[D]``
+        with NaT for missing values, and text columns have type object.
+
+        Returns:
+            A ReferenceColumns holding arrays instead of lists.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        import numpy
+
+        def convert(
+                columns: Dict[str, List[Any]], types: Dict[str, Type]
+                ) -> Dict[str, Any]:
+            arrays = dict()
+            for name, column in columns.items():
+                type_ = types[name]
+                if type_ is int:
+                    dtype = float if None in column else numpy.int64
+                elif type_ is date:
+                    dtype = 'datetime64[D]'
+                else:
+                    dtype = object
+                arrays[name] = numpy.array(column, dtype=dtype)
+            return arrays
+
+        return ReferenceColumns(
+                convert(self.columns, _column_types(self.columns)),
+                numpy.array(self.author_offsets, dtype=numpy.int64),
+                convert(self.author_columns, author_fields))
+
+    def to_arrow(self) -> Any:
+        """Convert the columns to an Arrow table.
+
+        The authors become a column of lists of structs.
+
+        Returns:
+            A ``pyarrow.Table`` with a row for each reference.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        import pyarrow
+
+        arrow_types = {
+                str: pyarrow.string(), int: pyarrow.int64(),
+                date: pyarrow.date32()}
+
+        types = _column_types(self.columns)
+        arrays = [
+                pyarrow.array(column, arrow_types[types[name]])
+                for name, column in self.columns.items()]
+        authors = pyarrow.StructArray.from_arrays(
+                [pyarrow.array(column, arrow_types[author_fields[name]])
+                 for name, column in self.author_columns.items()],
+                list(self.author_columns))
+        arrays.append(pyarrow.ListArray.from_arrays(
+                pyarrow.array(self.author_offsets, pyarrow.int32()),
+                authors))
+        return pyarrow.Table.from_arrays(
+                arrays, list(self.columns) + ['authors'])
+
+
+def _column_types(columns: Dict[str, Any]) -> Dict[str, Type]:
+    """Gets the types of the given reference columns."""
+    return {
+            name: int if name == 'document' else reference_fields[name]
+            for name in columns}
+
+
+def to_columns(
+        items: Union[Columnable, Iterable[Columnable]],
+        fields: Optional[Sequence[str]] = None
+        ) -> ReferenceColumns:
+    """Convert references to columns, in a single pass.
+
+    Args:
+        items: A CitationCFF object or Reference, or an iterable of
+                them. Documents contribute their references, in order.
+        fields: The reference fields to make columns for, in order.
+                Defaults to all of :data:`reference_fields`. Reading
+                fewer fields is faster.
+
+    Returns:
+        The references as columns.
+
+    Raises:
+        ValueError: If a field does not exist, or has no column.
+    """
+    if fields is None:
+        fields = list(reference_fields)
+    else:
+        for name in fields:
+            if name not in reference_fields:
+                raise ValueError('Unknown or non-scalar field {}'.format(
+                    name))
+
+    if isinstance(items, (CitationCFF, Reference)):
+        items = [items]
+
+    references = list()     # type: List[Reference]
+    documents = list()      # type: List[int]
+    for index, item in enumerate(items):
+        if isinstance(item, CitationCFF):
+            item_references = item.references or []
+        else:
+            item_references = [item]
+        references.extend(item_references)
+        documents.extend([index] * len(item_references))
+
+    authors = list()        # type: List[Union[Person, Entity]]
+    offsets = [0]
+    for reference in references:
+        authors.extend(reference.authors or ())
+        offsets.append(len(authors))
+
+    columns = _columns(references, fields)
+    for name in _entity_fields.intersection(columns):
+        columns[name] = [
+                None if entity is None else entity.name
+                for entity in columns[name]]
+    columns['document'] = documents
+    return ReferenceColumns(
+            columns, offsets, _columns(authors, list(author_fields)))
@@ -0,0 +1,276 @@
+"""Finding and merging duplicate references.
+
+References to the same work, collected from different CFF files, often
+differ in details, like the case of the title or the way the DOI is
+written. To find them, :class:`ReferenceIndex` computes normalized
+keys for each reference, and puts them in hash tables: the DOI, the
+ISBN, and the combination of title, year and family name of the first
+author. References sharing any key are considered duplicates, also
+transitively. This takes time linear in the number of references.
+"""
+import re
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from pycff.pycff import _class_info, BookReference, Person, Reference
+
+
+_doi_prefix = re.compile(
+        r'^(?:doi:\s*|https?://(?:dx\.)?doi\.org/)', re.IGNORECASE)
+
+_non_alnum = re.compile(r'[\W_]+')
+
+_non_isbn = re.compile(r'[^0-9X]+')
+
+
+def normalize_doi(doi: str) -> str:
+    """Normalize a DOI for comparison.
+
+    DOIs are case-insensitive, and are often written as a URL or with
+    a ``doi:`` prefix. This removes those, and converts to lower case.
+    """
+    return _doi_prefix.sub('', doi.strip()).lower()
+
+
+def normalize_isbn(isbn: str) -> Optional[str]:
+    """Normalize an ISBN for comparison.
+
+    Hyphens and spaces are removed, and ISBN-10s are converted to
+    ISBN-13, so that both forms of the same ISBN compare equal.
+
+    Returns:
+        The ISBN-13, or None if this does not look like an ISBN.
+    """
+    digits = _non_isbn.sub('', isbn.upper())
+    if len(digits) == 10 and 'X' not in digits[:9]:
+        digits = '978' + digits[:9]
+        total = sum(
+                int(digit) * (3 if i % 2 else 1)
+                for i, digit in enumerate(digits))
+        return digits + str(-total % 10)
+    if len(digits) == 13 and 'X' not in digits:
+        return digits
+    return None
+
+
+def normalize_text(text: str) -> str:
+    """Normalize a title or name for comparison.
+
+    This ignores case, accents, punctuation and white space.
+    """
+    # decomposing separates accents, which are then removed with the
+    # rest of the non-alphanumeric characters
+    return _non_alnum.sub('', unicodedata.normalize('NFKD', text).casefold())
+
+
+def _keys(reference: Reference) -> List[Any]:
+    """Compute the normalized keys of a reference."""
+    # BookReferences do not have all the attributes
+    keys = list()   # type: List[Any]
+    doi = getattr(reference, 'doi', None)
+    if doi:
+        keys.append(('doi', normalize_doi(doi)))
+    if reference.isbn:
+        isbn = normalize_isbn(reference.isbn)
+        if isbn is not None:
+            keys.append(('isbn', isbn))
+    if reference.title and reference.year and reference.authors:
+        first_author = reference.authors[0]
+        if isinstance(first_author, Person):
+            name = first_author.family_names
+        else:
+            name = first_author.name
+        keys.append((
+            'title', normalize_text(reference.title), reference.year,
+            normalize_text(name)))
+    return keys
+
+
+class ReferenceIndex:
+    """An index for finding duplicate references.
+
+    References are added one at a time, and are identified by the
+    order in which they were added, counting from zero.
+
+    Attributes:
+        references: The references added so far.
+    """
+    def __init__(self, references: Iterable[Reference] = ()) -> None:
+        """Create a ReferenceIndex.
+
+        Args:
+            references: References to add initially.
+        """
+        self.references = list()    # type: List[Reference]
+        # union-find forest, each group's root is its first reference,
+        # and each reference's parent was added before it
+        self._parent = list()       # type: List[int]
+        self._index = dict()        # type: Dict[Any, int]
+        for reference in references:
+            self.add(reference)
+
+    def __len__(self) -> int:
+        return len(self.references)
+
+    def add(self, reference: Reference) -> int:
+        """Add a reference to the index.
+
+        Args:
+            reference: The reference to add.
+
+        Returns:
+            The number identifying the reference.
+        """
+        number = len(self.references)
+        self.references.append(reference)
+        self._parent.append(number)
+        for key in _keys(reference):
+            other = self._index.setdefault(key, number)
+            if other != number:
+                self._union(other, number)
+        return number
+
+    def group_of(self, number: int) -> int:
+        """Find the group a reference belongs to.
+
+        Args:
+            number: The number of a reference.
+
+        Returns:
+            The number of the first reference added to the group of
+            duplicates it belongs to.
+        """
+        parent = self._parent
+        root = number
+        while parent[root] != root:
+            root = parent[root]
+        while parent[number] != root:
+            parent[number], number = root, parent[number]
+        return root
+
+    def roots(self) -> List[int]:
+        """Find the groups all references belong to.
+
+        This is equivalent to calling :meth:`group_of` for each
+        reference, but much faster.
+
+        Returns:
+            For each reference, the number of the first reference of
+            its group of duplicates.
+        """
+        # Parents always come before their children, so we can find
+        # all the roots in a single pass.
+        roots = list()      # type: List[int]
+        for number, parent in enumerate(self._parent):
+            roots.append(number if parent == number else roots[parent])
+        return roots
+
+    def duplicates(self) -> List[List[int]]:
+        """Get all groups of duplicates.
+
+        Returns:
+            The numbers of the references in each group of two or more
+            duplicates, in the order in which they were added. Groups
+            are ordered by their first reference.
+        """
+        # Only making lists for actual duplicates avoids making
+        # millions of objects, and the garbage collector with them.
+        groups = dict()     # type: Dict[int, List[int]]
+        for number, root in enumerate(self.roots()):
+            if root != number:
+                if root in groups:
+                    groups[root].append(number)
+                else:
+                    groups[root] = [root, number]
+        return [groups[root] for root in sorted(groups)]
+
+    def _union(self, a: int, b: int) -> None:
+        root_a, root_b = self.group_of(a), self.group_of(b)
+        if root_a < root_b:
+            self._parent[root_b] = root_a
+        elif root_b < root_a:
+            self._parent[root_a] = root_b
+
+
+# ranks references for a field, lower ranks take precedence
+Precedence = Callable[[Reference], Any]
+
+
+def most_complete(reference: Reference) -> int:
+    """Precedence that prefers references with more fields set."""
+    return -sum(
+            getattr(reference, name, None) is not None
+            for name, _ in _class_info[Reference].keys)
+
+
+def merge(
+        references: Sequence[Reference],
+        precedence: Optional[Precedence] = None,
+        field_precedence: Optional[Dict[str, Precedence]] = None
+        ) -> Reference:
+    """Merge duplicate references into one.
+
+    Each field of the result is taken from the first reference that
+    has it set, in order of precedence. By default, that is the order
+    of the given references.
+
+    Args:
+        references: The references to merge.
+        precedence: Key function for sorting the references, e.g.
+                :func:`most_complete`.
+        field_precedence: Key functions to use for particular fields
+                instead, by attribute name, e.g. ``{'doi': ...}``.
+
+    Returns:
+        A new reference. This is a BookReference if all the given
+        references are, otherwise a Reference.
+    """
+    field_precedence = field_precedence or dict()
+    default_order = list(references)
+    if precedence is not None:
+        default_order.sort(key=precedence)
+
+    class_ = Reference
+    if all(isinstance(reference, BookReference) for reference in references):
+        class_ = BookReference
+
+    kwargs = dict()
+    for name, _ in _class_info[class_].keys:
+        order = default_order
+        if name in field_precedence:
+            order = sorted(references, key=field_precedence[name])
+        for reference in order:
+            value = getattr(reference, name, None)
+            if value is not None:
+                kwargs[name] = value
+                break
+    return class_(**kwargs)
+
+
+def deduplicate(
+        references: Iterable[Reference],
+        precedence: Optional[Precedence] = None,
+        field_precedence: Optional[Dict[str, Precedence]] = None
+        ) -> List[Reference]:
+    """Merge all duplicates in a list of references.
+
+    Args:
+        references: The references to deduplicate.
+        precedence: See :func:`merge`.
+        field_precedence: See :func:`merge`.
+
+    Returns:
+        One reference for each group of duplicates, in order of first
+        occurrence. References without duplicates are returned as is.
+    """
+    index = ReferenceIndex(references)
+    duplicates = {group[0]: group for group in index.duplicates()}
+    result = list()
+    for number, root in enumerate(index.roots()):
+        if number in duplicates:
+            result.append(merge(
+                [index.references[other] for other in duplicates[number]],
+                precedence, field_precedence))
+        elif root == number:
+            result.append(index.references[number])
+    return result
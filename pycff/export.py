@@ -0,0 +1,794 @@
+"""Exporting documents and references to other citation formats.
+
+Supported formats are BibTeX, CSL-JSON, RIS, and a plain-text reference
+list in APA style. Each format has a table for each reference type,
+which lists the fields of the output and how to get them from a
+Reference. The tables are built once, when this module is imported, so
+that exporting a reference is a single pass over its table.
+
+A CitationCFF document is exported as an entry of type software, or
+data for CFF 1.2.0 datasets, followed by its references. Output is
+produced one entry at a time by :func:`iter_export`, so that documents
+with many references, or many documents, can be written to a stream
+without keeping all of the output in memory.
+"""
+from datetime import date
+import json
+import re
+import unicodedata
+from typing import (
+        Any, Callable, Dict, IO, Iterable, Iterator, List, Optional, Set,
+        Tuple, Union)
+
+from pycff.pycff import (
+        _valid_reference_types, CitationCFF, Entity, Person, Reference)
+
+
+Exportable = Union[CitationCFF, Reference]
+
+# Gets an output value from a reference, or None if there is none
+_Getter = Callable[[Any], Any]
+
+# Output field names and getters, in output order
+_Table = Tuple[Tuple[str, _Getter], ...]
+
+
+def _typ(item: Exportable) -> str:
+    """Gets the reference type of an item.
+
+    CitationCFF documents are software, unless a CFF 1.2.0 document
+    says that it is a dataset.
+    """
+    if isinstance(item, CitationCFF):
+        if getattr(item, 'typ', None) == 'dataset':
+            return 'data'
+        return 'software'
+    return item.typ
+
+
+def _attr(name: str) -> _Getter:
+    # BookReference leaves the attributes it does not have unset
+    def getter(item: Any) -> Any:
+        return getattr(item, name, None)
+    return getter
+
+
+def _first(*getters: _Getter) -> _Getter:
+    def getter(item: Any) -> Any:
+        for get in getters:
+            value = get(item)
+            if value is not None:
+                return value
+        return None
+    return getter
+
+
+def _entity_attr(entity_names: Iterable[str], name: str) -> _Getter:
+    """Gets an attribute of the first of the given entities present."""
+    entity_names = tuple(entity_names)
+
+    def getter(item: Any) -> Any:
+        for entity_name in entity_names:
+            entity = getattr(item, entity_name, None)
+            if entity is not None and getattr(entity, name) is not None:
+                return getattr(entity, name)
+        return None
+    return getter
+
+
+def _date_part(part: str) -> _Getter:
+    """Gets the year or month, falling back to the publication date."""
+    def getter(item: Any) -> Any:
+        value = getattr(item, part, None)
+        if value is None:
+            for name in ('date_published', 'date_released'):
+                when = getattr(item, name, None)
+                if when is not None:
+                    return getattr(when, part)
+        return value
+    return getter
+
+
+def _list(name: str) -> _Getter:
+    """Gets a list attribute, as None if it is empty."""
+    def getter(item: Any) -> Any:
+        value = getattr(item, name, None)
+        if isinstance(value, str):
+            # CitationCFF.keywords
+            return [value]
+        return value or None
+    return getter
+
+
+def _map(get: _Getter, func: Callable[[Any], Any]) -> _Getter:
+    def getter(item: Any) -> Any:
+        value = get(item)
+        return None if value is None else func(value)
+    return getter
+
+
+def _const(value: Any) -> _Getter:
+    def getter(item: Any) -> Any:
+        return value
+    return getter
+
+
+_year = _date_part('year')
+
+_month = _date_part('month')
+
+_url = _first(*map(_attr, (
+        'url', 'repository_code', 'repository', 'repository_artifact')))
+
+_container = _first(_attr('journal'), _attr('collection_title'))
+
+_publisher = _entity_attr(('publisher', 'institution'), 'name')
+
+_city = _entity_attr(
+        ('publisher', 'institution', 'conference', 'location'), 'city')
+
+_number = _first(_attr('issue'), _attr('number'))
+
+
+def _family_name(person: Person) -> str:
+    if person.name_particle:
+        return '{} {}'.format(person.name_particle, person.family_names)
+    return person.family_names
+
+
+class _Keys:
+    """Makes unique citation keys, like doe2019 and doe2019a."""
+    def __init__(self) -> None:
+        self._used = set()      # type: Set[str]
+        # next suffix to try for each base, so that many entries with
+        # the same base do not each try all the suffixes before them
+        self._next = dict()     # type: Dict[str, int]
+
+    def make(self, item: Exportable) -> str:
+        authors = getattr(item, 'authors', None) or getattr(
+                item, 'editors', None)
+        base = ''
+        if authors:
+            first = authors[0]
+            if isinstance(first, Person):
+                name = first.family_names
+            else:
+                name = (first.name.split() or [''])[0]
+            base = unicodedata.normalize('NFKD', name).encode(
+                    'ascii', 'ignore').decode('ascii')
+            base = re.sub('[^a-z]', '', base.lower())
+        year = _year(item)
+        base = (base or 'ref') + ('' if year is None else str(year))
+
+        suffix = self._next.get(base, 0)
+        key = base + _key_suffix(suffix)
+        while key in self._used:
+            suffix += 1
+            key = base + _key_suffix(suffix)
+        self._next[base] = suffix + 1
+        self._used.add(key)
+        return key
+
+
+def _key_suffix(number: int) -> str:
+    """Gives a, b, ..., z, aa, ab, ... for 1, 2, ..."""
+    suffix = ''
+    while number > 0:
+        number, letter = divmod(number - 1, 26)
+        suffix = chr(ord('a') + letter) + suffix
+    return suffix
+
+
+class _Format:
+    """An output format.
+
+    Attributes:
+        tables: Field table for each reference type.
+        render: Renders an entry, given the item, its table and a
+                _Keys to make a key with.
+        header: Text before the first entry.
+        separator: Text between entries.
+        footer: Text after the last entry.
+    """
+    def __init__(
+            self, tables: Dict[str, Any],
+            render: Callable[[Exportable, Any, _Keys], str],
+            header: str = '', separator: str = '', footer: str = ''
+            ) -> None:
+        self.tables = tables
+        self.render = render
+        self.header = header
+        self.separator = separator
+        self.footer = footer
+
+
+def _build_tables(build: Callable[[str], Any]) -> Dict[str, Any]:
+    return {typ: build(typ) for typ in _valid_reference_types}
+
+
+# BibTeX
+
+_bibtex_types = {
+        'article': 'article', 'book': 'book', 'conference': 'proceedings',
+        'conference-paper': 'inproceedings', 'edited-work': 'book',
+        'magazine-article': 'article', 'manual': 'manual',
+        'newspaper-article': 'article', 'pamphlet': 'booklet',
+        'proceedings': 'proceedings', 'report': 'techreport',
+        'thesis': 'phdthesis', 'unpublished': 'unpublished'}
+
+# Fields in addition to the common ones, by BibTeX entry type
+_bibtex_fields = {
+        'article': ('journal', 'volume', 'number', 'pages', 'issn'),
+        'book': (
+            'editor', 'publisher', 'address', 'edition', 'volume', 'isbn'),
+        'booklet': ('address',),
+        'inproceedings': (
+            'booktitle', 'editor', 'pages', 'publisher', 'address'),
+        'manual': ('organization', 'address', 'edition'),
+        'misc': ('publisher', 'version'),
+        'phdthesis': ('school', 'address'),
+        'proceedings': (
+            'editor', 'publisher', 'address', 'volume', 'isbn'),
+        'techreport': ('institution', 'number', 'address'),
+        'unpublished': ()}
+
+_bibtex_escapes = str.maketrans({
+        '\\': r'\textbackslash{}', '{': r'\{', '}': r'\}', '&': r'\&',
+        '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_',
+        '~': r'\textasciitilde{}', '^': r'\textasciicircum{}'})
+
+_bibtex_months = (
+        'jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep',
+        'oct', 'nov', 'dec')
+
+
+def _bibtex_text(value: Any) -> str:
+    return '{' + str(value).translate(_bibtex_escapes) + '}'
+
+
+def _bibtex_names(names: List[Union[Entity, Person]]) -> str:
+    formatted = list()
+    for name in names:
+        if isinstance(name, Person):
+            parts = [_family_name(name), name.name_suffix, name.given_names]
+            formatted.append(', '.join(
+                    part.translate(_bibtex_escapes)
+                    for part in parts if part))
+        else:
+            # braces keep BibTeX from splitting the name
+            formatted.append(
+                    '{' + name.name.translate(_bibtex_escapes) + '}')
+    return '{' + ' and '.join(formatted) + '}'
+
+
+def _bibtex_pages(item: Any) -> Optional[str]:
+    start, end = getattr(item, 'start', None), getattr(item, 'end', None)
+    if start is None:
+        return None
+    if end is None:
+        return '{{{}}}'.format(start)
+    return '{{{}--{}}}'.format(start, end)
+
+
+def _bibtex_month(month: int) -> Optional[str]:
+    # the standard macros, without braces
+    if 1 <= month <= 12:
+        return _bibtex_months[month - 1]
+    return None
+
+
+def _verbatim(value: str) -> str:
+    return '{' + value + '}'
+
+
+_bibtex_getters = {
+        'address': _map(_city, _bibtex_text),
+        'author': _map(_list('authors'), _bibtex_names),
+        'booktitle': _map(_first(
+            _attr('collection_title'),
+            _entity_attr(('conference',), 'name')), _bibtex_text),
+        'doi': _map(_attr('doi'), _verbatim),
+        'edition': _map(_attr('edition'), _bibtex_text),
+        'editor': _map(_list('editors'), _bibtex_names),
+        'institution': _map(_entity_attr(
+            ('institution',), 'name'), _bibtex_text),
+        'isbn': _map(_attr('isbn'), _bibtex_text),
+        'issn': _map(_attr('issn'), _bibtex_text),
+        'journal': _map(_attr('journal'), _bibtex_text),
+        'keywords': _map(_list('keywords'), lambda keywords: _bibtex_text(
+            ', '.join(keywords))),
+        'month': _map(_month, _bibtex_month),
+        'note': _map(_attr('notes'), _bibtex_text),
+        'number': _map(_number, _bibtex_text),
+        'organization': _map(_publisher, _bibtex_text),
+        'pages': _bibtex_pages,
+        'publisher': _map(_entity_attr(('publisher',), 'name'), _bibtex_text),
+        'school': _map(_entity_attr(('institution',), 'name'), _bibtex_text),
+        'title': _map(_attr('title'), _bibtex_text),
+        'url': _map(_url, _verbatim),
+        'version': _map(_attr('version'), _bibtex_text),
+        'volume': _map(_attr('volume'), _bibtex_text),
+        'year': _map(_year, _bibtex_text)}    # type: Dict[str, _Getter]
+
+
+def _bibtex_table(typ: str) -> Tuple[str, _Table]:
+    entry_type = _bibtex_types.get(typ, 'misc')
+    fields = (('author', 'title') + _bibtex_fields[entry_type] + (
+            'year', 'month', 'doi', 'url', 'keywords', 'note'))
+    return entry_type, tuple(
+            (field, _bibtex_getters[field]) for field in fields)
+
+
+def _bibtex_render(
+        item: Exportable, table: Tuple[str, _Table], keys: _Keys) -> str:
+    entry_type, fields = table
+    lines = ['@{}{{{}'.format(entry_type, keys.make(item))]
+    for field, get in fields:
+        value = get(item)
+        if value is not None:
+            lines.append('  {} = {}'.format(field, value))
+    return ',\n'.join(lines) + '\n}\n'
+
+
+# CSL-JSON
+
+_csl_types = {
+        'art': 'graphic', 'article': 'article-journal', 'bill': 'bill',
+        'blog': 'post-weblog', 'book': 'book', 'conference': 'event',
+        'conference-paper': 'paper-conference', 'data': 'dataset',
+        'database': 'dataset', 'dictionary': 'entry-dictionary',
+        'edited-work': 'book', 'encyclopedia': 'entry-encyclopedia',
+        'film-broadcast': 'motion_picture', 'government-document': 'report',
+        'hearing': 'hearing', 'legal-case': 'legal_case',
+        'legal-rule': 'legislation', 'magazine-article': 'article-magazine',
+        'manual': 'book', 'map': 'map', 'music': 'song',
+        'newspaper-article': 'article-newspaper', 'pamphlet': 'pamphlet',
+        'patent': 'patent', 'personal-communication': 'personal_communication',
+        'proceedings': 'book', 'report': 'report', 'serial': 'periodical',
+        'slides': 'speech', 'software': 'software',
+        'software-code': 'software', 'software-container': 'software',
+        'software-executable': 'software',
+        'software-virtual-machine': 'software', 'sound-recording': 'song',
+        'standard': 'standard', 'statute': 'legislation', 'thesis': 'thesis',
+        'video': 'motion_picture', 'website': 'webpage'}
+
+
+def _csl_names(names: List[Union[Entity, Person]]) -> List[Dict[str, str]]:
+    result = list()
+    for name in names:
+        if isinstance(name, Person):
+            csl_name = {
+                    'family': name.family_names, 'given': name.given_names}
+            if name.name_particle:
+                csl_name['non-dropping-particle'] = name.name_particle
+            if name.name_suffix:
+                csl_name['suffix'] = name.name_suffix
+            result.append(csl_name)
+        else:
+            result.append({'literal': name.name})
+    return result
+
+
+def _csl_date(value: date) -> Dict[str, Any]:
+    return {'date-parts': [[value.year, value.month, value.day]]}
+
+
+def _csl_issued(item: Any) -> Optional[Dict[str, Any]]:
+    when = getattr(item, 'date_published', None) or getattr(
+            item, 'date_released', None)
+    if when is not None:
+        return _csl_date(when)
+    year = getattr(item, 'year', None)
+    if year is None:
+        return None
+    month = getattr(item, 'month', None)
+    return {'date-parts': [[year] if month is None else [year, month]]}
+
+
+def _csl_page(item: Any) -> Optional[str]:
+    start, end = getattr(item, 'start', None), getattr(item, 'end', None)
+    if start is None:
+        return None
+    return str(start) if end is None else '{}-{}'.format(start, end)
+
+
+_csl_fields = (
+        ('author', _map(_list('authors'), _csl_names)),
+        ('editor', _map(_list('editors'), _csl_names)),
+        ('collection-editor', _map(_list('editors_series'), _csl_names)),
+        ('translator', _map(_list('translators'), _csl_names)),
+        ('recipient', _map(_list('recipients'), _csl_names)),
+        ('title', _attr('title')),
+        ('title-short', _attr('abbreviation')),
+        ('container-title', _container),
+        ('event-title', _entity_attr(('conference',), 'name')),
+        ('issued', _csl_issued),
+        ('accessed', _map(_attr('date_accessed'), _csl_date)),
+        ('original-date', _map(_attr('year_original'), lambda year: {
+            'date-parts': [[year]]})),
+        ('publisher', _publisher),
+        ('publisher-place', _city),
+        ('edition', _attr('edition')),
+        ('version', _attr('version')),
+        ('volume', _attr('volume')),
+        ('issue', _attr('issue')),
+        ('number', _attr('number')),
+        ('page', _csl_page),
+        ('number-of-pages', _attr('pages')),
+        ('section', _attr('section')),
+        ('genre', _first(_attr('thesis_type'), _attr('data_type'))),
+        ('medium', _attr('medium')),
+        ('status', _attr('status')),
+        ('language', _map(_list('languages'), lambda languages: languages[0])),
+        ('DOI', _attr('doi')),
+        ('ISBN', _attr('isbn')),
+        ('ISSN', _attr('issn')),
+        ('PMCID', _attr('pmcid')),
+        ('URL', _url),
+        ('abstract', _attr('abstract')),
+        ('keyword', _map(_list('keywords'), ', '.join)),
+        ('note', _attr('notes')))     # type: _Table
+
+
+def _csl_table(typ: str) -> _Table:
+    return (('type', _const(_csl_types.get(typ, 'document'))),) + _csl_fields
+
+
+def _csl_item(item: Exportable, table: _Table, keys: _Keys) -> Dict[str, Any]:
+    result = {'id': keys.make(item)}    # type: Dict[str, Any]
+    for field, get in table:
+        value = get(item)
+        if value is not None:
+            result[field] = value
+    return result
+
+
+def _csl_render(item: Exportable, table: _Table, keys: _Keys) -> str:
+    return json.dumps(_csl_item(item, table, keys), ensure_ascii=False)
+
+
+# RIS
+
+_ris_types = {
+        'art': 'ART', 'article': 'JOUR', 'audiovisual': 'ADVS',
+        'bill': 'BILL', 'blog': 'BLOG', 'book': 'BOOK', 'catalogue': 'CTLG',
+        'conference': 'CONF', 'conference-paper': 'CPAPER', 'data': 'DATA',
+        'database': 'DBASE', 'dictionary': 'DICT', 'edited-work': 'EDBOOK',
+        'encyclopedia': 'ENCYC', 'film-broadcast': 'MPCT',
+        'government-document': 'GOVDOC', 'grant': 'GRANT', 'hearing': 'HEAR',
+        'legal-case': 'CASE', 'legal-rule': 'LEGAL',
+        'magazine-article': 'MGZN', 'map': 'MAP', 'multimedia': 'MULTI',
+        'music': 'MUSIC', 'newspaper-article': 'NEWS', 'pamphlet': 'PAMP',
+        'patent': 'PAT', 'personal-communication': 'PCOMM',
+        'proceedings': 'CONF', 'report': 'RPRT', 'serial': 'SER',
+        'slides': 'SLIDE', 'software': 'COMP', 'software-code': 'COMP',
+        'software-container': 'COMP', 'software-executable': 'COMP',
+        'software-virtual-machine': 'COMP', 'sound-recording': 'SOUND',
+        'standard': 'STAND', 'statute': 'STAT', 'thesis': 'THES',
+        'unpublished': 'UNPB', 'video': 'VIDEO', 'website': 'ELEC'}
+
+
+def _ris_names(names: List[Union[Entity, Person]]) -> List[str]:
+    result = list()
+    for name in names:
+        if isinstance(name, Person):
+            parts = [_family_name(name), name.given_names, name.name_suffix]
+            result.append(', '.join(part for part in parts if part))
+        else:
+            result.append(name.name)
+    return result
+
+
+def _ris_date(value: date) -> str:
+    return '{:04d}/{:02d}/{:02d}/'.format(value.year, value.month, value.day)
+
+
+_ris_fields = (
+        ('AU', _map(_list('authors'), _ris_names)),
+        ('A2', _map(_list('editors'), _ris_names)),
+        ('A3', _map(_list('editors_series'), _ris_names)),
+        ('A4', _map(_list('translators'), _ris_names)),
+        ('TI', _attr('title')),
+        ('T2', _first(
+            _container, _entity_attr(('conference',), 'name'))),
+        ('ST', _attr('abbreviation')),
+        ('PY', _year),
+        ('DA', _map(_first(
+            _attr('date_published'), _attr('date_released')), _ris_date)),
+        ('Y2', _map(_attr('date_accessed'), _ris_date)),
+        ('VL', _attr('volume')),
+        ('IS', _number),
+        ('SP', _attr('start')),
+        ('EP', _attr('end')),
+        ('ET', _first(_attr('edition'), _attr('version'))),
+        ('PB', _publisher),
+        ('CY', _city),
+        ('SN', _first(_attr('isbn'), _attr('issn'))),
+        ('M3', _first(_attr('thesis_type'), _attr('data_type'))),
+        ('LA', _map(_list('languages'), lambda languages: languages[0])),
+        ('DO', _attr('doi')),
+        ('UR', _url),
+        ('AB', _attr('abstract')),
+        ('KW', _list('keywords')),
+        ('N1', _attr('notes')))     # type: _Table
+
+
+def _ris_table(typ: str) -> _Table:
+    return (('TY', _const(_ris_types.get(typ, 'GEN'))),) + _ris_fields
+
+
+def _ris_render(item: Exportable, table: _Table, keys: _Keys) -> str:
+    lines = list()
+    for tag, get in table:
+        value = get(item)
+        if value is None:
+            continue
+        for single in value if isinstance(value, list) else (value,):
+            # a value must be on a single line
+            lines.append('{}  - {}\n'.format(
+                    tag, ' '.join(str(single).split())))
+    lines.append('ID  - {}\nER  - \n'.format(keys.make(item)))
+    return ''.join(lines)
+
+
+# APA
+
+def _apa_name(name: Union[Entity, Person], inverted: bool) -> str:
+    """Formats a name as Doe, J. P., or as J. P. Doe if not inverted."""
+    if not isinstance(name, Person):
+        return name.name
+    initials = ' '.join(
+            '-'.join(part[0] + '.' for part in given.split('-') if part)
+            for given in name.given_names.split())
+    if not inverted:
+        parts = [initials, _family_name(name)]
+        result = ' '.join(part for part in parts if part)
+    else:
+        result = _family_name(name)
+        if initials:
+            result += ', ' + initials
+    if name.name_suffix:
+        result += ', ' + name.name_suffix
+    return result
+
+
+def _apa_names(
+        names: List[Union[Entity, Person]], inverted: bool = True) -> str:
+    formatted = [_apa_name(name, inverted) for name in names]
+    if len(formatted) == 1:
+        return formatted[0]
+    if len(formatted) > 20:
+        return '{}, . . . {}'.format(', '.join(formatted[:19]), formatted[-1])
+    return '{}, & {}'.format(', '.join(formatted[:-1]), formatted[-1])
+
+
+def _sentence(text: str) -> str:
+    return text if text.endswith(('.', '?', '!')) else text + '.'
+
+
+def _apa_creators(item: Any) -> Optional[str]:
+    authors = getattr(item, 'authors', None)
+    if authors:
+        return _sentence(_apa_names(authors))
+    editors = getattr(item, 'editors', None)
+    if editors:
+        return '{} ({}).'.format(
+                _apa_names(editors), 'Ed.' if len(editors) == 1 else 'Eds.')
+    return None
+
+
+def _apa_year(item: Any) -> str:
+    year = _year(item)
+    return '(n.d.).' if year is None else '({}).'.format(year)
+
+
+def _apa_title(describe: Callable[[Any], List[str]]) -> _Getter:
+    """Gets the title, with a description in parentheses or brackets."""
+    def getter(item: Any) -> str:
+        details = describe(item)
+        if details:
+            return '{} {}.'.format(item.title, ' '.join(details))
+        return _sentence(item.title)
+    return getter
+
+
+def _apa_book_details(item: Any) -> List[str]:
+    details = list()
+    edition = getattr(item, 'edition', None)
+    if edition is not None:
+        details.append('{} ed.'.format(edition))
+    volume = getattr(item, 'volume', None)
+    if volume is not None:
+        details.append('Vol. {}'.format(volume))
+    return ['(' + ', '.join(details) + ')'] if details else []
+
+
+def _apa_software_details(item: Any) -> List[str]:
+    version = getattr(item, 'version', None)
+    details = [] if version is None else ['(Version {})'.format(version)]
+    return details + ['[Computer software]']
+
+
+def _apa_thesis_details(item: Any) -> List[str]:
+    kind = getattr(item, 'thesis_type', None) or 'Thesis'
+    institution = _entity_attr(('institution',), 'name')(item)
+    if institution is None:
+        return ['[{}]'.format(kind)]
+    return ['[{}, {}]'.format(kind, institution)]
+
+
+def _apa_report_details(item: Any) -> List[str]:
+    number = getattr(item, 'number', None)
+    return [] if number is None else ['(Report No. {})'.format(number)]
+
+
+def _apa_data_details(item: Any) -> List[str]:
+    return ['[Data set]']
+
+
+def _apa_no_details(item: Any) -> List[str]:
+    return []
+
+
+def _apa_source(item: Any) -> Optional[str]:
+    """Gets the journal, with volume, issue and pages."""
+    journal = getattr(item, 'journal', None)
+    if journal is None:
+        return None
+    result = journal
+    volume, issue = getattr(item, 'volume', None), _number(item)
+    if volume is not None:
+        result += ', {}'.format(volume)
+        if issue is not None:
+            result += '({})'.format(issue)
+    pages = _csl_page(item)
+    if pages is not None:
+        result += ', ' + pages.replace('-', '–')
+    return result + '.'
+
+
+def _apa_collection(item: Any) -> Optional[str]:
+    """Gets the book or proceedings a paper appeared in."""
+    collection = _first(
+            _attr('collection_title'),
+            _entity_attr(('conference',), 'name'))(item)
+    if collection is None:
+        return None
+    editors = getattr(item, 'editors', None)
+    result = 'In '
+    if editors:
+        result += '{} ({}), '.format(
+                _apa_names(editors, False),
+                'Ed.' if len(editors) == 1 else 'Eds.')
+    result += collection
+    pages = _csl_page(item)
+    if pages is not None:
+        result += ' (pp. {})'.format(pages.replace('-', '–'))
+    return result + '.'
+
+
+def _apa_link(item: Any) -> Optional[str]:
+    doi = getattr(item, 'doi', None)
+    if doi is not None:
+        return 'https://doi.org/' + doi
+    return _url(item)
+
+
+_apa_publisher = _map(_publisher, _sentence)
+
+_apa_details = {
+        'book': _apa_book_details, 'data': _apa_data_details,
+        'database': _apa_data_details, 'edited-work': _apa_book_details,
+        'manual': _apa_book_details, 'proceedings': _apa_book_details,
+        'report': _apa_report_details, 'thesis': _apa_thesis_details}
+
+
+def _apa_table(typ: str) -> Tuple[_Getter, ...]:
+    if typ.startswith('software'):
+        details = _apa_software_details
+    else:
+        details = _apa_details.get(typ, _apa_no_details)
+    table = (_apa_creators, _apa_year, _apa_title(details))
+    if typ in ('article', 'magazine-article', 'newspaper-article'):
+        table += (_apa_source,)
+    elif typ == 'conference-paper':
+        table += (_apa_collection, _apa_publisher)
+    elif typ != 'thesis':
+        table += (_apa_publisher,)
+    return table + (_apa_link,)
+
+
+def _apa_render(
+        item: Exportable, table: Tuple[_Getter, ...], keys: _Keys) -> str:
+    parts = [get(item) for get in table]
+    return ' '.join(part for part in parts if part is not None) + '\n'
+
+
+_formats = {
+        'bibtex': _Format(
+            _build_tables(_bibtex_table), _bibtex_render, separator='\n'),
+        'csl-json': _Format(
+            _build_tables(_csl_table), _csl_render, '[\n', ',\n', '\n]\n'),
+        'ris': _Format(_build_tables(_ris_table), _ris_render, separator='\n'),
+        'apa': _Format(_build_tables(_apa_table), _apa_render)}
+
+formats = tuple(sorted(_formats))
+
+
+def _entries(items: Union[Exportable, Iterable[Exportable]], references: bool
+             ) -> Iterator[Exportable]:
+    """Flattens documents into entries."""
+    if isinstance(items, (CitationCFF, Reference)):
+        items = (items,)
+    for item in items:
+        yield item
+        if references and isinstance(item, CitationCFF):
+            yield from item.references or ()
+
+
+def iter_export(
+        items: Union[Exportable, Iterable[Exportable]], format: str,
+        references: bool = True) -> Iterator[str]:
+    """Export documents and references, one piece of text at a time.
+
+    Citation keys are unique across everything exported in one call.
+    Entries are output in the given order.
+
+    Args:
+        items: A document or reference, or an iterable of them, which
+                is consumed lazily.
+        format: One of ``bibtex``, ``csl-json``, ``ris`` and ``apa``.
+        references: Whether to export the references of documents as
+                well.
+
+    Yields:
+        Pieces of the output, which concatenate to the whole.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if format not in _formats:
+        raise ValueError('Unknown format "{}", expected one of {}'.format(
+            format, ', '.join(formats)))
+    return _iter_export(_formats[format], _entries(items, references))
+
+
+def _iter_export(output: _Format, entries: Iterable[Exportable]
+                 ) -> Iterator[str]:
+    tables = output.tables
+    keys = _Keys()
+    yield output.header
+    separator = ''
+    for item in entries:
+        table = tables.get(_typ(item)) or tables['generic']
+        yield separator + output.render(item, table, keys)
+        separator = output.separator
+    yield output.footer
+
+
+def export(
+        items: Union[Exportable, Iterable[Exportable]], format: str,
+        stream: Optional[IO[str]] = None, references: bool = True
+        ) -> Optional[str]:
+    """Export documents and references to another format.
+
+    Args:
+        items: A document or reference, or an iterable of them.
+        format: One of ``bibtex``, ``csl-json``, ``ris`` and ``apa``.
+        stream: A stream to write the output to, as it is produced.
+                If None, the output is returned instead.
+        references: Whether to export the references of documents as
+                well.
+
+    Returns:
+        The output, if no stream was given.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    chunks = iter_export(items, format, references)
+    if stream is None:
+        return ''.join(chunks)
+    for chunk in chunks:
+        stream.write(chunk)
+    return None
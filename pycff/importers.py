@@ -0,0 +1,940 @@
+"""Importing references from BibTeX and CSL-JSON.
+
+:func:`iter_bibtex` and :func:`iter_csl_json` read their input a piece
+at a time, and yield a Reference for each entry, or a BookReference
+for books that fit one. Tables for each kind of entry map it to one of
+the CFF reference types, and its fields to Reference attributes. The
+objects are validated as they would be when loading a CFF file.
+
+Splitting the input into entries is cheap compared to converting and
+validating them. With ``jobs`` greater than one, the input is split in
+the calling process, and chunks of entries are converted in worker
+processes. Either way, references are yielded in the order of the
+input.
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date
+import io
+import json
+from pathlib import Path
+import re
+import unicodedata
+from typing import (
+        Any, Callable, Dict, IO, Iterator, List, Optional, Tuple, Union)
+
+import yatiml
+
+from pycff.dedup import _doi_prefix
+from pycff.pycff import (
+        _class_info, BookReference, Entity, Person, Reference)
+
+
+Source = Union[str, Path, IO[str]]
+
+# Characters read at a time
+_read_size = 65536
+
+# Entries sent to a worker process at a time
+_chunk_size = 500
+
+# Sets attributes in a dict of constructor arguments from a value
+_Setter = Callable[[Dict[str, Any], Any], None]
+
+# CFF type, initial constructor arguments, and setters by field name
+_Table = Tuple[str, Dict[str, Any], Dict[str, _Setter]]
+
+# BibTeX entry type, key, and fields with macros expanded
+_BibTeXEntry = Tuple[str, str, Dict[str, str]]
+
+
+@contextmanager
+def _open(source: Source) -> Iterator[IO[str]]:
+    if isinstance(source, Path):
+        with source.open('r', encoding='utf-8') as f:
+            yield f
+    elif isinstance(source, str):
+        yield io.StringIO(source)
+    else:
+        yield source
+
+
+def _int(value: Any) -> Optional[int]:
+    """Converts to an int, or returns None if it is not one."""
+    if isinstance(value, int):
+        return value
+    value = str(value).strip()
+    return int(value) if value.isdigit() else None
+
+
+_page_range = re.compile(r'\s*(\d+)\s*(?:(?:-+|–|—)\s*(\d+)\s*)?$')
+
+
+def _set_pages(kwargs: Dict[str, Any], value: Any) -> None:
+    match = _page_range.match(str(value))
+    if match is not None:
+        kwargs['start'] = int(match.group(1))
+        if match.group(2) is not None:
+            kwargs['end'] = int(match.group(2))
+
+
+_month_names = (
+        'jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep',
+        'oct', 'nov', 'dec')
+
+
+def _month(value: Any) -> Optional[int]:
+    month = _int(value)
+    if month is None:
+        name = str(value).strip()[:3].lower()
+        if name in _month_names:
+            month = _month_names.index(name) + 1
+    return month if month is not None and 1 <= month <= 12 else None
+
+
+def _make_reference(kwargs: Dict[str, Any], what: str) -> Reference:
+    """Creates a BookReference if possible, otherwise a Reference.
+
+    Raises:
+        yatiml.RecognitionError: If the entry is invalid.
+    """
+    kwargs.setdefault('authors', [])
+    if 'title' not in kwargs:
+        raise yatiml.RecognitionError('{}: no title'.format(what))
+    book_args = _class_info[BookReference].args
+    try:
+        if (
+                kwargs['typ'] == 'book' and 'publisher' in kwargs and
+                'year' in kwargs and all(name in book_args for name in kwargs)
+                ):
+            return BookReference(**kwargs)
+        return Reference(**kwargs)
+    except RuntimeError as e:
+        raise yatiml.RecognitionError('{}: {}'.format(what, e))
+
+
+def _convert_chunk(
+        convert: Callable[[Any], Reference], entries: List[Any],
+        skip_invalid: bool) -> List[Reference]:
+    """Converts entries, in a worker process or this one."""
+    references = list()
+    for entry in entries:
+        try:
+            references.append(convert(entry))
+        except yatiml.RecognitionError:
+            if not skip_invalid:
+                raise
+    return references
+
+
+def _convert(
+        entries: Iterator[Any], convert: Callable[[Any], Reference],
+        jobs: int, skip_invalid: bool) -> Iterator[Reference]:
+    """Converts entries, using a process pool if jobs > 1."""
+    if jobs < 1:
+        raise ValueError('Invalid number of jobs {}'.format(jobs))
+    if jobs == 1:
+        for entry in entries:
+            yield from _convert_chunk(convert, [entry], skip_invalid)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # limit the number of chunks in flight, so that we do not read
+        # ahead too far if the consumer is slow
+        pending = deque()   # type: deque
+        chunk = list()      # type: List[Any]
+        for entry in entries:
+            chunk.append(entry)
+            if len(chunk) == _chunk_size:
+                pending.append(executor.submit(
+                    _convert_chunk, convert, chunk, skip_invalid))
+                chunk = list()
+                if len(pending) > 2 * jobs:
+                    yield from pending.popleft().result()
+        if chunk:
+            pending.append(executor.submit(
+                _convert_chunk, convert, chunk, skip_invalid))
+        while pending:
+            yield from pending.popleft().result()
+
+
+# BibTeX
+
+_entry_start = re.compile(r'@\s*([A-Za-z]+)\s*([{(])')
+
+_delimiters = re.compile(r'[{})]')
+
+
+def _split_bibtex(stream: IO[str]) -> Iterator[Tuple[str, str]]:
+    """Splits BibTeX into entries, reading a piece at a time.
+
+    Text outside of entries is a comment, and is skipped.
+
+    Yields:
+        The entry type in lower case, and the text between the
+        entry's delimiters.
+    """
+    buffer = ''
+    pos = 0
+    eof = False
+    while True:
+        start = _entry_start.search(buffer, pos)
+        if start is None:
+            if eof:
+                return
+            # keep what may be the start of an entry
+            at = buffer.rfind('@', pos)
+            buffer = buffer[at:] if at != -1 else ''
+            pos = 0
+            chunk = stream.read(_read_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+
+        closing = '}' if start.group(2) == '{' else ')'
+        depth = 0
+        scan = start.end()
+        end = None
+        while end is None:
+            for delimiter in _delimiters.finditer(buffer, scan):
+                char = delimiter.group()
+                if depth == 0 and char == closing:
+                    end = delimiter.start()
+                    break
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    depth -= 1
+            if end is None:
+                if eof:
+                    raise yatiml.RecognitionError(
+                            'Unexpected end of input in BibTeX entry'
+                            ' starting with "{}"'.format(
+                                buffer[start.start():start.start() + 40]))
+                scan = len(buffer)
+                chunk = stream.read(_read_size)
+                eof = not chunk
+                buffer += chunk
+
+        yield start.group(1).lower(), buffer[start.end():end]
+        pos = end + 1
+        if pos > _read_size:
+            buffer = buffer[pos:]
+            pos = 0
+
+
+_field_name = re.compile(r'\s*([^\s=,{}"#]+)\s*=\s*')
+
+_bibtex_word = re.compile(r'[^\s,#{}"=]+')
+
+_space = re.compile(r'\s*')
+
+_value_delimiters = re.compile(r'[{}"]')
+
+
+def _bibtex_value(body: str, pos: int, macros: Dict[str, str]
+                  ) -> Tuple[str, int]:
+    """Parses a field value, which may be concatenated with #."""
+    parts = list()
+    while True:
+        pos = _space.match(body, pos).end()
+        if pos < len(body) and body[pos] in '{"':
+            closing = '}' if body[pos] == '{' else '"'
+            depth = 0
+            for delimiter in _value_delimiters.finditer(body, pos + 1):
+                char = delimiter.group()
+                if depth == 0 and char == closing:
+                    break
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    depth -= 1
+            else:
+                raise ValueError('unterminated value')
+            parts.append(body[pos + 1:delimiter.start()])
+            pos = delimiter.end()
+        else:
+            word = _bibtex_word.match(body, pos)
+            if word is None:
+                raise ValueError('expected a value at "{}"'.format(
+                    body[pos:pos + 20]))
+            parts.append(macros.get(word.group().lower(), word.group()))
+            pos = word.end()
+
+        pos = _space.match(body, pos).end()
+        if pos < len(body) and body[pos] == '#':
+            pos += 1
+        else:
+            return ''.join(parts), pos
+
+
+def _bibtex_fields(body: str, pos: int, macros: Dict[str, str]
+                   ) -> Dict[str, str]:
+    fields = dict()
+    while True:
+        while pos < len(body) and (body[pos].isspace() or body[pos] == ','):
+            pos += 1
+        if pos == len(body):
+            return fields
+        name = _field_name.match(body, pos)
+        if name is None:
+            raise ValueError('expected a field at "{}"'.format(
+                body[pos:pos + 20]))
+        fields[name.group(1).lower()], pos = _bibtex_value(
+                body, name.end(), macros)
+
+
+def _bibtex_entries(stream: IO[str], skip_invalid: bool
+                    ) -> Iterator[_BibTeXEntry]:
+    """Parses BibTeX entries, expanding macros defined with @string."""
+    macros = {
+            name: name.capitalize() for name in _month_names
+            }   # type: Dict[str, str]
+    for entry_type, body in _split_bibtex(stream):
+        if entry_type in ('comment', 'preamble'):
+            continue
+        try:
+            if entry_type == 'string':
+                macros.update({
+                    name.lower(): value
+                    for name, value in _bibtex_fields(
+                        body, 0, macros).items()})
+                continue
+            key, _, _ = body.partition(',')
+            yield entry_type, key.strip(), _bibtex_fields(
+                    body, len(key), macros)
+        except ValueError as e:
+            if not skip_invalid:
+                raise yatiml.RecognitionError('BibTeX entry {}: {}'.format(
+                    body.partition(',')[0].strip(), e))
+
+
+_latex_accents = {
+        '"': '\u0308', "'": '\u0301', '`': '\u0300', '^': '\u0302',
+        '~': '\u0303', '=': '\u0304', '.': '\u0307', 'u': '\u0306',
+        'v': '\u030c', 'H': '\u030b', 'c': '\u0327', 'k': '\u0328',
+        'r': '\u030a'}
+
+_latex_symbols = {
+        'aa': 'å', 'AA': 'Å', 'ae': 'æ', 'AE': 'Æ', 'i': 'ı', 'j': 'ȷ',
+        'l': 'ł', 'L': 'Ł', 'o': 'ø', 'O': 'Ø', 'oe': 'œ', 'OE': 'Œ',
+        'ss': 'ß', 'textasciicircum': '^', 'textasciitilde': '\x03',
+        'textbackslash': '\\', 'textendash': '–', 'textemdash': '—'}
+
+_latex_accent = re.compile(
+        r'\\(?:([\"\'`^~=.])\s*|([uvHckr])(?:\s+|(?=\{)))'
+        r'(?:\{\s*(\\?\w)\s*\}|(\\?\w))')
+
+_latex_symbol = re.compile(r'\\([A-Za-z]+)(?:\{\}|\s*)')
+
+_latex_escape = re.compile(r'\\([&%$#_{}])')
+
+# Placeholders for characters that are removed or replaced otherwise
+_latex_placeholders = str.maketrans({
+        '{': '\x01', '}': '\x02', '~': '\x03'})
+
+_latex_restore = str.maketrans({
+        '\x01': '{', '\x02': '}', '\x03': '~'})
+
+_latex_url = re.compile(r'\\url\{([^{}]*)\}')
+
+
+def _latex_to_text(value: str) -> str:
+    """Converts a BibTeX value to plain text.
+
+    This handles accents, special characters and escapes, and removes
+    braces and other commands.
+    """
+    if '\\' in value:
+        value = _latex_url.sub(r'\1', value)
+
+        def accent(match: Any) -> str:
+            letter = match.group(3) or match.group(4)
+            letter = _latex_symbols.get(letter[1:], '') if (
+                    letter.startswith('\\')) else letter
+            return letter + _latex_accents[match.group(1) or match.group(2)]
+
+        value = _latex_accent.sub(accent, value)
+        value = _latex_escape.sub(
+                lambda match: match.group(1).translate(_latex_placeholders),
+                value)
+        value = _latex_symbol.sub(
+                lambda match: _latex_symbols.get(match.group(1), ''), value)
+    value = value.replace('{', '').replace('}', '').replace('~', ' ')
+    value = value.replace('---', '—').replace('--', '–')
+    value = ' '.join(value.split()).translate(_latex_restore)
+    return unicodedata.normalize('NFC', value)
+
+
+def _latex_verbatim(value: str) -> str:
+    """Converts a BibTeX URL or DOI, which are mostly taken as is."""
+    value = _latex_url.sub(r'\1', value)
+    value = _latex_escape.sub(
+            lambda match: match.group(1).translate(_latex_placeholders),
+            value)
+    value = value.replace('{', '').replace('}', '')
+    return value.strip().translate(_latex_restore)
+
+
+def _plain(value: Any) -> str:
+    return str(value).strip()
+
+
+def _bibtex_tokens(text: str) -> List[str]:
+    """Splits at white space and commas that are not in braces.
+
+    Commas are returned as separate tokens.
+    """
+    tokens = list()
+    current = list()    # type: List[str]
+    depth = 0
+    for char in text:
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+        if depth == 0 and (char.isspace() or char == ','):
+            if current:
+                tokens.append(''.join(current))
+                current = list()
+            if char == ',':
+                tokens.append(',')
+        else:
+            current.append(char)
+    if current:
+        tokens.append(''.join(current))
+    return tokens
+
+
+def _is_particle(token: str) -> bool:
+    text = _latex_to_text(token) if not token.startswith('{') else ''
+    return text[:1].islower()
+
+
+def _bibtex_name(tokens: List[str]) -> Union[Entity, Person]:
+    """Converts a name in any of BibTeX's three forms."""
+    if len(tokens) == 1 and tokens[0].startswith('{') and tokens[0].endswith(
+            '}'):
+        return Entity(_latex_to_text(tokens[0]))
+
+    parts = [list()]    # type: List[List[str]]
+    for token in tokens:
+        if token == ',':
+            parts.append(list())
+        else:
+            parts[-1].append(token)
+
+    suffix = []     # type: List[str]
+    if len(parts) == 1:
+        # First von Last
+        words = parts[0]
+        particles = [
+                i for i, word in enumerate(words[:-1]) if _is_particle(word)]
+        if particles:
+            given = words[:particles[0]]
+            particle = words[particles[0]:particles[-1] + 1]
+            family = words[particles[-1] + 1:]
+        else:
+            given, particle, family = words[:-1], [], words[-1:]
+    else:
+        # von Last, First or von Last, Jr, First
+        words = parts[0]
+        first = 0
+        while first < len(words) - 1 and _is_particle(words[first]):
+            first += 1
+        particle, family = words[:first], words[first:]
+        given = parts[-1]
+        if len(parts) > 2:
+            suffix = parts[1]
+
+    def text(words: List[str]) -> Optional[str]:
+        return _latex_to_text(' '.join(words)) or None
+
+    return Person(
+            text(family) or '', text(given) or '', name_particle=text(
+                particle), name_suffix=text(suffix))
+
+
+def _bibtex_names(value: str) -> List[Union[Entity, Person]]:
+    names = list()
+    tokens = list()     # type: List[str]
+    for token in _bibtex_tokens(value) + ['and']:
+        if token.lower() == 'and':
+            if tokens and not (len(tokens) == 1 and tokens[0] == 'others'):
+                names.append(_bibtex_name(tokens))
+            tokens = list()
+        else:
+            tokens.append(token)
+    return names
+
+
+def _set_text(
+        name: str, clean: Callable[[Any], str] = _latex_to_text) -> _Setter:
+    def setter(kwargs: Dict[str, Any], value: Any) -> None:
+        if value is not None:
+            text = clean(value)
+            if text:
+                kwargs[name] = text
+    return setter
+
+
+def _set_int(name: str) -> _Setter:
+    def setter(kwargs: Dict[str, Any], value: Any) -> None:
+        number = _int(_latex_to_text(str(value)))
+        if number is not None:
+            kwargs[name] = number
+    return setter
+
+
+def _set_int_or_text(int_name: str, text_name: str) -> _Setter:
+    def setter(kwargs: Dict[str, Any], value: Any) -> None:
+        text = _latex_to_text(str(value))
+        if _int(text) is not None:
+            kwargs[int_name] = int(text)
+        elif text:
+            kwargs[text_name] = text
+    return setter
+
+
+def _set_list(
+        name: str, clean: Callable[[Any], str] = _latex_to_text) -> _Setter:
+    def setter(kwargs: Dict[str, Any], value: Any) -> None:
+        if isinstance(value, str):
+            value = re.split('[,;]', clean(value))
+        items = [item.strip() for item in value if item.strip()]
+        if items:
+            kwargs[name] = items
+    return setter
+
+
+def _set_doi(clean: Callable[[Any], str]) -> _Setter:
+    def setter(kwargs: Dict[str, Any], value: Any) -> None:
+        doi = _doi_prefix.sub('', clean(value))
+        if doi:
+            kwargs['doi'] = doi
+    return setter
+
+
+def _set_year(kwargs: Dict[str, Any], value: Any) -> None:
+    year = re.search(r'\d{4}', str(value))
+    if year is not None:
+        kwargs['year'] = int(year.group())
+
+
+def _set_month(kwargs: Dict[str, Any], value: Any) -> None:
+    month = _month(_latex_to_text(str(value)))
+    if month is not None:
+        kwargs['month'] = month
+
+
+def _set_dates(name: str, date_name: str) -> _Setter:
+    """Sets year and month, and the full date, from a YYYY-MM-DD date."""
+    def setter(kwargs: Dict[str, Any], value: Any) -> None:
+        parts = re.match(r'\s*(\d{4})(?:-(\d\d)(?:-(\d\d))?)?', str(value))
+        if parts is None:
+            return
+        numbers = [int(part) for part in parts.groups() if part is not None]
+        if name == 'year':
+            kwargs['year'] = numbers[0]
+            if len(numbers) > 1:
+                kwargs['month'] = numbers[1]
+        if len(numbers) == 3:
+            try:
+                kwargs[date_name] = date(*numbers)
+            except ValueError:
+                pass
+    return setter
+
+
+def _set_bibtex_names(name: str) -> _Setter:
+    def setter(kwargs: Dict[str, Any], value: str) -> None:
+        names = _bibtex_names(value)
+        if names:
+            kwargs[name] = names
+    return setter
+
+
+def _set_howpublished(kwargs: Dict[str, Any], value: str) -> None:
+    url = _latex_url.search(value)
+    if url is not None:
+        kwargs.setdefault('url', _latex_verbatim(url.group()))
+
+
+_bibtex_setters = {
+        'abstract': _set_text('abstract'),
+        'address': _set_text('_address'),
+        'author': _set_bibtex_names('authors'),
+        'booktitle': _set_text('collection_title'),
+        'chapter': _set_text('section'),
+        'date': _set_dates('year', 'date_published'),
+        'doi': _set_doi(_latex_verbatim),
+        'edition': _set_text('edition'),
+        'editor': _set_bibtex_names('editors'),
+        'howpublished': _set_howpublished,
+        'institution': _set_text('institution'),
+        'isbn': _set_text('isbn'),
+        'issn': _set_text('issn'),
+        'journal': _set_text('journal'),
+        'journaltitle': _set_text('journal'),
+        'keywords': _set_list('keywords'),
+        'language': _set_list('languages'),
+        'location': _set_text('_address'),
+        'month': _set_month,
+        'note': _set_text('notes'),
+        'number': _set_text('number'),
+        'organization': _set_text('institution'),
+        'pages': _set_pages,
+        'pagetotal': _set_int('pages'),
+        'publisher': _set_text('publisher'),
+        'school': _set_text('institution'),
+        'title': _set_text('title'),
+        'type': _set_text('thesis_type'),
+        'url': _set_text('url', _latex_verbatim),
+        'urldate': _set_dates('date_accessed', 'date_accessed'),
+        'version': _set_text('version'),
+        'volume': _set_int('volume'),
+        'year': _set_year}     # type: Dict[str, _Setter]
+
+# CFF type and initial arguments by BibTeX entry type
+_bibtex_types = {
+        'article': ('article', {}), 'artwork': ('art', {}),
+        'audio': ('sound-recording', {}), 'book': ('book', {}),
+        'booklet': ('pamphlet', {}), 'conference': ('conference-paper', {}),
+        'dataset': ('data', {}), 'electronic': ('website', {}),
+        'inproceedings': ('conference-paper', {}),
+        'jurisdiction': ('legal-case', {}), 'legislation': ('statute', {}),
+        'manual': ('manual', {}),
+        'mastersthesis': ('thesis', {'thesis_type': 'Master\'s thesis'}),
+        'misc': ('generic', {}), 'music': ('music', {}),
+        'online': ('website', {}), 'patent': ('patent', {}),
+        'periodical': ('serial', {}),
+        'phdthesis': ('thesis', {'thesis_type': 'PhD thesis'}),
+        'proceedings': ('proceedings', {}), 'report': ('report', {}),
+        'software': ('software', {}), 'standard': ('standard', {}),
+        'techreport': ('report', {}), 'thesis': ('thesis', {}),
+        'unpublished': ('unpublished', {}), 'video': ('video', {}),
+        'www': ('website', {})}
+
+
+def _bibtex_table(entry_type: str) -> _Table:
+    typ, defaults = _bibtex_types.get(entry_type, ('generic', {}))
+    setters = dict(_bibtex_setters)
+    if typ in ('article', 'magazine-article', 'newspaper-article'):
+        setters['number'] = _set_int_or_text('issue', 'number')
+    if typ != 'thesis':
+        del setters['type']
+    return typ, defaults, setters
+
+
+_bibtex_tables = {
+        entry_type: _bibtex_table(entry_type)
+        for entry_type in _bibtex_types}
+
+_bibtex_default_table = _bibtex_table('misc')
+
+
+def _bibtex_reference(entry: _BibTeXEntry) -> Reference:
+    """Converts a parsed BibTeX entry to a Reference."""
+    entry_type, key, fields = entry
+    if entry_type == 'misc' and 'version' in fields:
+        # how software is usually written in BibTeX, see pycff.export
+        entry_type = 'software'
+    typ, defaults, setters = _bibtex_tables.get(
+            entry_type, _bibtex_default_table)
+    kwargs = dict(defaults)
+    kwargs['typ'] = typ
+    try:
+        for name, value in fields.items():
+            setter = setters.get(name)
+            if setter is not None:
+                setter(kwargs, value)
+        _make_entities(kwargs)
+    except RuntimeError as e:
+        raise yatiml.RecognitionError('BibTeX entry {}: {}'.format(key, e))
+    return _make_reference(kwargs, 'BibTeX entry {}'.format(key))
+
+
+def _make_entities(kwargs: Dict[str, Any]) -> None:
+    """Makes Entities of names, the address goes with the first."""
+    address = kwargs.pop('_address', None)
+    for name in ('publisher', 'institution', 'conference'):
+        if isinstance(kwargs.get(name), str):
+            kwargs[name] = Entity(kwargs[name], city=address)
+            address = None
+    if address is not None:
+        kwargs['location'] = Entity(address)
+
+
+# CSL-JSON
+
+def _csl_items(stream: IO[str]) -> Iterator[Dict[str, Any]]:
+    """Parses a JSON array of objects, reading a piece at a time.
+
+    A single object is accepted as well.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def skip(chars: str) -> None:
+        """Skips characters, reading more input as needed."""
+        nonlocal buffer, pos, eof
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer) or eof:
+                return
+            chunk = stream.read(_read_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+
+    skip(' \t\r\n')
+    if buffer[pos:pos + 1] == '{':
+        buffer += stream.read()
+        yield decoder.decode(buffer[pos:])
+        return
+    if buffer[pos:pos + 1] != '[':
+        raise yatiml.RecognitionError('Expected a CSL-JSON array')
+    pos += 1
+
+    while True:
+        skip(' \t\r\n,')
+        if pos == len(buffer):
+            raise yatiml.RecognitionError('Unexpected end of CSL-JSON input')
+        if buffer[pos] == ']':
+            return
+        try:
+            item, pos = decoder.raw_decode(buffer, pos)
+        except ValueError as e:
+            if eof:
+                raise yatiml.RecognitionError('Invalid CSL-JSON: {}'.format(e))
+            # may be incomplete, try again with more input
+            chunk = stream.read(_read_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        if not isinstance(item, dict):
+            raise yatiml.RecognitionError(
+                    'Expected a CSL-JSON object, got {}'.format(item))
+        yield item
+        if pos > _read_size:
+            buffer, pos = buffer[pos:], 0
+
+
+def _csl_names(value: Any) -> List[Union[Entity, Person]]:
+    names = list()  # type: List[Union[Entity, Person]]
+    for name in value:
+        if 'family' in name:
+            particles = [
+                    name.get(particle)
+                    for particle in ('dropping-particle',
+                                     'non-dropping-particle')
+                    if name.get(particle)]
+            names.append(Person(
+                name['family'], name.get('given', ''),
+                name_particle=' '.join(particles) or None,
+                name_suffix=name.get('suffix')))
+        elif name.get('literal') or name.get('given'):
+            names.append(Entity(name.get('literal') or name['given']))
+    return names
+
+
+def _csl_date_parts(value: Any) -> List[int]:
+    if not isinstance(value, dict):
+        return []
+    parts = value.get('date-parts')
+    if parts and parts[0]:
+        numbers = [_int(part) for part in parts[0]]
+        return [number for number in numbers if number is not None]
+    match = re.match(
+            r'\s*(\d{4})(?:-(\d\d)(?:-(\d\d))?)?', str(value.get('raw', '')))
+    if match is None:
+        return []
+    return [int(part) for part in match.groups() if part is not None]
+
+
+def _set_csl_issued(kwargs: Dict[str, Any], value: Any) -> None:
+    parts = _csl_date_parts(value)
+    if parts:
+        kwargs['year'] = parts[0]
+    if len(parts) > 1 and 1 <= parts[1] <= 12:
+        kwargs['month'] = parts[1]
+    if len(parts) > 2:
+        try:
+            kwargs['date_published'] = date(*parts[:3])
+        except ValueError:
+            pass
+
+
+def _set_csl_date(name: str) -> _Setter:
+    def setter(kwargs: Dict[str, Any], value: Any) -> None:
+        parts = _csl_date_parts(value)
+        if len(parts) > 2:
+            try:
+                kwargs[name] = date(*parts[:3])
+            except ValueError:
+                pass
+    return setter
+
+
+def _set_csl_names(name: str) -> _Setter:
+    def setter(kwargs: Dict[str, Any], value: Any) -> None:
+        names = _csl_names(value)
+        if names:
+            kwargs[name] = names
+    return setter
+
+
+def _set_string(name: str) -> _Setter:
+    return _set_text(name, _plain)
+
+
+def _set_csl_language(kwargs: Dict[str, Any], value: Any) -> None:
+    if value:
+        kwargs['languages'] = [str(value)]
+
+
+_csl_setters = {
+        'DOI': _set_doi(_plain),
+        'ISBN': _set_string('isbn'),
+        'ISSN': _set_string('issn'),
+        'PMCID': _set_string('pmcid'),
+        'URL': _set_string('url'),
+        'abstract': _set_string('abstract'),
+        'accessed': _set_csl_date('date_accessed'),
+        'author': _set_csl_names('authors'),
+        'collection-editor': _set_csl_names('editors_series'),
+        'container-title': _set_string('collection_title'),
+        'edition': _set_string('edition'),
+        'editor': _set_csl_names('editors'),
+        'event': _set_string('conference'),
+        'event-title': _set_string('conference'),
+        'genre': _set_string('thesis_type'),
+        'issue': _set_int_or_text('issue', 'number'),
+        'issued': _set_csl_issued,
+        'keyword': _set_list('keywords', _plain),
+        'language': _set_csl_language,
+        'medium': _set_string('medium'),
+        'note': _set_string('notes'),
+        'number': _set_string('number'),
+        'number-of-pages': _set_int('pages'),
+        'page': _set_pages,
+        'publisher': _set_string('publisher'),
+        'publisher-place': _set_string('_address'),
+        'recipient': _set_csl_names('recipients'),
+        'section': _set_string('section'),
+        'status': _set_string('status'),
+        'title': _set_string('title'),
+        'title-short': _set_string('abbreviation'),
+        'translator': _set_csl_names('translators'),
+        'version': _set_string('version'),
+        'volume': _set_int('volume')}     # type: Dict[str, _Setter]
+
+_csl_types = {
+        'article': 'article', 'article-journal': 'article',
+        'article-magazine': 'magazine-article',
+        'article-newspaper': 'newspaper-article', 'bill': 'bill',
+        'book': 'book', 'dataset': 'data',
+        'entry-dictionary': 'dictionary',
+        'entry-encyclopedia': 'encyclopedia', 'graphic': 'art',
+        'hearing': 'hearing', 'legal_case': 'legal-case',
+        'legislation': 'statute', 'manuscript': 'unpublished', 'map': 'map',
+        'motion_picture': 'film-broadcast', 'pamphlet': 'pamphlet',
+        'paper-conference': 'conference-paper', 'patent': 'patent',
+        'periodical': 'serial',
+        'personal_communication': 'personal-communication',
+        'post-weblog': 'blog', 'report': 'report', 'software': 'software',
+        'song': 'sound-recording', 'standard': 'standard',
+        'thesis': 'thesis', 'webpage': 'website'}
+
+
+def _csl_table(csl_type: str) -> _Table:
+    typ = _csl_types.get(csl_type, 'generic')
+    setters = dict(_csl_setters)
+    if typ in ('article', 'magazine-article', 'newspaper-article'):
+        setters['container-title'] = _set_string('journal')
+    if typ in ('data', 'database'):
+        setters['genre'] = _set_string('data_type')
+    elif typ != 'thesis':
+        del setters['genre']
+    return typ, {}, setters
+
+
+_csl_tables = {csl_type: _csl_table(csl_type) for csl_type in _csl_types}
+
+_csl_default_table = _csl_table('document')
+
+
+def _csl_reference(item: Dict[str, Any]) -> Reference:
+    """Converts a CSL-JSON item to a Reference."""
+    what = 'CSL-JSON item {}'.format(item.get('id', ''))
+    typ, defaults, setters = _csl_tables.get(
+            item.get('type'), _csl_default_table)
+    kwargs = dict(defaults)
+    kwargs['typ'] = typ
+    try:
+        for name, value in item.items():
+            setter = setters.get(name)
+            if setter is not None:
+                setter(kwargs, value)
+        _make_entities(kwargs)
+    except (RuntimeError, AttributeError, KeyError, TypeError) as e:
+        raise yatiml.RecognitionError('{}: {}'.format(what, e))
+    return _make_reference(kwargs, what)
+
+
+def iter_bibtex(
+        source: Source, jobs: int = 1, skip_invalid: bool = False
+        ) -> Iterator[Reference]:
+    """Import references from BibTeX.
+
+    The input is read a piece at a time, so that large files do not
+    have to fit in memory. Macros defined with @string and the month
+    macros are expanded, and LaTeX accents and escapes are converted.
+
+    Args:
+        source: A string containing BibTeX, a path to a file, or an
+                open stream.
+        jobs: Number of processes to convert entries in.
+        skip_invalid: Skip entries that cannot be parsed or that
+                result in an invalid reference, rather than raising.
+
+    Yields:
+        A Reference, or a BookReference, for each entry.
+
+    Raises:
+        yatiml.RecognitionError: If an entry is invalid.
+    """
+    with _open(source) as stream:
+        yield from _convert(
+                _bibtex_entries(stream, skip_invalid), _bibtex_reference,
+                jobs, skip_invalid)
+
+
+def iter_csl_json(
+        source: Source, jobs: int = 1, skip_invalid: bool = False
+        ) -> Iterator[Reference]:
+    """Import references from CSL-JSON.
+
+    The input is read a piece at a time, so that large files do not
+    have to fit in memory.
+
+    Args:
+        source: A string containing CSL-JSON, a path to a file, or an
+                open stream.
+        jobs: Number of processes to convert items in.
+        skip_invalid: Skip items that result in an invalid reference,
+                rather than raising.
+
+    Yields:
+        A Reference, or a BookReference, for each item.
+
+    Raises:
+        yatiml.RecognitionError: If the input is not valid CSL-JSON,
+                or an item is invalid.
+    """
+    with _open(source) as stream:
+        yield from _convert(
+                _csl_items(stream), _csl_reference, jobs, skip_invalid)
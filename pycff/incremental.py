@@ -0,0 +1,282 @@
+"""Reloading of edited CFF documents.
+
+An :class:`IncrementalLoader` remembers the text of each top-level
+attribute and of each reference of the last document it loaded. When
+loading a new version of the document, only the attributes and
+references whose text changed are constructed and validated again,
+the objects for the others are taken from the previous version.
+
+The new text does still need to be parsed in full, but this is done
+by libyaml if it is available, and is a lot cheaper than constructing
+and validating all the objects.
+
+Like :func:`pycff.versions.load`, the loader uses the classes and
+validators of the cff-version of each document.
+"""
+from collections import Counter
+from pathlib import Path
+from typing import (
+        Any, Dict, IO, Iterator, List, Optional, Tuple, Type, Union)
+
+import yaml
+import yatiml
+
+from pycff.instrumentation import _instrumented_loader
+from pycff.pycff import (
+        _class_info, _using_validators, CitationCFF, Entity, Identifier,
+        Person, Reference)
+from pycff.streaming import _construct_node, _EventSource, _read_node
+from pycff.versions import (
+        _read_source, _Schema, _schema_by_version, load, peek_version)
+
+
+_Parser = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# text of a node, and its events
+_Segment = Tuple[str, List[yaml.Event]]
+
+# loaders for the top-level attributes by class and attribute name,
+# created when first needed
+_loaders = dict()   # type: Dict[Tuple[Type, str], Any]
+
+_load_reference = yatiml.load_function(Reference, Entity, Person, Identifier)
+
+
+class _ReferenceLoader(      # type: ignore
+        _EventSource, _instrumented_loader(_load_reference.loader)):
+    """Loads a reference from parser events, like load() would."""
+
+
+class _Fallback(Exception):
+    """Raised if the document needs to be loaded in full."""
+
+
+def _loader_for(class_: Type, name: str) -> Any:
+    """Get an event loader for a top-level attribute of a document."""
+    if (class_, name) not in _loaders:
+        load_function = yatiml.load_function(
+                _class_info[class_].types[name], Reference, Entity,
+                Person, Identifier)
+        loader = _instrumented_loader(load_function.loader)
+        _loaders[class_, name] = type(
+                'EventLoader', (_EventSource, loader), dict())
+    return _loaders[class_, name]
+
+
+def _read_segment(
+        text: str, first: yaml.Event, events: Iterator[yaml.Event]
+        ) -> _Segment:
+    """Reads a node, and gets its text."""
+    node_events = _read_node(first, events, True)
+    for event in node_events:
+        if isinstance(event, yaml.AliasEvent) or getattr(
+                event, 'anchor', None) is not None:
+            # would need the rest of the document to construct
+            raise _Fallback()
+    # block nodes end where the next token starts, so strip the white
+    # space in between to be able to compare them
+    node_text = text[first.start_mark.index:node_events[-1].end_mark.index]
+    return node_text.rstrip(), node_events
+
+
+def _segment(
+        text: str, class_: Type, old_texts: Dict[str, str],
+        old_references: Dict[str, int]
+        ) -> Tuple[Dict[str, _Segment], Optional[List[_Segment]]]:
+    """Splits a document into top-level attributes and references.
+
+    Events are only kept for segments that changed, to save memory and
+    time in the garbage collector.
+
+    Args:
+        text: The document to split.
+        class_: The class of the document.
+        old_texts: Text of the top-level attributes of the previous
+                version, by attribute name.
+        old_references: Number of times each reference text occurs in
+                the previous version.
+
+    Returns:
+        The segments of the top-level attributes by attribute name,
+        and those of the references. If the references are a list,
+        they are not in the former.
+    """
+    info = _class_info[class_]
+    old_references = dict(old_references)
+    events = yaml.parse(text, Loader=_Parser)
+    for expected in (
+            yaml.StreamStartEvent, yaml.DocumentStartEvent,
+            yaml.MappingStartEvent):
+        if not isinstance(next(events), expected):
+            raise _Fallback()
+
+    attributes = dict()     # type: Dict[str, _Segment]
+    references = None       # type: Optional[List[_Segment]]
+    key_event = next(events)
+    while not isinstance(key_event, yaml.MappingEndEvent):
+        name = info.args.get(getattr(key_event, 'value', None))
+        if not isinstance(key_event, yaml.ScalarEvent) or name is None:
+            raise _Fallback()
+
+        value_event = next(events)
+        if name == 'references' and isinstance(
+                value_event, yaml.SequenceStartEvent):
+            references = list()
+            item_event = next(events)
+            while not isinstance(item_event, yaml.SequenceEndEvent):
+                item_text, item_events = _read_segment(
+                        text, item_event, events)
+                if old_references.get(item_text, 0) > 0:
+                    old_references[item_text] -= 1
+                    item_events = []
+                references.append((item_text, item_events))
+                item_event = next(events)
+        else:
+            value_text, value_events = _read_segment(
+                    text, value_event, events)
+            if old_texts.get(name) == value_text:
+                value_events = []
+            attributes[name] = (value_text, value_events)
+        key_event = next(events)
+
+    if not isinstance(next(events), yaml.DocumentEndEvent):
+        raise _Fallback()
+    return attributes, references
+
+
+class IncrementalLoader:
+    """Loads successive versions of a document, reusing objects.
+
+    The returned objects share unchanged parts with the previously
+    returned ones, so they must not be modified.
+
+    Attributes:
+        cff: The last document loaded, or None if there is none yet.
+        changed: Names of the top-level attributes that were rebuilt
+                or removed by the last load. If the references are a
+                list, they are counted in rebuilt_references instead.
+        rebuilt_references: Number of references that were rebuilt by
+                the last load.
+    """
+    def __init__(self) -> None:
+        """Create an IncrementalLoader."""
+        self.cff = None         # type: Optional[CitationCFF]
+        self.changed = list()   # type: List[str]
+        self.rebuilt_references = 0
+        self._texts = dict()                # type: Dict[str, str]
+        self._reference_texts = list()      # type: List[str]
+        self._reference_counts = dict()     # type: Dict[str, int]
+        self._schema = None                 # type: Optional[_Schema]
+
+    def load(self, source: Union[str, Path, IO[str]]) -> CitationCFF:
+        """Load a new version of the document.
+
+        Args:
+            source: A string containing YAML, a path to a file, or an
+                    open stream, like the argument of
+                    :func:`pycff.pycff.load`.
+
+        Returns:
+            The loaded document, a :class:`pycff.pycff.CitationCFF12`
+            for CFF 1.2.0 documents.
+
+        Raises:
+            yatiml.RecognitionError: If the document is invalid. The
+                    previous version is kept in that case.
+        """
+        text = _read_source(source)
+        schema = _schema_by_version.get(peek_version(text) or '')
+        try:
+            if schema is None:
+                raise _Fallback()
+            if schema is self._schema:
+                old_texts, old_counts = self._texts, self._reference_counts
+            else:
+                # objects of another version cannot be reused
+                old_texts, old_counts = dict(), dict()
+            try:
+                attributes, references = _segment(
+                        text, schema.classes[0], old_texts, old_counts)
+            except yaml.YAMLError:
+                raise _Fallback()
+            cff = self._build(schema, attributes, references)
+        except _Fallback:
+            # unusual document, or an error that load() will report
+            # properly with the location in the document
+            self._load_full(text)
+        else:
+            self.cff = cff
+            self._schema = schema
+            self._texts = {
+                    name: segment[0] for name, segment in attributes.items()}
+            self._reference_texts = [
+                    segment[0] for segment in references or ()]
+            self._reference_counts = Counter(self._reference_texts)
+        return self.cff
+
+    def _build(
+            self, schema: _Schema, attributes: Dict[str, _Segment],
+            references: Optional[List[_Segment]]) -> CitationCFF:
+        """Builds a document, reusing objects where possible."""
+        with _using_validators(schema.validators):
+            return self._build_objects(
+                    schema.classes[0], attributes, references)
+
+    def _build_objects(
+            self, class_: Type, attributes: Dict[str, _Segment],
+            references: Optional[List[_Segment]]) -> CitationCFF:
+        """Builds a document of the given class, see _build()."""
+        old = self.cff
+        changed = list()
+        kwargs = dict()     # type: Dict[str, Any]
+        for name, (text, node_events) in attributes.items():
+            if not node_events:
+                kwargs[name] = getattr(old, name)
+            else:
+                kwargs[name] = _construct_node(
+                        _loader_for(class_, name), node_events)
+                changed.append(name)
+        changed.extend(
+                name for name in self._texts if name not in attributes)
+
+        rebuilt = 0
+        if references is not None:
+            # maps texts to the previous objects, in order
+            reusable = dict()   # type: Dict[str, List[Reference]]
+            if old is not None and old.references:
+                for text, reference in zip(
+                        self._reference_texts, old.references):
+                    reusable.setdefault(text, []).append(reference)
+
+            kwargs['references'] = list()
+            for text, node_events in references:
+                if not node_events:
+                    reference = reusable[text].pop(0)
+                else:
+                    reference = _construct_node(
+                            _ReferenceLoader, node_events)
+                    rebuilt += 1
+                kwargs['references'].append(reference)
+
+        for name in _class_info[class_].required:
+            if name not in kwargs:
+                raise _Fallback()
+        try:
+            cff = class_(**kwargs)
+        except RuntimeError:
+            raise _Fallback()
+
+        self.changed = changed
+        self.rebuilt_references = rebuilt
+        return cff
+
+    def _load_full(self, text: str) -> None:
+        self.cff = load(text)
+        self.changed = [
+                name for name, _ in _class_info[type(self.cff)].keys
+                if name != 'references']
+        self.rebuilt_references = len(self.cff.references or ())
+        self._texts = dict()
+        self._reference_texts = list()
+        self._reference_counts = dict()
+        self._schema = None
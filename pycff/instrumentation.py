@@ -0,0 +1,175 @@
+"""Optional instrumentation of loading, validation and dumping.
+
+Instrumentation is disabled by default, in which case it costs next to
+nothing. Within an :func:`instrument` context, pycff records how much
+time is spent in each phase of loading and dumping, and counts the
+objects constructed and the field validators run. The results can be
+inspected directly, or passed to a callback, e.g. to forward them to a
+metrics system:
+
+.. code-block:: python
+
+    def report(metrics):
+        for name, value in metrics.as_dict().items():
+            statsd.gauge('pycff.' + name, value)
+
+    with instrument(report):
+        cff = load(path)
+
+Instrumentation applies to the current thread, so that e.g. requests
+handled concurrently by a web service each get their own metrics.
+"""
+from collections import Counter
+from contextlib import contextmanager
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Type
+
+
+_phases = ('parse', 'recognize', 'construct', 'validate', 'dump')
+
+
+class Metrics:
+    """Timings and counters collected by :func:`instrument`.
+
+    Attributes:
+        timings: Maps phases to total time spent in them, in seconds.
+                The phases are ``parse`` (YAML parsing), ``recognize``
+                (recognition and savorizing by YAtiML), ``construct``
+                (constructing objects, except for validation),
+                ``validate`` (running field validators) and ``dump``.
+        objects: Maps class names to the number of objects
+                constructed.
+        validations: Maps validator rules, e.g. ``orcid`` or ``url``,
+                to the number of values checked.
+        characters_parsed: Number of characters of YAML parsed.
+    """
+    def __init__(self) -> None:
+        """Create an empty Metrics object."""
+        self.timings = dict.fromkeys(_phases, 0.0)
+        self.objects = Counter()        # type: Dict[str, int]
+        self.validations = Counter()    # type: Dict[str, int]
+        self.characters_parsed = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Convert to a flat dict, e.g. for a metrics system.
+
+        Returns:
+            A dict with keys like ``time.parse``, ``objects.Person``,
+            ``validations.orcid`` and ``characters_parsed``.
+        """
+        result = dict()     # type: Dict[str, float]
+        for phase, seconds in self.timings.items():
+            result['time.' + phase] = seconds
+        for class_name, count in self.objects.items():
+            result['objects.' + class_name] = count
+        for rule, count in self.validations.items():
+            result['validations.' + rule] = count
+        result['characters_parsed'] = self.characters_parsed
+        return result
+
+    def _add(self, other: 'Metrics') -> None:
+        for phase, seconds in other.timings.items():
+            self.timings[phase] += seconds
+        self.objects.update(other.objects)
+        self.validations.update(other.validations)
+        self.characters_parsed += other.characters_parsed
+
+
+# The Metrics being collected by the current thread in its metrics
+# attribute, which is missing or None if disabled
+_active = threading.local()
+
+
+@contextmanager
+def instrument(
+        callback: Optional[Callable[[Metrics], None]] = None
+        ) -> Iterator[Metrics]:
+    """Collect metrics for everything done within this context.
+
+    Contexts may be nested, in which case the outer one also gets the
+    metrics collected by the inner one.
+
+    Args:
+        callback: A function to call with the metrics on leaving the
+                context.
+
+    Yields:
+        The Metrics object being filled in.
+    """
+    previous = getattr(_active, 'metrics', None)
+    metrics = Metrics()
+    _active.metrics = metrics
+    try:
+        yield metrics
+    finally:
+        _active.metrics = previous
+        if previous is not None:
+            previous._add(metrics)
+        if callback is not None:
+            callback(metrics)
+
+
+def _timed(phase: str, func: Callable) -> Callable:
+    """Wraps a function so that its run time is recorded."""
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        metrics = getattr(_active, 'metrics', None)
+        if metrics is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            metrics.timings[phase] += time.perf_counter() - start
+
+    return wrapper
+
+
+def _instrumented_loader(loader_class: Type) -> Type:
+    """Makes a subclass of a YAtiML loader that records its phases.
+
+    PyYAML loads a document by composing a node graph from the parser
+    events, which YAtiML then recognises and savorizes, after which the
+    objects are constructed. Validation happens in the constructors, so
+    its time is subtracted from the construction time here.
+    """
+    class InstrumentedLoader(loader_class):     # type: ignore
+        def compose_document(self) -> Any:
+            metrics = getattr(_active, 'metrics', None)
+            if metrics is None:
+                return super().compose_document()
+            start = time.perf_counter()
+            node = super().compose_document()
+            metrics.timings['parse'] += time.perf_counter() - start
+            return node
+
+        def get_single_node(self) -> Any:
+            metrics = getattr(_active, 'metrics', None)
+            if metrics is None:
+                return super().get_single_node()
+            parse_time = metrics.timings['parse']
+            start_index = self.index
+            start = time.perf_counter()
+            node = super().get_single_node()
+            metrics.characters_parsed += self.index - start_index
+            parse_time = metrics.timings['parse'] - parse_time
+            metrics.timings['recognize'] += (
+                    time.perf_counter() - start - parse_time)
+            return node
+
+        def construct_document(self, node: Any) -> Any:
+            metrics = getattr(_active, 'metrics', None)
+            if metrics is None:
+                return super().construct_document(node)
+            validate_time = metrics.timings['validate']
+            start = time.perf_counter()
+            data = super().construct_document(node)
+            validate_time = metrics.timings['validate'] - validate_time
+            metrics.timings['construct'] += (
+                    time.perf_counter() - start - validate_time)
+            return data
+
+    InstrumentedLoader.__name__ = loader_class.__name__
+    return InstrumentedLoader
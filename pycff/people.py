@@ -0,0 +1,259 @@
+"""Finding the same people across many CFF documents.
+
+A :class:`PersonIndex` takes in loaded documents, and resolves the
+Person objects in them to identities. Persons with the same ORCID are
+the same identity. Persons without an ORCID are matched on their email
+address, and failing that on their name. Names are compared case- and
+accent-insensitively. Persons with the same family name and first
+initial are candidates, which match if their given names are
+compatible, that is, equal or abbreviated consistently, like J. and
+John, or J. P. and John Paul. A name match is rejected if both have a
+different ORCID.
+
+Documents can be added at any time, and for each identity the index
+keeps the documents and references it occurs in, so that they can be
+looked up in constant time.
+"""
+import re
+from typing import (
+        Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple)
+
+from pycff.dedup import normalize_text
+from pycff.pycff import CitationCFF, Person
+
+
+# normalized family name and first initial
+_NameKey = Tuple[str, str]
+
+# normalized given names, split into names and initials
+_GivenNames = Tuple[str, ...]
+
+
+_orcid_id = re.compile(r'(\d{4}-\d{4}-\d{4}-\d{3}[\dX])$')
+
+_name_separator = re.compile(r'[\s.-]+')
+
+
+# attributes of References that may contain Persons
+_reference_roles = (
+        'authors', 'contact', 'editors', 'editors_series', 'recipients',
+        'senders', 'translators')
+
+
+def _orcid_key(orcid: Optional[str]) -> Optional[str]:
+    """Extract the identifier from an ORCID URL."""
+    if not orcid:
+        return None
+    match = _orcid_id.search(orcid)
+    return match.group(1) if match else orcid
+
+
+def _email_key(email: Optional[str]) -> Optional[str]:
+    return email.strip().casefold() if email else None
+
+
+def _name_key(person: Person) -> _NameKey:
+    """Compute the blocking key for a person's name."""
+    family = normalize_text(
+            '{} {}'.format(person.name_particle or '', person.family_names))
+    return family, normalize_text(person.given_names)[:1]
+
+
+def _given_names(person: Person) -> _GivenNames:
+    """Split a person's given names into normalized names and initials."""
+    names = map(normalize_text, _name_separator.split(person.given_names))
+    return tuple(name for name in names if name)
+
+
+def _compatible(names: _GivenNames, other: _GivenNames) -> bool:
+    """Whether two sets of given names may be of the same person.
+
+    They are if each name equals the corresponding other name, or one
+    of them is an initial of the other. Missing names are not
+    compared, so that John matches John Paul.
+    """
+    for name, other_name in zip(names, other):
+        if name != other_name and not (
+                len(name) == 1 and other_name.startswith(name) or
+                len(other_name) == 1 and name.startswith(other_name)):
+            return False
+    return True
+
+
+class Identity:
+    """A person, as identified across documents.
+
+    Attributes:
+        number: Identifies this identity within its index.
+        orcid: The person's ORCID id, without the URL part, if known.
+        emails: The person's email addresses, casefolded.
+        names: The names the person appears under, as pairs of
+                family name and given names.
+        documents: Keys of the documents the person is an author or
+                contact of.
+        references: Pairs of a document key and the position of a
+                reference in that document's references, for each
+                reference the person is involved in.
+    """
+    def __init__(self, number: int) -> None:
+        """Create an Identity.
+
+        Args:
+            number: Identifies this identity within its index.
+        """
+        self.number = number
+        self.orcid = None   # type: Optional[str]
+        self.emails = set()         # type: Set[str]
+        self.names = set()          # type: Set[Tuple[str, str]]
+        self.documents = set()      # type: Set[Hashable]
+        self.references = set()     # type: Set[Tuple[Hashable, int]]
+
+    def __repr__(self) -> str:
+        return 'Identity({}, orcid={!r}, names={!r})'.format(
+                self.number, self.orcid, sorted(self.names))
+
+
+# identities with a given name key, each with the given names seen for it
+_Candidates = List[Tuple[Identity, List[_GivenNames]]]
+
+
+class PersonIndex:
+    """An index of people across many CFF documents.
+
+    Attributes:
+        identities: All identities found so far, indexed by number.
+    """
+    def __init__(self, documents: Iterable[CitationCFF] = ()) -> None:
+        """Create a PersonIndex.
+
+        Args:
+            documents: Documents to add initially, keyed by their
+                    position.
+        """
+        self.identities = list()    # type: List[Identity]
+        self._keys = set()          # type: Set[Hashable]
+        self._by_orcid = dict()     # type: Dict[str, Identity]
+        self._by_email = dict()     # type: Dict[str, Identity]
+        self._by_name = dict()      # type: Dict[_NameKey, _Candidates]
+        for document in documents:
+            self.add(document)
+
+    def __len__(self) -> int:
+        return len(self.identities)
+
+    def add(self, document: CitationCFF, key: Hashable = None) -> Hashable:
+        """Add a document to the index.
+
+        Args:
+            document: The document to add.
+            key: Identifies the document, e.g. its path. Defaults to
+                    the number of documents added before it.
+
+        Returns:
+            The key of the document.
+
+        Raises:
+            ValueError: If a document with this key was added before.
+        """
+        if key is None:
+            key = len(self._keys)
+        if key in self._keys:
+            raise ValueError('Document {!r} was already added'.format(key))
+        self._keys.add(key)
+
+        for person in self._persons(document, ('authors', 'contact')):
+            self._resolve(person, True).documents.add(key)
+
+        for i, reference in enumerate(document.references or ()):
+            for person in self._persons(reference, _reference_roles):
+                self._resolve(person, True).references.add((key, i))
+        return key
+
+    def resolve(self, person: Person) -> Optional[Identity]:
+        """Find the identity of a person.
+
+        Args:
+            person: The person to look up.
+
+        Returns:
+            The identity, or None if the person is not in the index.
+        """
+        return self._resolve(person, False)
+
+    def documents_involving(self, person: Person) -> Set[Hashable]:
+        """Find the documents a person is an author or contact of.
+
+        Args:
+            person: The person to look up.
+
+        Returns:
+            The keys of the documents.
+        """
+        identity = self._resolve(person, False)
+        return set(identity.documents) if identity else set()
+
+    def references_involving(
+            self, person: Person) -> Set[Tuple[Hashable, int]]:
+        """Find the references a person is involved in.
+
+        Args:
+            person: The person to look up.
+
+        Returns:
+            Pairs of a document key and the position of the reference
+            in that document's references.
+        """
+        identity = self._resolve(person, False)
+        return set(identity.references) if identity else set()
+
+    def _persons(self, obj: Any, roles: Iterable[str]) -> Iterable[Person]:
+        for role in roles:
+            for item in getattr(obj, role, None) or ():
+                if isinstance(item, Person):
+                    yield item
+
+    def _resolve(self, person: Person, add: bool) -> Optional[Identity]:
+        """Find the identity of a person, optionally adding it."""
+        orcid = _orcid_key(person.orcid)
+        email = _email_key(person.email)
+        name_key = _name_key(person)
+        given_names = _given_names(person)
+
+        identity = None
+        if orcid is not None:
+            identity = self._by_orcid.get(orcid)
+        if identity is None and email is not None:
+            identity = self._by_email.get(email)
+            if identity is not None and orcid is not None and (
+                    identity.orcid not in (None, orcid)):
+                identity = None
+        if identity is None:
+            for candidate, names in self._by_name.get(name_key, ()):
+                if (orcid is None or candidate.orcid in (None, orcid)) and (
+                        all(_compatible(given_names, other)
+                            for other in names)):
+                    identity = candidate
+                    break
+
+        if not add:
+            return identity
+
+        if identity is None:
+            identity = Identity(len(self.identities))
+            self.identities.append(identity)
+        block = self._by_name.setdefault(name_key, [])
+        for candidate, names in block:
+            if candidate is identity:
+                if given_names not in names:
+                    names.append(given_names)
+                break
+        else:
+            block.append((identity, [given_names]))
+        if orcid is not None and identity.orcid is None:
+            identity.orcid = orcid
+            self._by_orcid[orcid] = identity
+        if email is not None and email not in self._by_email:
+            self._by_email[email] = identity
+            identity.emails.add(email)
+        identity.names.add((person.family_names, person.given_names))
+        return identity
@@ -0,0 +1,141 @@
+"""Sharing equal values between loaded documents.
+
+When many documents are loaded, the same publishers, authors, licenses
+and country codes occur again and again, and each occurrence is a
+separate object. A :class:`Pool` replaces each string in a document by
+an equal string it has seen before, and each Person, Entity and
+Identifier by an equal object it has seen before, so that the memory
+used grows with the number of distinct values rather than with the
+number of occurrences.
+
+Objects that are shared in this way cannot be changed, since a change
+would affect every document they occur in. They are instances of a
+private subclass of their class, which raises AttributeError when a
+field is set. Copying or unpickling one gives an ordinary object.
+
+Documents can be added to a pool explicitly with :meth:`Pool.add`, or
+by loading them within a :func:`pooling` context.
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple, TypeVar
+
+from pycff import pycff
+
+
+T = TypeVar('T')
+
+
+class Pool:
+    """Shares strings and Person, Entity and Identifier objects.
+
+    A pool keeps its strings and objects alive until it is itself
+    discarded.
+    """
+    def __init__(self) -> None:
+        """Create an empty Pool."""
+        self._strings = dict()      # type: Dict[str, str]
+        # Shared objects by the hash of their class and fields. We
+        # don't keep tuples of the fields as keys, as they would take
+        # as much memory as the objects themselves. A list holds
+        # objects with the same hash.
+        self._objects = dict()      # type: Dict[int, Any]
+        self._num_objects = 0
+
+    @property
+    def num_strings(self) -> int:
+        """The number of distinct strings in the pool."""
+        return len(self._strings)
+
+    @property
+    def num_objects(self) -> int:
+        """The number of distinct shared objects in the pool."""
+        return self._num_objects
+
+    def add(self, value: T) -> T:
+        """Add a value and everything it contains to the pool.
+
+        The fields of model objects are updated in place to refer to
+        pooled strings and shared objects. Lazily validated objects are
+        validated completely while this is done.
+
+        Args:
+            value: A loaded document or other model object, a list of
+                    them, or a field value.
+
+        Returns:
+            The value, or the equal value from the pool that replaces
+            it.
+
+        Raises:
+            RuntimeError: If a lazily validated object turns out to be
+                    invalid.
+        """
+        type_ = type(value)
+        if type_ is str:
+            return self._strings.setdefault(value, value)    # type: ignore
+        if type_ is list:
+            return [self.add(item) for item in value]   # type: ignore
+        info = pycff._class_info.get(type_)
+        if info is None:
+            return value
+
+        class_ = getattr(type_, '_eager_class', type_)
+        if type_ is not pycff._shared_classes.get(class_):
+            for name, _ in info.keys:
+                field = getattr(value, name)
+                pooled = self.add(field)
+                if pooled is not field:
+                    setattr(value, name, pooled)
+            if class_ not in pycff._shared_classes:
+                return value
+
+        fields = _fields(value, info)
+        key = hash((class_,) + fields)
+        bucket = self._objects.get(key)
+        if bucket is not None:
+            for shared in bucket if type(bucket) is list else (bucket,):
+                if (shared._eager_class is class_ and
+                        _fields(shared, info) == fields):
+                    return shared
+
+        if type(value) is class_:
+            value.__class__ = pycff._shared_classes[class_]
+        if bucket is None:
+            self._objects[key] = value
+        elif type(bucket) is list:
+            bucket.append(value)
+        else:
+            self._objects[key] = [bucket, value]
+        self._num_objects += 1
+        return value
+
+
+def _fields(obj: Any, info: pycff._ClassInfo) -> Tuple[Any, ...]:
+    """Gets the values of the fields of a model object."""
+    return tuple(getattr(obj, name) for name, _ in info.keys)
+
+
+@contextmanager
+def pooling(pool: Optional[Pool] = None) -> Iterator[Pool]:
+    """Add documents loaded within this context to a pool.
+
+    This applies to :func:`pycff.pycff.load`,
+    :func:`pycff.pycff.load_lazy`, :func:`pycff.pycff.from_dict`,
+    :func:`pycff.pycff.load_json`, :func:`pycff.versions.load` and
+    :func:`pycff.batch.load_many` in the current thread. Lazily loaded
+    documents are validated completely when they are added.
+
+    Args:
+        pool: The pool to add to. If None, a new pool is made.
+
+    Returns:
+        The pool that documents are added to.
+    """
+    if pool is None:
+        pool = Pool()
+    previous = getattr(pycff._pool_mode, 'pool', None)
+    pycff._pool_mode.pool = pool
+    try:
+        yield pool
+    finally:
+        pycff._pool_mode.pool = previous
@@ -1,11 +1,125 @@
 import yatiml
-
-from datetime import datetime
+from yatiml.util import (
+        generic_type_args, is_generic_sequence, is_generic_union)
+
+from contextlib import contextmanager
+from datetime import date, datetime
+import difflib
+import inspect
+import json
+from pathlib import Path
 import re
-from typing import List, Optional, Union
+import threading
+import time
+from typing import (
+        Any, Callable, Container, Dict, IO, Iterable, Iterator, List,
+        Optional, Tuple, Type, Union)
+
+from pycff import instrumentation as _instrumentation
+
+
+def _normalize_term(value: str) -> str:
+    """Normalize a term for loose matching.
+
+    This ignores case and punctuation, so that e.g. "apache 2.0" and
+    "Apache-2.0" normalize to the same thing.
+    """
+    return ''.join(c for c in value.casefold() if c.isalnum())
+
+
+# Number of suggestions a Vocabulary remembers
+_max_cached_suggestions = 1024
+
+
+class Vocabulary:
+    """A controlled vocabulary, a set of valid values for a field.
+
+    Membership tests are exact and take constant time. Case- and
+    punctuation-insensitive lookups go through an index of normalized
+    terms that is built once, when the vocabulary is created.
+
+    Suggestions for misspelled values are found by difflib, which only
+    considers terms of a similar length. The normalized terms are
+    indexed by length, so that only those are compared, and recent
+    suggestions are remembered.
+    """
+    def __init__(self, terms: Iterable[str]) -> None:
+        """Create a Vocabulary.
+
+        Args:
+            terms: The valid values.
+        """
+        self._terms = frozenset(terms)
+        self._index = dict()    # type: Dict[str, str]
+        for term in sorted(self._terms):
+            self._index.setdefault(_normalize_term(term), term)
+        self._by_length = dict()    # type: Dict[int, List[str]]
+        for normalized in self._index:
+            self._by_length.setdefault(len(normalized), []).append(
+                    normalized)
+        self._suggestions = dict()  # type: Dict[Tuple[str, int], List[str]]
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._terms
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(sorted(self._terms))
+
+    def __len__(self) -> int:
+        return len(self._terms)
 
+    def lookup(self, value: str) -> Optional[str]:
+        """Find a term, ignoring case and punctuation.
 
-_valid_license_strings = [
+        Args:
+            value: The value to look up.
+
+        Returns:
+            The term in its canonical spelling, or None if there is
+            no matching term.
+        """
+        if value in self._terms:
+            return value
+        return self._index.get(_normalize_term(value))
+
+    def suggest(self, value: str, max_suggestions: int = 3) -> List[str]:
+        """Suggest terms for a value that is not in the vocabulary.
+
+        Args:
+            value: A possibly misspelled value.
+            max_suggestions: The maximum number of terms to return.
+
+        Returns:
+            Terms similar to the value, best match first.
+        """
+        term = self.lookup(value)
+        if term is not None:
+            return [term]
+
+        normalized = _normalize_term(value)
+        key = (normalized, max_suggestions)
+        suggestions = self._suggestions.get(key)
+        if suggestions is None:
+            # get_close_matches needs a ratio 2M / (a + b) of at least
+            # 0.6, where M <= min(a, b), so the length b of a match is
+            # at least 3a / 7 and at most 7a / 3.
+            length = len(normalized)
+            candidates = [
+                    candidate
+                    for candidate_length in range(
+                        -(-3 * length // 7), 7 * length // 3 + 1)
+                    for candidate in self._by_length.get(
+                        candidate_length, ())]
+            matches = difflib.get_close_matches(
+                    normalized, candidates, max_suggestions)
+            suggestions = [self._index[match] for match in matches]
+            if len(self._suggestions) >= _max_cached_suggestions:
+                self._suggestions.clear()
+            self._suggestions[key] = suggestions
+        return list(suggestions)
+
+
+_valid_license_strings = Vocabulary([
         '0BSD', 'AAL', 'Abstyles', 'Adobe-2006', 'Adobe-Glyph', 'ADSL',
         'AFL-1.1', 'AFL-1.2', 'AFL-2.0', 'AFL-2.1', 'AFL-3.0', 'Afmparse',
         'AGPL-1.0', 'AGPL-3.0-only', 'AGPL-3.0-or-later', 'Aladdin', 'AMDPLPA',
@@ -74,9 +188,9 @@ _valid_license_strings = [
         'W3C-20150513', 'Watcom-1.0', 'Wsuipa', 'WTFPL', 'X11', 'Xerox',
         'XFree86-1.1', 'xinetd', 'Xnet', 'xpp', 'XSkat', 'YPL-1.0', 'YPL-1.1',
         'Zed', 'Zend-2.0', 'Zimbra-1.3', 'Zimbra-1.4', 'Zlib',
-        'zlib-acknowledgement', 'ZPL-1.1', 'ZPL-2.0', 'ZPL-2.1']
+        'zlib-acknowledgement', 'ZPL-1.1', 'ZPL-2.0', 'ZPL-2.1'])
 
-_valid_country_codes = [
+_valid_country_codes = Vocabulary([
         'AF', 'AX', 'AL', 'DZ', 'AS', 'AD', 'AO', 'AI', 'AQ', 'AG', 'AR', 'AM',
         'AW', 'AU', 'AT', 'AZ', 'BS', 'BH', 'BD', 'BB', 'BY', 'BE', 'BZ', 'BJ',
         'BM', 'BT', 'BO', 'BQ', 'BA', 'BW', 'BV', 'BR', 'IO', 'BN', 'BG', 'BF',
@@ -86,7 +200,7 @@ _valid_country_codes = [
         'FO', 'FJ', 'FI', 'FR', 'GF', 'PF', 'TF', 'GA', 'GM', 'GE', 'DE', 'GH',
         'GI', 'GR', 'GL', 'GD', 'GP', 'GU', 'GT', 'GG', 'GN', 'GW', 'GY', 'HT',
         'HM', 'VA', 'HN', 'HK', 'HU', 'IS', 'IN', 'ID', 'IR', 'IQ', 'IE', 'IM',
-        'IL', 'IT', 'JM', 'JP', 'JE', 'JO', 'KZ', 'KE', 'KI', 'KP', 'KR', 'KW'
+        'IL', 'IT', 'JM', 'JP', 'JE', 'JO', 'KZ', 'KE', 'KI', 'KP', 'KR', 'KW',
         'KG', 'LA', 'LV', 'LB', 'LS', 'LR', 'LY', 'LI', 'LT', 'LU', 'MO', 'MK',
         'MG', 'MW', 'MY', 'MV', 'ML', 'MT', 'MH', 'MQ', 'MR', 'MU', 'YT', 'MX',
         'FM', 'MD', 'MC', 'MN', 'ME', 'MS', 'MA', 'MZ', 'MM', 'NA', 'NR', 'NP',
@@ -97,9 +211,9 @@ _valid_country_codes = [
         'SO', 'ZA', 'GS', 'SS', 'ES', 'LK', 'SD', 'SR', 'SJ', 'SZ', 'SE', 'CH',
         'SY', 'TW', 'TJ', 'TZ', 'TH', 'TL', 'TG', 'TK', 'TO', 'TT', 'TN', 'TR',
         'TM', 'TC', 'TV', 'UG', 'UA', 'AE', 'GB', 'UM', 'US', 'UY', 'UZ', 'VU',
-        'VE', 'VN', 'VG', 'VI', 'WF', 'EH', 'YE', 'ZM', 'ZW']
+        'VE', 'VN', 'VG', 'VI', 'WF', 'EH', 'YE', 'ZM', 'ZW'])
 
-_valid_reference_types = [
+_valid_reference_types = Vocabulary([
         'art', 'article', 'audiovisual', 'bill', 'blog', 'book', 'catalogue',
         'conference', 'conference-paper', 'data', 'database', 'dictionary',
         'edited-work', 'encyclopedia', 'film-broadcast', 'generic',
@@ -109,9 +223,13 @@ _valid_reference_types = [
         'personal-communication', 'proceedings', 'report', 'serial', 'slides',
         'software', 'software-code', 'software-container',
         'software-executable', 'software-virtual-machine', 'sound-recording',
-        'standard', 'statute', 'thesis', 'unpublished', 'video', 'website']
+        'standard', 'statute', 'thesis', 'unpublished', 'video', 'website'])
+
+_valid_identifier_types = Vocabulary(['doi', 'url', 'swh', 'other'])
 
 
+# Not used for validation anymore, as it takes exponential time on some
+# inputs, see _check_arg_url().
 _regex_url = (
         '^(?:(?:https?|ftp)://)(?:\S+(?::\S*)?@)?(?:(?!(?:10|127)'
         '(?:\.\d{1,3}){3})(?!(?:169\.254|192\.168)(?:\.\d{1,3}){2})'
@@ -128,66 +246,430 @@ _regex_doi = '^10\.\d{4,9}(\.\d+)?/[A-Za-z0-9-\._;\(\)\[\]\\\\:/]+$'
 _regex_orcid = ('https://orcid\\.org/[0-9]{4}-[0-9]{4}-[0-9]{4}-'
                 '[0-9]{3}[0-9X]{1}')
 
+_regex_email = '^[\S]+@[\S]+\.[\S]{2,}$'
+
+_regex_commit = '^[a-f0-9]{7,40}$'
+
+_supported_versions = Vocabulary(
+        ['1.0.1', '1.0.2', '1.0.3', '1.1.0', '1.2.0'])
+
+# Versions of CFF that CitationCFF, and so load(), supports. CFF 1.2.0
+# documents need CitationCFF12, see pycff.versions.load().
+_citation_cff_versions = Vocabulary(['1.0.1', '1.0.2', '1.0.3', '1.1.0'])
+
+_citation_cff12_versions = Vocabulary(['1.2.0'])
+
+_valid_cff_types = Vocabulary(['dataset', 'software'])
+
+
+def _check_arg_set(value: str, legal_values: Container[str]) -> None:
+    if value not in legal_values:
+        message = 'Invalid value {}'.format(value)
+        if isinstance(legal_values, Vocabulary):
+            suggestions = legal_values.suggest(value)
+            if suggestions:
+                message += ', did you mean {}?'.format(' or '.join(
+                    '"{}"'.format(term) for term in suggestions))
+        raise RuntimeError(message)
 
-def _check_arg_regex(value: str, regex: str) -> None:
-    if re.fullmatch(regex, value) is None:
-        raise RuntimeError('Invalid value "{}".'.format(value))
+
+def _check_cff_version(value: str) -> None:
+    if value in _supported_versions and value not in _citation_cff_versions:
+        raise RuntimeError(
+                'CFF {} documents cannot be loaded as CitationCFF, use'
+                ' pycff.versions.load() instead.'.format(value))
+    _check_arg_set(value, _citation_cff_versions)
+
+
+def _check_is_date(value: date) -> None:
+    if isinstance(value, datetime) and (
+            value.hour != 0 or value.minute != 0 or value.second != 0 or
+            value.microsecond != 0 or value.tzinfo is not None):
+        raise RuntimeError('Invalid date containing time of day "{}".'.format(
+            value))
+
+
+def _regex_validator(
+        regex: str, message: str = 'Invalid value "{}".'
+        ) -> Callable[[str], None]:
+    """Create a validator that checks values against a regex.
+
+    The regex is compiled once, here, so that validating a value does
+    not go through the re module's cache, which is too small to hold
+    all our patterns at once.
+
+    Args:
+        regex: The regular expression the whole value must match.
+        message: Error message, with {} for the offending value.
+
+    Returns:
+        A function that raises RuntimeError if its argument does not
+        match.
+    """
+    pattern = re.compile(regex)
+
+    def validator(value: str) -> None:
+        if pattern.fullmatch(value) is None:
+            raise RuntimeError(message.format(value))
+
+    return validator
+
+
+def _set_validator(legal_values: Container[str]) -> Callable[[str], None]:
+    """Create a validator that checks values against a vocabulary.
+
+    Args:
+        legal_values: The values that are allowed.
+
+    Returns:
+        A function that raises RuntimeError if its argument is not
+        one of the legal values.
+    """
+    def validator(value: str) -> None:
+        _check_arg_set(value, legal_values)
+
+    return validator
+
+
+# Values longer than these are rejected before matching anything, so
+# that validating a field takes bounded time.
+_max_url_length = 8192
+
+_max_doi_length = 1024
+
+_url_schemes = ('http://', 'https://', 'ftp://')
+
+# Parts of _regex_url, none of which backtracks more than linearly
+_pattern_no_space = re.compile(r'\S*')
+
+_pattern_ipv4 = re.compile(
+        r'(?!(?:10|127)(?:\.\d{1,3}){3})'
+        r'(?!(?:169\.254|192\.168)(?:\.\d{1,3}){2})'
+        r'(?!172\.(?:1[6-9]|2\d|3[0-1])(?:\.\d{1,3}){2})'
+        r'(?:[1-9]\d?|1\d\d|2[01]\d|22[0-3])'
+        r'(?:\.(?:1?\d{1,2}|2[0-4]\d|25[0-5])){2}'
+        r'(?:\.(?:[1-9]\d?|1\d\d|2[0-4]\d|25[0-4]))')
+
+_pattern_domain_label = re.compile(
+        r'[a-z\u00a1-\uffff0-9]+(?:-[a-z\u00a1-\uffff0-9]+)*')
+
+_pattern_top_level_domain = re.compile(r'[a-z\u00a1-\uffff]{2,}')
+
+_pattern_port = re.compile(r'\d{2,5}')
+
+
+def _is_valid_host(host: str) -> bool:
+    """Checks a host name or IPv4 address, as _regex_url would."""
+    if len(host) > 253:
+        return False
+    if _pattern_ipv4.fullmatch(host) is not None:
+        return True
+    labels = host.split('.')
+    if len(labels) < 2 or any(len(label) > 63 for label in labels):
+        return False
+    if _pattern_top_level_domain.fullmatch(labels[-1]) is None:
+        return False
+    return all(
+            _pattern_domain_label.fullmatch(label) is not None
+            for label in labels[:-1])
 
 
 def _check_arg_url(value: str) -> None:
-    try:
-        _check_arg_regex(value, _regex_url)
-    except RuntimeError:
+    """Checks that a value is a valid URL.
+
+    This accepts the same URLs as _regex_url, except that the user
+    name and password cannot contain a slash, and host names must fit
+    in DNS. It takes linear time, while _regex_url takes exponential
+    time on host names with many dots that do not quite match.
+
+    Raises:
+        RuntimeError: If the value is not a valid URL.
+    """
+    valid = (
+            len(value) <= _max_url_length and
+            value.startswith(_url_schemes) and
+            _pattern_no_space.fullmatch(value) is not None)
+    if valid:
+        rest = value[value.index('//') + 2:]
+        authority = rest.split('/', 1)[0]
+        user_info, at, host_port = authority.rpartition('@')
+        host, colon, port = host_port.partition(':')
+        valid = (
+                (user_info != '' or at == '') and
+                (colon == '' or _pattern_port.fullmatch(port) is not None) and
+                _is_valid_host(host))
+    if not valid:
         raise RuntimeError('"{}" is not a valid URL.'.format(value))
 
 
+_pattern_doi = re.compile(_regex_doi)
+
+
 def _check_arg_doi(value: str) -> None:
-    try:
-        _check_arg_regex(value, _regex_doi)
-    except RuntimeError:
+    """Checks that a value is a valid DOI.
+
+    Raises:
+        RuntimeError: If the value is not a valid DOI.
+    """
+    if (
+            len(value) > _max_doi_length or not value.startswith('10.') or
+            '/' not in value or _pattern_doi.fullmatch(value) is None):
         raise RuntimeError('"{}" is not a valid doi.'.format(value))
 
 
+def _check_arg_email(value: str) -> None:
+    """Checks that a value is an email address, in linear time.
+
+    This accepts the same values as _regex_email, which backtracks
+    quadratically on long values.
+
+    Raises:
+        RuntimeError: If the value is not an email address.
+    """
+    at = value.find('@', 1)
+    if (
+            at == -1 or value.find('.', at + 2, len(value) - 2) == -1 or
+            _pattern_no_space.fullmatch(value) is None):
+        raise RuntimeError('Invalid value "{}".'.format(value))
+
+
+_orcid_prefix = 'https://orcid.org/'
+
+_pattern_orcid = re.compile(_regex_orcid)
+
+
+def _orcid_check_digit(digits: str) -> str:
+    """Calculates the ISO 7064 11,2 check digit of an ORCID.
+
+    Args:
+        digits: The first 15 digits of the ORCID.
+
+    Returns:
+        The check digit, which is a digit or X.
+    """
+    total = 0
+    for digit in digits:
+        total = (total + int(digit)) * 2
+    result = (12 - total % 11) % 11
+    return 'X' if result == 10 else str(result)
+
+
 def _check_arg_orcid(value: str) -> None:
-    try:
-        _check_arg_regex(value, _regex_orcid)
-    except RuntimeError:
+    """Checks that a value is a valid ORCID URL, including check digit.
+
+    Raises:
+        RuntimeError: If the value is not a valid ORCID.
+    """
+    if (
+            len(value) != len(_orcid_prefix) + 19 or
+            not value.startswith(_orcid_prefix) or
+            _pattern_orcid.fullmatch(value) is None or
+            _orcid_check_digit(value[-19:-1].replace('-', '')) !=
+            value[-1]):
         raise RuntimeError('"{}" is not a valid ORCID.'.format(value))
 
 
-def _check_arg_set(value: str, legal_values: List[str]) -> None:
-    if value not in legal_values:
-        raise RuntimeError('Invalid value {}'.format(value))
+# Validators by rule name. Classes refer to these from their
+# _field_rules tables, which map constructor arguments to rule names.
+_validators = {
+        'cff_type': _set_validator(_valid_cff_types),
+        'cff_version': _check_cff_version,
+        'cff_version_12': _set_validator(_citation_cff12_versions),
+        'commit': _regex_validator(_regex_commit),
+        'country': _set_validator(_valid_country_codes),
+        'date': _check_is_date,
+        'doi': _check_arg_doi,
+        'email': _check_arg_email,
+        'identifier_type': _set_validator(_valid_identifier_types),
+        'license': _set_validator(_valid_license_strings),
+        'orcid': _check_arg_orcid,
+        'reference_type': _set_validator(_valid_reference_types),
+        'url': _check_arg_url
+        }   # type: Dict[str, Callable[[Any], None]]
+
+
+# Whether constructors should skip validation, see lazy_validation()
+_lazy_mode = threading.local()
+
+# Validators to use instead of _validators, see _using_validators()
+_validator_table = threading.local()
+
+
+@contextmanager
+def _using_validators(validators: Dict[str, Callable[[Any], None]]
+                      ) -> Iterator[None]:
+    """Validate with the given table instead of _validators.
+
+    This applies to objects created within this context in the current
+    thread. Fields of lazily validated objects that are checked later
+    use _validators.
+    """
+    previous = getattr(_validator_table, 'validators', _validators)
+    _validator_table.validators = validators
+    try:
+        yield
+    finally:
+        _validator_table.validators = previous
+
+
+def _check_fields(
+        obj: Any, rules: Dict[str, str], values: Dict[str, Any]) -> None:
+    """Validate constructor arguments using the validator registry.
+
+    Arguments that are None are optional and not given, and are
+    skipped. In lazy validation mode, nothing is checked here. Instead,
+    the fields to check are recorded, and the object is made an
+    instance of the corresponding lazy class, which checks them when
+    they are first accessed.
+
+    Args:
+        obj: The object being constructed.
+        rules: Maps argument names to names of validators in
+                _validators.
+        values: Maps argument names to values, usually the locals()
+                of the constructor.
+    """
+    metrics = getattr(_instrumentation._active, 'metrics', None)
+    if metrics is not None:
+        metrics.objects[type(obj).__name__] += 1
+
+    if getattr(_lazy_mode, 'enabled', False):
+        lazy_class = _lazy_classes.get(type(obj))
+        if lazy_class is not None:
+            obj._pending = {
+                    field for field in rules if values[field] is not None}
+            if obj._pending:
+                obj.__class__ = lazy_class
+            return
+
+    validators = getattr(_validator_table, 'validators', _validators)
+    if metrics is not None:
+        _check_fields_instrumented(rules, values, metrics, validators)
+        return
+
+    for field, rule in rules.items():
+        value = values[field]
+        if value is not None:
+            validators[rule](value)
+
+
+def _check_fields_instrumented(
+        rules: Dict[str, str], values: Dict[str, Any],
+        metrics: _instrumentation.Metrics,
+        validators: Dict[str, Callable[[Any], None]] = _validators
+        ) -> None:
+    """Like _check_fields, but records what it does."""
+    start = time.perf_counter()
+    try:
+        for field, rule in rules.items():
+            value = values[field]
+            if value is not None:
+                metrics.validations[rule] += 1
+                validators[rule](value)
+    finally:
+        metrics.timings['validate'] += time.perf_counter() - start
 
 
-def _check_is_date(value: datetime) -> None:
-    if (
-            value.hour != 0 or value.minute != 0 or value.second != 0 or
-            value.microsecond != 0 or value.tzinfo is not None):
-        raise RuntimeError('Invalid date containing time of day "{}".'.format(
-            value))
+class _Model:
+    """Base class for the model classes.
+
+    This provides conversion to plain dicts and JSON, and validation of
+    objects that were created with lazy validation.
+    """
+    __slots__ = ('_pending',)
+
+    @property
+    def validated(self) -> bool:
+        """Whether all fields of this object have been validated.
 
+        This is always True for objects created with eager validation,
+        which is the default. Contained objects are not considered.
+        """
+        return not getattr(self, '_pending', None)
+
+    def validate(self) -> None:
+        """Validate this object and all the objects it contains.
+
+        This only does work for objects created with lazy validation
+        whose fields have not all been accessed yet, each field is
+        validated at most once.
+
+        Raises:
+            RuntimeError: If a field is invalid.
+        """
+        _validate_all(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert this object to a dict with CFF keys.
+
+        Keys are spelled as in CFF (e.g. ``family-names``, ``type``),
+        and attributes that are None are omitted. Contained objects
+        are converted recursively. Dates are left as ``datetime.date``
+        objects.
+
+        Returns:
+            A dict representing this object.
+        """
+        return _to_dict(self)
+
+    def dumps_json(self, indent: Optional[int] = None) -> str:
+        """Convert this object to JSON with CFF keys.
 
-class Identifier:
+        Args:
+            indent: Indentation to pretty-print with, or None to get
+                    compact output.
+
+        Returns:
+            A string containing JSON.
+        """
+        return json.dumps(_to_dict(self), default=_json_default, indent=indent)
+
+
+class Identifier(_Model):
     """Description of a CFF Identifier.
 
     An identifier object represents a persistent identifier.
     """
+    __slots__ = ('typ', 'value')
+
+    _field_rules = {'typ': 'identifier_type'}
+
     def __init__(self, typ: str, value: str) -> None:
         """Create an Identifier.
 
         Args:
             See the CFF standard.
         """
-        _check_arg_set(typ, ['doi', 'url', 'swh', 'other'])
+        _check_fields(self, Identifier._field_rules, locals())
 
         self.typ = typ
         self.value = value
 
+    @classmethod
+    def _yatiml_recognize(cls, node: yatiml.UnknownNode) -> None:
+        node.require_attribute('type')
 
-class Person:
+    @classmethod
+    def _yatiml_savorize(cls, node: yatiml.Node) -> None:
+        node.rename_attribute('type', 'typ')
+
+    @classmethod
+    def _yatiml_sweeten(cls, node: yatiml.Node) -> None:
+        node.rename_attribute('typ', 'type')
+
+
+class Person(_Model):
     """Description of a person in CFF 1.0.3.
     """
+    __slots__ = (
+            'family_names', 'given_names', 'name_particle', 'name_suffix',
+            'affiliation', 'address', 'city', 'region', 'post_code', 'country',
+            'orcid', 'email', 'tel', 'fax', 'website')
+
+    _field_rules = {
+            'country': 'country', 'orcid': 'orcid', 'email': 'email',
+            'website': 'url'}
+
     def __init__(
             self,
             family_names: str,
@@ -207,14 +689,7 @@ class Person:
             website: Optional[str] = None
             ) -> None:
 
-        if country is not None:
-            _check_arg_set(country, _valid_country_codes)
-        if orcid is not None:
-            _check_arg_orcid(orcid)
-        if email is not None:
-            _check_arg_regex(email, '^[\S]+@[\S]+\.[\S]{2,}$')
-        if website is not None:
-            _check_arg_url(website)
+        _check_fields(self, Person._field_rules, locals())
 
         self.family_names = family_names
         self.given_names = given_names
@@ -241,11 +716,20 @@ class Person:
         node.unders_to_dashes_in_keys()
 
 
-class Entity:
+class Entity(_Model):
     """A class representing an entity.
 
     This is some legal entity, an organisation.
     """
+    __slots__ = (
+            'name', 'address', 'city', 'region', 'post_code', 'country',
+            'orcid', 'email', 'tel', 'fax', 'website', 'date_start',
+            'date_end', 'location')
+
+    _field_rules = {
+            'orcid': 'orcid', 'email': 'email', 'website': 'url',
+            'date_start': 'date', 'date_end': 'date'}
+
     def __init__(
             self,
             name: str,
@@ -259,8 +743,8 @@ class Entity:
             tel: Optional[str] = None,
             fax: Optional[str] = None,
             website: Optional[str] = None,
-            date_start: Optional[datetime] = None,
-            date_end: Optional[datetime] = None,
+            date_start: Optional[date] = None,
+            date_end: Optional[date] = None,
             location: Optional[str] = None
             ) -> None:
         """Create an Entity object.
@@ -268,16 +752,7 @@ class Entity:
         Args:
             See the standard.
         """
-        if orcid is not None:
-            _check_arg_orcid(orcid)
-        if email is not None:
-            _check_arg_regex(email, '^[\S]+@[\S]+\.[\S]{2,}$')
-        if website is not None:
-            _check_arg_url(website)
-        if date_start is not None:
-            _check_is_date(date_start)
-        if date_end is not None:
-            _check_is_date(date_end)
+        _check_fields(self, Entity._field_rules, locals())
 
         self.name = name
         self.address = address
@@ -295,9 +770,34 @@ class Entity:
         self.location = location
 
 
-class Reference:
+class Reference(_Model):
     """A class representing a reference to some citable object.
     """
+    __slots__ = (
+            'typ', 'authors', 'title', 'abbreviation', 'abstract',
+            'collection_doi', 'collection_title', 'collection_type', 'commit',
+            'conference', 'contact', 'copyright', 'data_type', 'database',
+            'database_provider', 'date_accessed', 'date_downloaded',
+            'date_published', 'date_released', 'department', 'doi', 'edition',
+            'editors', 'editors_series', 'end', 'entry', 'filename', 'format',
+            'identifiers', 'institution', 'isbn', 'issn', 'issue',
+            'issue_date', 'issue_title', 'journal', 'keywords', 'languages',
+            'license', 'license_url', 'location', 'loc_start', 'loc_end',
+            'medium', 'month', 'nihmsid', 'notes', 'number', 'number_volumes',
+            'pages', 'patent_states', 'pmcid', 'publisher', 'recipients',
+            'repository', 'repository_code', 'repository_artifact', 'scope',
+            'section', 'senders', 'status', 'start', 'term', 'thesis_type',
+            'translators', 'url', 'version', 'volume', 'volume_title', 'year',
+            'year_original')
+
+    # TODO: check date_accessed, date_downloaded, date_published,
+    # date_released
+    _field_rules = {
+            'collection_doi': 'doi', 'commit': 'commit', 'doi': 'doi',
+            'license': 'license', 'license_url': 'url', 'repository': 'url',
+            'repository_code': 'url', 'repository_artifact': 'url',
+            'typ': 'reference_type', 'url': 'url'}
+
     def __init__(
             self,
             typ: str,       # really 'type'
@@ -315,10 +815,10 @@ class Reference:
             data_type: Optional[str] = None,
             database: Optional[str] = None,
             database_provider: Optional[Entity] = None,
-            date_accessed: Optional[datetime] = None,
-            date_downloaded: Optional[datetime] = None,
-            date_published: Optional[datetime] = None,
-            date_released: Optional[datetime] = None,
+            date_accessed: Optional[date] = None,
+            date_downloaded: Optional[date] = None,
+            date_published: Optional[date] = None,
+            date_released: Optional[date] = None,
             department: Optional[str] = None,
             doi: Optional[str] = None,
             edition: Optional[str] = None,
@@ -377,27 +877,7 @@ class Reference:
                 Args:
                     See the CFF standard.
                 """
-                # TODO: check reference type
-                if collection_doi is not None:
-                    _check_arg_doi(collection_doi)
-                if commit is not None:
-                    _check_arg_regex(commit, '^[a-f0-9]{7,40}$')
-                # TODO: check date_accessed, date_downloaded, date_published, date_released
-                if doi is not None:
-                    _check_arg_doi(doi)
-                if license is not None:
-                    _check_arg_set(license, _valid_license_strings)
-                if license_url is not None:
-                    _check_arg_url(license_url)
-                if repository is not None:
-                    _check_arg_url(repository)
-                if repository_code is not None:
-                    _check_arg_url(repository_code)
-                if repository_artifact is not None:
-                    _check_arg_url(repository_artifact)
-                _check_arg_set(typ, _valid_reference_types)
-                if url is not None:
-                    _check_arg_url(url)
+                _check_fields(self, Reference._field_rules, locals())
 
                 self.typ = typ
                 self.abbreviation = abbreviation
@@ -489,6 +969,10 @@ class Reference:
 class BookReference(Reference):
     """A class representing a reference to a book.
     """
+    __slots__ = ()
+
+    _field_rules = {'typ': 'reference_type'}
+
     def __init__(
             self,
             typ: str,       # really 'type'
@@ -513,8 +997,7 @@ class BookReference(Reference):
                 Args:
                     See the CFF standard.
                 """
-                # TODO: check reference type
-                _check_arg_set(typ, _valid_reference_types)
+                _check_fields(self, BookReference._field_rules, locals())
                 if authors is None and editors is None:
                     raise RuntimeError(
                             'Either and author or an editor is required')
@@ -538,7 +1021,7 @@ class BookReference(Reference):
 
     @classmethod
     def _yatiml_recognize(cls, node: yatiml.UnknownNode) -> None:
-        pass
+        node.require_attribute_value('type', 'book')
 
     @classmethod
     def _yatiml_savorize(cls, node: yatiml.Node) -> None:
@@ -551,16 +1034,23 @@ class BookReference(Reference):
         node.unders_to_dashes_in_keys()
 
 
-class CitationCFF:
+class CitationCFF(_Model):
     """A class representing a CITATION.cff file.
     """
+    _field_rules = {
+            'cff_version': 'cff_version', 'commit': 'commit',
+            'date_released': 'date', 'doi': 'doi', 'license': 'license',
+            'license_url': 'url', 'repository': 'url',
+            'repository_code': 'url', 'repository_artifact': 'url',
+            'url': 'url'}
+
     def __init__(self,
             cff_version: str,
             message: str,
             title: str,
             version: str,
             authors: List[Union[Person, Entity]],
-            date_released: datetime,
+            date_released: date,
             abstract: Optional[str] = None,
             identifiers: Optional[List[Identifier]] = None,
             keywords: Optional[str] = None,
@@ -580,24 +1070,7 @@ class CitationCFF:
         Args:
             See the spec
         """
-        _check_arg_regex(cff_version, '1\.1\.0')
-        if commit is not None:
-            _check_arg_regex(commit, '^[a-f0-9]{7,40}$')
-        _check_is_date(date_released)
-        if doi is not None:
-            _check_arg_doi(doi)
-        if license is not None:
-            _check_arg_set(license, _valid_license_strings)
-        if license_url is not None:
-            _check_arg_url(license_url)
-        if repository is not None:
-            _check_arg_url(repository)
-        if repository_code is not None:
-            _check_arg_url(repository_code)
-        if repository_artifact is not None:
-            _check_arg_url(repository_artifact)
-        if url is not None:
-            _check_arg_url(url)
+        _check_fields(self, CitationCFF._field_rules, locals())
 
         self.cff_version = cff_version
         self.message = message
@@ -628,13 +1101,545 @@ class CitationCFF:
         node.unders_to_dashes_in_keys()
 
 
+class CitationCFF12(CitationCFF):
+    """A class representing a CITATION.cff file in CFF 1.2.0.
+
+    In this version, version and date-released are optional, and
+    preferred-citation and type were added.
+    """
+    _field_rules = dict(
+            CitationCFF._field_rules, cff_version='cff_version_12',
+            typ='cff_type')
+
+    def __init__(
+            self,
+            cff_version: str,
+            message: str,
+            title: str,
+            authors: List[Union[Person, Entity]],
+            version: Optional[str] = None,
+            date_released: Optional[date] = None,
+            abstract: Optional[str] = None,
+            identifiers: Optional[List[Identifier]] = None,
+            keywords: Optional[str] = None,
+            references: Optional[List[Reference]] = None,
+            contact: Optional[List[Union[Person, Entity]]] = None,
+            doi: Optional[str] = None,
+            commit: Optional[str] = None,
+            license: Optional[str] = None,
+            license_url: Optional[str] = None,
+            repository: Optional[str] = None,
+            repository_code: Optional[str] = None,
+            repository_artifact: Optional[str] = None,
+            url: Optional[str] = None,
+            preferred_citation: Optional[Reference] = None,
+            typ: Optional[str] = None
+            ) -> None:
+        """Create a CitationCFF12 object.
+
+        Args:
+            See the spec
+        """
+        _check_fields(self, CitationCFF12._field_rules, locals())
+
+        self.cff_version = cff_version
+        self.message = message
+        self.title = title
+        self.authors = authors
+        self.version = version
+        self.date_released = date_released
+        self.abstract = abstract
+        self.identifiers = identifiers
+        self.keywords = keywords
+        self.references = references
+        self.contact = contact
+        self.doi = doi
+        self.commit = commit
+        self.license = license
+        self.license_url = license_url
+        self.repository = repository
+        self.repository_code = repository_code
+        self.repository_artifact = repository_artifact
+        self.url = url
+        self.preferred_citation = preferred_citation
+        self.typ = typ
+
+    @classmethod
+    def _yatiml_savorize(cls, node: yatiml.Node) -> None:
+        node.dashes_to_unders_in_keys()
+        node.rename_attribute('type', 'typ')
+
+    @classmethod
+    def _yatiml_sweeten(cls, node: yatiml.Node) -> None:
+        node.rename_attribute('typ', 'type')
+        node.unders_to_dashes_in_keys()
+
+
+class _CheckedField:
+    """Validates a field of a lazy object when it is first read.
+
+    This wraps the slot of the eager class, or the instance dict if it
+    has none, in which the value is actually stored.
+    """
+    def __init__(self, name: str, slot: Any) -> None:
+        self.name = name
+        self.slot = slot
+
+    def get_raw(self, obj: Any) -> Any:
+        """Get the value, without validating it."""
+        if self.slot is None:
+            return obj.__dict__[self.name]
+        return self.slot.__get__(obj, type(obj))
+
+    def __get__(self, obj: Any, objtype: Optional[Type] = None) -> Any:
+        if obj is None:
+            return self
+        value = self.get_raw(obj)
+        if self.name in obj._pending:
+            _validate_field(obj, self.name, value)
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        if self.slot is None:
+            obj.__dict__[self.name] = value
+        else:
+            self.slot.__set__(obj, value)
+
+
+def _lazy_getstate(self: Any) -> Tuple[None, Dict[str, Any]]:
+    """Gets the state of a lazy object for pickling and copying.
+
+    This reads the fields without validating them.
+    """
+    state = {
+            name: _peek(self, name)
+            for name, _ in _class_info[type(self)].keys}
+    state['_pending'] = set(self._pending)
+    return None, state
+
+
+def _lazy_class(class_: Type) -> Type:
+    """Make a lazily validating subclass of a model class.
+
+    Objects have this class while they have fields that have not been
+    validated yet, and revert to the original class once they are all
+    done, so that fully validated objects are accessed at full speed.
+    """
+    namespace = {
+            '__slots__': (),
+            '__module__': __name__,
+            '__doc__': class_.__doc__,
+            '__getstate__': _lazy_getstate,
+            '_eager_class': class_}     # type: Dict[str, Any]
+    for name in class_._field_rules:
+        namespace[name] = _CheckedField(name, getattr(class_, name, None))
+    return type('_Lazy' + class_.__name__, (class_,), namespace)
+
+
+_LazyIdentifier = _lazy_class(Identifier)
+_LazyPerson = _lazy_class(Person)
+_LazyEntity = _lazy_class(Entity)
+_LazyReference = _lazy_class(Reference)
+_LazyBookReference = _lazy_class(BookReference)
+_LazyCitationCFF = _lazy_class(CitationCFF)
+_LazyCitationCFF12 = _lazy_class(CitationCFF12)
+
+
+_lazy_classes = {
+        class_._eager_class: class_ for class_ in (
+            _LazyIdentifier, _LazyPerson, _LazyEntity, _LazyReference,
+            _LazyBookReference, _LazyCitationCFF, _LazyCitationCFF12)}
+
+
+def _shared_setattr(self: Any, name: str, value: Any) -> None:
+    raise AttributeError(
+            'This {} is shared through a pool and cannot be changed'.format(
+                self._eager_class.__name__))
+
+
+def _shared_reduce(self: Any) -> Tuple[Any, ...]:
+    """Pickles and copies a shared object as an unshared one."""
+    return _unshared, (self._eager_class, [
+            (name, getattr(self, name))
+            for name, _ in _class_info[self._eager_class].keys])
+
+
+def _unshared(class_: Type, fields: List[Tuple[str, Any]]) -> Any:
+    """Creates an ordinary object from a shared one's fields."""
+    obj = class_.__new__(class_)
+    for name, value in fields:
+        setattr(obj, name, value)
+    return obj
+
+
+def _shared_class(class_: Type) -> Type:
+    """Make an immutable subclass of a model class.
+
+    Objects that are shared between documents by a
+    :class:`pycff.pooling.Pool` have this class, so that changing one
+    occurrence does not silently change all others. Copies and
+    unpickled objects are of the original class again.
+    """
+    namespace = {
+            '__slots__': (),
+            '__module__': __name__,
+            '__doc__': class_.__doc__,
+            '__setattr__': _shared_setattr,
+            '__delattr__': _shared_setattr,
+            '__reduce__': _shared_reduce,
+            '_eager_class': class_}     # type: Dict[str, Any]
+    return type('_Shared' + class_.__name__, (class_,), namespace)
+
+
+_shared_classes = {
+        class_: _shared_class(class_)
+        for class_ in (Identifier, Person, Entity)}
+
+
+# The Pool to add loaded documents to, see pycff.pooling.pooling()
+_pool_mode = threading.local()
+
+
+def _add_to_pool(value: Any) -> Any:
+    """Adds a loaded value to the active pool, if any."""
+    pool = getattr(_pool_mode, 'pool', None)
+    if pool is None:
+        return value
+    return pool.add(value)
+
+
+def _pooling_loader(loader_class: Type) -> Type:
+    """Makes a subclass of a YAtiML loader that uses the active pool."""
+    class PoolingLoader(loader_class):     # type: ignore
+        def construct_document(self, node: Any) -> Any:
+            return _add_to_pool(super().construct_document(node))
+
+    PoolingLoader.__name__ = loader_class.__name__
+    return PoolingLoader
+
+
+def _validate_field(obj: Any, name: str, value: Any) -> None:
+    """Validates a pending field of a lazy object.
+
+    If the field is invalid, it stays pending, so that the error is
+    raised again on the next access.
+    """
+    rule = obj._field_rules[name]
+    metrics = getattr(_instrumentation._active, 'metrics', None)
+    if metrics is None:
+        _validators[rule](value)
+    else:
+        _check_fields_instrumented({name: rule}, {name: value}, metrics)
+    obj._pending.discard(name)
+    if not obj._pending:
+        obj.__class__ = obj._eager_class
+
+
+def _validate_all(value: Any) -> None:
+    """Validates all pending fields of a value, recursively."""
+    if isinstance(value, list):
+        for item in value:
+            _validate_all(item)
+    elif type(value) in _class_info:
+        for name in sorted(getattr(value, '_pending', None) or ()):
+            getattr(value, name)
+        for name, _ in _class_info[type(value)].keys:
+            _validate_all(getattr(value, name))
+
+
+def _peek(obj: Any, name: str) -> Any:
+    """Gets an attribute of a model object without validating it."""
+    field = getattr(type(obj), name, None)
+    if isinstance(field, _CheckedField):
+        return field.get_raw(obj)
+    return getattr(obj, name, None)
+
+
 _all_classes = (CitationCFF, Identifier, Person, Entity, Reference)
 
 
+# Loads CFF 1.0.x and 1.1.0 documents as CitationCFF. Use
+# pycff.versions.load() to also load CFF 1.2.0 documents, as
+# CitationCFF12.
 load = yatiml.load_function(*_all_classes)
+load.loader = _pooling_loader(
+        _instrumentation._instrumented_loader(load.loader))
+
+
+@contextmanager
+def lazy_validation() -> Iterator[None]:
+    """Create objects without validating them, within this context.
+
+    Objects created by :func:`load`, :func:`from_dict` or any other
+    loading function called within this context are not validated
+    when they are created. Instead, each field is validated when it is
+    first read, or when :meth:`validate` is called on the object or on
+    an object containing it. This saves time if only a few fields are
+    used. Until all its fields have been validated, an object is an
+    instance of a private subclass of its class.
+
+    Eager validation remains the default, and applies again after
+    leaving the context. This setting is per thread.
+    """
+    previous = getattr(_lazy_mode, 'enabled', False)
+    _lazy_mode.enabled = True
+    try:
+        yield
+    finally:
+        _lazy_mode.enabled = previous
+
+
+def load_lazy(source: Union[str, Path, IO[str]]) -> CitationCFF:
+    """Load a CitationCFF object, validating it lazily.
+
+    See :func:`lazy_validation` for how this works.
+
+    Args:
+        source: A string containing YAML, a path to a file, or an
+                open stream, like the argument of :func:`load`.
+
+    Returns:
+        The loaded object.
+
+    Raises:
+        yatiml.RecognitionError: If the structure of the document is
+                invalid. Field values are checked later.
+    """
+    with lazy_validation():
+        return load(source)
+
+
+class _ClassInfo:
+    """Precomputed information for converting dicts to objects.
+
+    Attributes:
+        args: Maps keys, as they may occur in a savorized or
+                unsavorized dict, to constructor argument names.
+        types: Maps constructor argument names to their types.
+        required: Names of the required constructor arguments.
+        keys: Pairs of attribute name and CFF key, in order.
+    """
+    def __init__(self, class_: Type) -> None:
+        argspec = inspect.getfullargspec(class_.__init__)
+        arg_names = argspec.args[1:]
+        num_required = len(arg_names) - len(argspec.defaults or ())
+
+        self.args = dict()      # type: Dict[str, str]
+        self.types = dict()     # type: Dict[str, Any]
+        for name in arg_names:
+            self.args[name] = name
+            self.args[name.replace('_', '-')] = name
+            self.types[name] = argspec.annotations.get(name, Any)
+        if 'typ' in arg_names:
+            self.args['type'] = 'typ'
+        self.required = arg_names[:num_required]
+
+        self.keys = [
+                (name, 'type' if name == 'typ' else name.replace('_', '-'))
+                for name in arg_names]
+
+
+_class_info = {
+        class_: _ClassInfo(class_)
+        for class_ in _all_classes + (BookReference, CitationCFF12)}
+_class_info.update({
+        lazy_class: _class_info[class_]
+        for class_, lazy_class in _lazy_classes.items()})
+_class_info.update({
+        shared_class: _class_info[class_]
+        for class_, shared_class in _shared_classes.items()})
+
+
+def _recognize_class(
+        data: Any, candidates: Iterable[Type], path: str) -> Type:
+    """Decides which class a dict in a union-typed position is for.
+
+    This picks the unique class whose required attributes are all
+    present, as YAtiML's recognition would.
+    """
+    if isinstance(data, dict):
+        matches = list()
+        for class_ in candidates:
+            info = _class_info[class_]
+            present = {info.args.get(key) for key in data}
+            if all(name in present for name in info.required):
+                matches.append(class_)
+        if len(matches) == 1:
+            return matches[0]
+    raise yatiml.RecognitionError(
+            '{}: expected one of {}, but could not recognise it'.format(
+                path, ', '.join(class_.__name__ for class_ in candidates)))
+
+
+def _from_plain(value: Any, type_: Any, path: str) -> Any:
+    """Converts a plain value decoded from JSON to the given type.
+
+    Args:
+        value: The value to convert.
+        type_: The type from the constructor's annotation.
+        path: Location of the value in the document, for errors.
+    """
+    if type_ is Any:
+        return value
+
+    if is_generic_union(type_):
+        options = [t for t in generic_type_args(type_) if t is not type(None)]
+        if value is None and len(options) < len(generic_type_args(type_)):
+            return None
+        if len(options) == 1:
+            return _from_plain(value, options[0], path)
+        return _from_plain(value, _recognize_class(value, options, path), path)
+
+    if is_generic_sequence(type_):
+        if not isinstance(value, list):
+            raise yatiml.RecognitionError(
+                    '{}: expected a list'.format(path))
+        item_type = generic_type_args(type_)[0]
+        return [
+                _from_plain(item, item_type, '{}[{}]'.format(path, i))
+                for i, item in enumerate(value)]
+
+    if type_ in _class_info:
+        return _from_dict(value, type_, path)
+
+    if type_ is date:
+        if isinstance(value, date):
+            return value
+        if isinstance(value, str):
+            try:
+                return datetime.strptime(value, '%Y-%m-%d').date()
+            except ValueError:
+                pass
+        raise yatiml.RecognitionError(
+                '{}: expected a date in YYYY-MM-DD format'.format(path))
+
+    # the JSON decoder only produces str, int, float, bool and None
+    if type(value) is not type_:
+        raise yatiml.RecognitionError('{}: expected {} but got {}'.format(
+            path, type_.__name__, type(value).__name__))
+    return value
+
+
+def _from_dict(data: Any, class_: Type, path: str) -> Any:
+    """Converts a plain dict to an object of the given class.
+
+    Args:
+        data: The dict to convert.
+        class_: The class to convert to.
+        path: Location of the dict in the document, for errors.
+    """
+    if not isinstance(data, dict):
+        raise yatiml.RecognitionError('{}: expected a mapping for {}'.format(
+            path, class_.__name__))
+
+    info = _class_info[class_]
+    kwargs = dict()
+    for key, value in data.items():
+        name = info.args.get(key)
+        if name is None:
+            raise yatiml.RecognitionError(
+                    '{}: unknown attribute "{}" for {}'.format(
+                        path, key, class_.__name__))
+        kwargs[name] = _from_plain(
+                value, info.types[name], '{}.{}'.format(path, key))
+
+    for name in info.required:
+        if name not in kwargs:
+            raise yatiml.RecognitionError(
+                    '{}: missing required attribute "{}" for {}'.format(
+                        path, name, class_.__name__))
+
+    try:
+        return class_(**kwargs)
+    except RuntimeError as e:
+        raise yatiml.RecognitionError('{}: {}'.format(path, e))
+
+
+def from_dict(data: Dict[str, Any], class_: Optional[Type] = None) -> Any:
+    """Create an object from a dict, e.g. as decoded from JSON.
+
+    The dict may use keys as they are in CFF (e.g. ``family-names``,
+    ``type``), or as they are in the Python classes. Dates may be
+    given as ``datetime.date`` objects or as strings in YYYY-MM-DD
+    format.
+
+    Objects are validated as they would be by :func:`load`, but the
+    YAML machinery is not used at all, which makes this a lot faster.
+
+    Args:
+        data: The data to convert.
+        class_: The class to convert to, CitationCFF by default.
+
+    Returns:
+        An object of the given class.
+
+    Raises:
+        yatiml.RecognitionError: If the data is invalid.
+    """
+    if class_ is None:
+        class_ = CitationCFF
+    return _add_to_pool(_from_dict(data, class_, class_.__name__))
+
+
+def _to_plain(value: Any) -> Any:
+    """Converts a value to plain dicts and lists, recursively."""
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value]
+    if type(value) in _class_info:
+        return _to_dict(value)
+    return value
+
+
+def _to_dict(obj: Any) -> Dict[str, Any]:
+    """Converts a model object to a dict with CFF keys."""
+    result = dict()
+    for name, key in _class_info[type(obj)].keys:
+        value = getattr(obj, name)
+        if value is not None:
+            result[key] = _to_plain(value)
+    return result
+
+
+def _json_default(value: Any) -> Any:
+    """Converts values the json module cannot handle by itself."""
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError('Cannot convert {} to JSON'.format(type(value).__name__))
+
+
+def load_json(source: Union[str, Path, IO[str]]) -> CitationCFF:
+    """Load a CitationCFF object from JSON.
+
+    Args:
+        source: A string containing JSON, a path to a file, or an
+                open stream.
+
+    Returns:
+        The loaded object.
+
+    Raises:
+        ValueError: If the input is not valid JSON.
+        yatiml.RecognitionError: If the input is not a valid CFF
+                document.
+    """
+    if isinstance(source, Path):
+        with source.open('r') as f:
+            data = json.load(f)
+    elif isinstance(source, str):
+        data = json.loads(source)
+    else:
+        data = json.load(source)
+    return from_dict(data)
+
+
+_dump_classes = (
+        _all_classes + (BookReference, CitationCFF12) +
+        tuple(_lazy_classes.values()) + tuple(_shared_classes.values()))
 
 
-dump = yatiml.dump_function(*_all_classes)
+dump = _instrumentation._timed(
+        'dump', yatiml.dump_function(*_dump_classes))
 
 
-dumps = yatiml.dumps_function(*_all_classes)
+dumps = _instrumentation._timed(
+        'dump', yatiml.dumps_function(*_dump_classes))
@@ -0,0 +1,158 @@
+"""Incremental loading of the references in a CFF file."""
+from collections import deque
+from pathlib import Path
+from typing import Any, Iterable, Iterator, IO, List, Type, Union
+
+import yaml
+import yatiml
+
+from pycff.instrumentation import _instrumented_loader
+from pycff.pycff import (
+        BookReference, Entity, Identifier, Person, Reference)
+
+
+_load_reference = yatiml.load_function(
+        Reference, BookReference, Entity, Person, Identifier)
+_load_reference.loader = _instrumented_loader(_load_reference.loader)
+
+
+class _EventSource:
+    """Mixin for YAtiML loaders that read from a list of parser events.
+
+    This lets us compose and construct a single node out of a larger
+    document, while still going through YAtiML's recognition,
+    savorizing and type checking.
+    """
+    def __init__(self, events: Iterable[yaml.Event]) -> None:
+        super().__init__('')    # type: ignore
+        self.__events = deque(events)
+
+    def check_event(self, *choices: Any) -> bool:
+        if not self.__events:
+            return False
+        if not choices:
+            return True
+        return isinstance(self.__events[0], choices)
+
+    def peek_event(self) -> yaml.Event:
+        return self.__events[0]
+
+    def get_event(self) -> yaml.Event:
+        return self.__events.popleft()
+
+
+class _EventLoader(_EventSource, _load_reference.loader):   # type: ignore
+    """Loads References from parser events."""
+
+
+def _read_node(
+        first: yaml.Event, events: Iterator[yaml.Event], keep: bool
+        ) -> List[yaml.Event]:
+    """Reads the events of a single node from an event stream.
+
+    Args:
+        first: The first event of the node, already read.
+        events: The event stream to read the rest of the node from.
+        keep: Whether to return the events, or just skip them.
+
+    Returns:
+        The events of the node if keep is True, else an empty list.
+    """
+    node_events = [first] if keep else []
+    depth = 1 if isinstance(first, yaml.CollectionStartEvent) else 0
+    while depth > 0:
+        event = next(events)
+        if isinstance(event, yaml.CollectionStartEvent):
+            depth += 1
+        elif isinstance(event, yaml.CollectionEndEvent):
+            depth -= 1
+        if keep:
+            node_events.append(event)
+    return node_events
+
+
+def _construct_node(
+        loader_class: Type, node_events: List[yaml.Event]) -> Any:
+    """Constructs an object from the events of its node.
+
+    Args:
+        loader_class: An _EventSource loader class to use.
+        node_events: The events of the node.
+    """
+    loader = loader_class(
+            [yaml.StreamStartEvent(), yaml.DocumentStartEvent()] +
+            node_events +
+            [yaml.DocumentEndEvent(), yaml.StreamEndEvent()])
+    try:
+        return loader.get_single_data()
+    finally:
+        loader.dispose()
+
+
+def _construct_reference(node_events: List[yaml.Event]) -> Reference:
+    """Constructs a Reference from the events of its node."""
+    return _construct_node(_EventLoader, node_events)
+
+
+def _iter_references(stream: Union[str, IO[str]]) -> Iterator[Reference]:
+    events = yaml.parse(stream, Loader=yaml.SafeLoader)
+
+    event = next(events)
+    while isinstance(event, (yaml.StreamStartEvent, yaml.DocumentStartEvent)):
+        event = next(events)
+    if not isinstance(event, yaml.MappingStartEvent):
+        raise yatiml.RecognitionError(
+                '{}\nExpected a mapping here'.format(event.start_mark))
+
+    while True:
+        key_event = next(events)
+        if isinstance(key_event, yaml.MappingEndEvent):
+            return
+        _read_node(key_event, events, False)
+        value_event = next(events)
+
+        if (isinstance(key_event, yaml.ScalarEvent) and
+                key_event.value == 'references'):
+            if not isinstance(value_event, yaml.SequenceStartEvent):
+                raise yatiml.RecognitionError(
+                        '{}\nExpected a list of references here'.format(
+                            value_event.start_mark))
+            item_event = next(events)
+            while not isinstance(item_event, yaml.SequenceEndEvent):
+                yield _construct_reference(
+                        _read_node(item_event, events, True))
+                item_event = next(events)
+        else:
+            _read_node(value_event, events, False)
+
+
+def iter_references(
+        source: Union[str, Path, IO[str]]) -> Iterator[Reference]:
+    """Load the references from a CFF file one at a time.
+
+    This reads only as much of the input as is needed to produce the
+    next reference, so that files with very many references can be
+    processed without having all of them in memory at once. The rest
+    of the document is skipped, and not validated.
+
+    References are recognised, savorized and validated as they would
+    be by :func:`pycff.pycff.load`, except that references of type
+    ``book`` are returned as :class:`pycff.pycff.BookReference`
+    objects where possible. Anchors and aliases may only be used
+    within a single reference.
+
+    Args:
+        source: A string containing YAML, a path to a file, or an open
+                stream, like the argument of :func:`pycff.pycff.load`.
+
+    Yields:
+        The references in the document, in order.
+
+    Raises:
+        yatiml.RecognitionError: If a reference is invalid.
+    """
+    if isinstance(source, Path):
+        with source.open('r') as f:
+            yield from _iter_references(f)
+    else:
+        yield from _iter_references(source)
@@ -0,0 +1,328 @@
+"""Validation of complete CFF documents, reporting all problems.
+
+:func:`pycff.pycff.load` stops at the first problem it finds. The
+functions in this module check everything in one go, and return a
+list of all the problems found instead.
+"""
+from datetime import date
+from pathlib import Path
+from typing import (
+        Any, Callable, Dict, Iterable, IO, List, Optional, Type, Union)
+
+import yaml
+from yatiml.util import (
+        generic_type_args, is_generic_sequence, is_generic_union)
+
+from pycff.pycff import _class_info, _peek, _validators, CitationCFF
+from pycff.versions import _read_source, _schema_by_version, peek_version
+
+
+class Problem:
+    """A problem found in a CFF document.
+
+    Attributes:
+        path: Where the problem is, e.g. ``authors[0].orcid``. Keys
+                are spelled as in CFF.
+        value: The offending value, if any.
+        rule: Identifies the kind of problem. This is either the name
+                of a field validator, like ``orcid`` or ``url``, or one
+                of ``syntax``, ``type``, ``unknown_key`` or
+                ``missing_key``.
+        message: A description of the problem.
+        line: Line number in the source, counting from 1, if known.
+        column: Column number in the source, counting from 1, if
+                known.
+    """
+    def __init__(
+            self,
+            path: str,
+            value: Any,
+            rule: str,
+            message: str,
+            line: Optional[int] = None,
+            column: Optional[int] = None
+            ) -> None:
+        """Create a Problem.
+
+        Args:
+            See the class attributes.
+        """
+        self.path = path
+        self.value = value
+        self.rule = rule
+        self.message = message
+        self.line = line
+        self.column = column
+
+    def __str__(self) -> str:
+        if self.line is None:
+            location = self.path
+        else:
+            location = '{}:{}: {}'.format(self.line, self.column, self.path)
+        return '{}: {}'.format(location, self.message)
+
+    def __repr__(self) -> str:
+        return 'Problem({!r}, {!r}, {!r}, {!r}, {!r}, {!r})'.format(
+                self.path, self.value, self.rule, self.message, self.line,
+                self.column)
+
+
+def _join(path: str, key: str) -> str:
+    return '{}.{}'.format(path, key) if path else key
+
+
+def _recognize(keys: Iterable[str], candidates: List[Type]) -> Type:
+    """Decides which class a mapping in a union-typed position is for.
+
+    If exactly one class has all its required keys, that one is
+    chosen, like YAtiML would. Otherwise, we guess that it is the one
+    that knows most of the keys, so that we can report problems in
+    terms of that class.
+    """
+    keys = list(keys)
+    complete = list()
+    for class_ in candidates:
+        info = _class_info[class_]
+        present = {info.args.get(key) for key in keys}
+        if all(name in present for name in info.required):
+            complete.append(class_)
+    if len(complete) == 1:
+        return complete[0]
+    return max(candidates, key=lambda class_: sum(
+        key in _class_info[class_].args for key in keys))
+
+
+class _NodeChecker:
+    """Checks a composed YAML document against the model classes."""
+    def __init__(
+            self, validators: Dict[str, Callable[[Any], None]] = _validators
+            ) -> None:
+        self.problems = list()  # type: List[Problem]
+        self._constructor = yaml.SafeLoader('')
+        self._validators = validators
+
+    def add_problem(
+            self, node: yaml.Node, path: str, value: Any, rule: str,
+            message: str) -> None:
+        self.problems.append(Problem(
+            path, value, rule, message, node.start_mark.line + 1,
+            node.start_mark.column + 1))
+
+    def check(self, node: yaml.Node, type_: Any, path: str) -> None:
+        """Checks a node against a type from an annotation."""
+        if type_ is Any:
+            return
+
+        if is_generic_union(type_):
+            options = [
+                    t for t in generic_type_args(type_)
+                    if t is not type(None)]
+            if len(options) < len(generic_type_args(type_)):
+                if node.tag == 'tag:yaml.org,2002:null':
+                    return
+            if len(options) == 1:
+                self.check(node, options[0], path)
+            elif isinstance(node, yaml.MappingNode):
+                keys = [key_node.value for key_node, _ in node.value]
+                self.check(node, _recognize(keys, options), path)
+            else:
+                self.add_problem(
+                        node, path, None, 'type', 'Expected one of {}'.format(
+                            ', '.join(t.__name__ for t in options)))
+
+        elif is_generic_sequence(type_):
+            if not isinstance(node, yaml.SequenceNode):
+                self.add_problem(node, path, None, 'type', 'Expected a list')
+                return
+            item_type = generic_type_args(type_)[0]
+            for i, item_node in enumerate(node.value):
+                self.check(item_node, item_type, '{}[{}]'.format(path, i))
+
+        elif type_ in _class_info:
+            if not isinstance(node, yaml.MappingNode):
+                self.add_problem(
+                        node, path, None, 'type',
+                        'Expected a mapping for {}'.format(type_.__name__))
+                return
+            self.check_mapping(node, type_, path)
+
+        else:
+            self.check_scalar(node, type_, path)
+
+    def check_scalar(self, node: yaml.Node, type_: Type, path: str) -> bool:
+        """Checks that a node is a scalar of the given type.
+
+        Returns:
+            True iff the node is correct.
+        """
+        if isinstance(node, yaml.ScalarNode):
+            value = self._constructor.construct_object(node)
+            if type_ is date and isinstance(value, date):
+                return True
+            if type(value) is type_:
+                return True
+        else:
+            value = None
+        self.add_problem(node, path, value, 'type', 'Expected {}'.format(
+            'a date' if type_ is date else type_.__name__))
+        return False
+
+    def check_mapping(
+            self, node: yaml.MappingNode, class_: Type, path: str) -> None:
+        """Checks the attributes of an object."""
+        info = _class_info[class_]
+        rules = class_._field_rules
+        present = set()
+        for key_node, value_node in node.value:
+            if not isinstance(key_node, yaml.ScalarNode):
+                self.add_problem(
+                        key_node, path, None, 'type', 'Expected a string')
+                continue
+            key = key_node.value
+            key_path = _join(path, key)
+            name = info.args.get(key)
+            if name is None:
+                self.add_problem(
+                        key_node, key_path, key, 'unknown_key',
+                        'Unknown attribute "{}" for {}'.format(
+                            key, class_.__name__))
+                continue
+            present.add(name)
+
+            if name in rules and isinstance(value_node, yaml.ScalarNode):
+                if value_node.tag == 'tag:yaml.org,2002:null':
+                    continue
+                type_ = info.types[name]
+                if is_generic_union(type_):
+                    type_ = generic_type_args(type_)[0]
+                if self.check_scalar(value_node, type_, key_path):
+                    value = self._constructor.construct_object(value_node)
+                    try:
+                        self._validators[rules[name]](value)
+                    except RuntimeError as e:
+                        self.add_problem(
+                                value_node, key_path, value, rules[name],
+                                str(e))
+            else:
+                self.check(value_node, info.types[name], key_path)
+
+        for name in info.required:
+            if name not in present:
+                key = 'type' if name == 'typ' else name.replace('_', '-')
+                self.add_problem(
+                        node, _join(path, key), None, 'missing_key',
+                        'Missing required attribute "{}" for {}'.format(
+                            key, class_.__name__))
+
+
+def check(
+        source: Union[str, Path, IO[str]],
+        class_: Optional[Type] = None
+        ) -> List[Problem]:
+    """Check a CFF document, and report all problems.
+
+    This checks the structure of the document, and runs all the field
+    validators, but unlike :func:`pycff.pycff.load` it does not stop
+    at the first problem. Like :func:`pycff.versions.load`, documents
+    are checked against the classes and validators of their
+    cff-version.
+
+    Args:
+        source: A string containing YAML, a path to a file, or an
+                open stream, like the argument of
+                :func:`pycff.pycff.load`.
+        class_: The class the document should represent. Defaults to
+                the class for the document's cff-version.
+
+    Returns:
+        The problems found, in document order. If the list is empty,
+        the document is valid.
+    """
+    text = _read_source(source)
+    validators = _validators
+    schema = _schema_by_version.get(peek_version(text))
+    if schema is not None:
+        validators = schema.validators
+        if class_ is None:
+            class_ = schema.classes[0]
+    if class_ is None:
+        class_ = CitationCFF
+
+    try:
+        node = yaml.compose(text, Loader=yaml.SafeLoader)
+    except yaml.MarkedYAMLError as e:
+        mark = e.problem_mark
+        return [Problem(
+            '', None, 'syntax', '{} {}'.format(e.context or '', e.problem),
+            mark.line + 1 if mark else None,
+            mark.column + 1 if mark else None)]
+    except yaml.YAMLError as e:
+        # e.g. a ReaderError for a character that YAML does not allow
+        return [Problem('', None, 'syntax', str(e))]
+
+    if node is None:
+        return [Problem('', None, 'type', 'The document is empty')]
+
+    checker = _NodeChecker(validators)
+    checker.check(node, class_, '')
+    return checker.problems
+
+
+def _check_value(
+        value: Any, path: str, problems: List[Problem],
+        validators: Dict[str, Callable[[Any], None]]) -> None:
+    if isinstance(value, list):
+        for i, item in enumerate(value):
+            _check_value(
+                    item, '{}[{}]'.format(path, i), problems, validators)
+    elif type(value) in _class_info:
+        _check_object(value, path, problems, validators)
+
+
+def _check_object(
+        obj: Any, path: str, problems: List[Problem],
+        validators: Dict[str, Callable[[Any], None]]) -> None:
+    info = _class_info[type(obj)]
+    rules = type(obj)._field_rules
+    for name, key in info.keys:
+        value = _peek(obj, name)
+        key_path = _join(path, key)
+        if value is None:
+            if name in info.required:
+                problems.append(Problem(
+                    key_path, None, 'missing_key',
+                    'Missing required attribute "{}" for {}'.format(
+                        key, type(obj).__name__)))
+        elif name in rules:
+            try:
+                validators[rules[name]](value)
+            except RuntimeError as e:
+                problems.append(Problem(key_path, value, rules[name], str(e)))
+        else:
+            _check_value(value, key_path, problems, validators)
+
+
+def check_object(obj: Any) -> List[Problem]:
+    """Check an object graph, and report all problems.
+
+    This runs the field validators on an object and everything it
+    contains, e.g. a CitationCFF object with all its authors and
+    references. This is useful for objects that were modified after
+    loading. Source locations are not available here.
+
+    The validators of the cff-version of the object are used, if it
+    has a supported one.
+
+    Args:
+        obj: The object to check.
+
+    Returns:
+        The problems found. If the list is empty, the object is valid.
+    """
+    validators = _validators
+    schema = _schema_by_version.get(_peek(obj, 'cff_version'))
+    if schema is not None:
+        validators = schema.validators
+    problems = list()   # type: List[Problem]
+    _check_object(obj, '', problems, validators)
+    return problems
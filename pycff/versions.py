@@ -0,0 +1,163 @@
+"""Loading documents written against different versions of CFF.
+
+:func:`pycff.pycff.load` only loads CFF 1.0.x and 1.1.0 documents, as
+:class:`pycff.pycff.CitationCFF`. The :func:`load` function here first
+finds the cff-version of the document with a quick scan of its text,
+and then loads it with the classes and validators of that version, so
+that e.g. a CFF 1.2.0 document without a date-released loads as a
+:class:`pycff.pycff.CitationCFF12`. The classes and validators of each
+version are set up once, when a document of that version is first
+loaded, and reused after that.
+"""
+from functools import lru_cache
+import io
+from pathlib import Path
+import re
+from typing import Any, Callable, Dict, IO, Optional, Sequence, Type, Union
+
+import yatiml
+
+from pycff import instrumentation as _instrumentation
+from pycff import pycff
+
+
+# A cff-version key at the top level of a block mapping, with its value
+_pattern_version = re.compile(
+        r'^cff-version[ \t]*:[ \t]*([\'"]?)([^\s\'"#]+)\1[ \t]*(?:#.*)?$',
+        re.MULTILINE)
+
+
+def _read_source(source: Union[str, Path, IO[str]]) -> str:
+    """Get the text of a source, as accepted by :func:`pycff.pycff.load`.
+    """
+    if isinstance(source, Path):
+        with source.open('r') as f:
+            return f.read()
+    if isinstance(source, str):
+        return source
+    return source.read()
+
+
+def _source_name(source: Union[str, Path, IO[str]]) -> Optional[str]:
+    """Get the file name of a source, if it has one."""
+    if isinstance(source, Path):
+        return str(source)
+    if isinstance(source, str):
+        return None
+    return getattr(source, 'name', None)
+
+
+def _named_text(text: str, name: Optional[str]) -> Union[str, IO[str]]:
+    """Make a source for YAML that has the given name.
+
+    PyYAML takes the name of the source from a stream, and uses it in
+    error messages.
+    """
+    if name is None:
+        return text
+    stream = io.StringIO(text)
+    stream.name = name      # type: ignore
+    return stream
+
+
+def peek_version(text: str) -> Optional[str]:
+    """Find the cff-version of a document without parsing it.
+
+    This finds the top-level ``cff-version`` key of documents written
+    in the usual block style. The value is not checked.
+
+    Args:
+        text: The text of the document.
+
+    Returns:
+        The value of cff-version, or None if it could not be found.
+    """
+    match = _pattern_version.search(text)
+    if match is None:
+        return None
+    return match.group(2)
+
+
+@lru_cache(maxsize=None)
+def _load_function(classes: Sequence[Type]) -> Callable[[str], Any]:
+    """Make a load function for a set of classes, once per set."""
+    load = yatiml.load_function(*classes)
+    load.loader = pycff._pooling_loader(
+            _instrumentation._instrumented_loader(load.loader))
+    return load
+
+
+class _Schema:
+    """The classes and validators for one or more versions of CFF.
+
+    Attributes:
+        versions: The versions of CFF this applies to.
+        classes: The classes to load documents into, with the class of
+                the document first.
+        validators: Table of validators, like pycff._validators, which
+                only accepts the versions of this schema as the
+                cff-version.
+    """
+    def __init__(self, versions: Sequence[str], classes: Sequence[Type]
+                 ) -> None:
+        self.versions = tuple(versions)
+        self.classes = tuple(classes)
+        rule = self.classes[0]._field_rules['cff_version']
+        self.validators = dict(pycff._validators)
+        self.validators[rule] = pycff._set_validator(
+                pycff.Vocabulary(self.versions))
+
+    def load(self, source: Union[str, IO[str]]) -> pycff.CitationCFF:
+        """Load a document of one of these versions."""
+        load = _load_function(self.classes)
+        with pycff._using_validators(self.validators):
+            return load(source)
+
+
+_schemas = [
+        _Schema(['1.0.1', '1.0.2', '1.0.3'], pycff._all_classes),
+        _Schema(['1.1.0'], pycff._all_classes),
+        _Schema(
+            ['1.2.0'], (pycff.CitationCFF12,) + pycff._all_classes[1:])]
+
+_schema_by_version = {
+        version: schema
+        for schema in _schemas for version in schema.versions
+        }   # type: Dict[str, _Schema]
+
+
+def load(source: Union[str, Path, IO[str]]) -> pycff.CitationCFF:
+    """Load a document of any supported version of CFF.
+
+    Documents whose cff-version cannot be found by
+    :func:`peek_version`, e.g. because they are written in flow style,
+    are loaded by :func:`pycff.pycff.load`, and so must be CFF 1.0.x
+    or 1.1.0 documents.
+
+    Args:
+        source: A string containing YAML, a path to a file, or an
+                open stream, like the argument of
+                :func:`pycff.pycff.load`.
+
+    Returns:
+        The loaded object, a :class:`pycff.pycff.CitationCFF12` for
+        CFF 1.2.0 documents.
+
+    Raises:
+        yatiml.RecognitionError: If the document is invalid, or its
+                cff-version is not supported. The message includes the
+                file name of the source, if it has one.
+    """
+    name = _source_name(source)
+    text = _read_source(source)
+    version = peek_version(text)
+    if version is None:
+        return pycff.load(_named_text(text, name))
+    schema = _schema_by_version.get(version)
+    if schema is None:
+        raise yatiml.RecognitionError(
+                'Unsupported cff-version "{}"{}, supported versions are'
+                ' {}'.format(
+                    version, '' if name is None else ' in "{}"'.format(name),
+                    ', '.join(pycff._supported_versions)))
+    return schema.load(_named_text(text, name))
@@ -33,6 +33,9 @@ setup(
         'Programming Language :: Python :: 3.5',
         'Programming Language :: Python :: 3.6',
     ],
+    entry_points={
+        'console_scripts': ['pycff=pycff.cli:main'],
+    },
     test_suite='tests',
     install_requires=[
         'yatiml'
@@ -51,5 +54,7 @@ setup(
     ],
     extras_require={
         'dev':  ['prospector[with_pyroma]', 'yapf', 'isort'],
+        'numpy': ['numpy'],
+        'arrow': ['pyarrow'],
     }
 )
@@ -0,0 +1,110 @@
+"""Tests for the pycff.aio module."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import io
+
+import pytest
+import yatiml
+
+from pycff import pycff
+from pycff.aio import adump, aload, aload_many, AsyncLoader
+from pycff.instrumentation import instrument
+from pycff.pooling import pooling
+
+
+_text = (
+        'cff-version: "1.1.0"\n'
+        'message: Do cite this\n'
+        'title: Testing CFF!\n'
+        'version: 0.0.1\n'
+        'authors:\n'
+        '  - family-names: Doe\n'
+        '    given-names: John\n'
+        'date-released: 2020-11-15\n')
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_aload_adump(tmp_path):
+    path = tmp_path / 'CITATION.cff'
+    path.write_text(_text)
+
+    async def main():
+        reader = asyncio.StreamReader()
+        reader.feed_data(_text.encode('utf-8'))
+        reader.feed_eof()
+        with ThreadPoolExecutor(1) as executor:
+            from_stream = await aload(reader, executor)
+        from_path = await aload(path)
+        from_text = await aload(_text)
+
+        stream = io.StringIO()
+        text = await adump(from_text, stream)
+        return from_stream, from_path, from_text, text, stream.getvalue()
+
+    from_stream, from_path, from_text, text, written = _run(main())
+    expected = pycff.load(_text).to_dict()
+    assert from_stream.to_dict() == expected
+    assert from_path.to_dict() == expected
+    assert from_text.to_dict() == expected
+    assert text == written == pycff.dumps(from_text)
+
+    with pytest.raises(yatiml.RecognitionError):
+        _run(aload(_text.replace('2020-11-15', 'yesterday')))
+
+
+def test_aload_many(tmp_path):
+    path = tmp_path / 'CITATION.cff'
+    path.write_text(_text.replace('0.0.1', '[]'))
+    sources = [io.StringIO(_text), str(path), path]
+    results = _run(aload_many(sources, max_concurrency=2))
+    assert [result.source for result in results] == sources
+    assert [result.ok for result in results] == [True, False, False]
+    assert isinstance(results[1].error, yatiml.RecognitionError)
+    assert str(path) in str(results[1].error)
+
+    # sources are only taken when a slot is free
+    taken = list()
+
+    def sources():
+        for i in range(5):
+            taken.append(i)
+            yield io.StringIO(_text)
+
+    async def main():
+        loader = AsyncLoader(max_concurrency=1)
+        async with loader._limit():
+            task = asyncio.ensure_future(loader.load_many(sources()))
+            await asyncio.sleep(0.01)
+            assert taken == [0]
+        return await task
+
+    assert len(_run(main())) == 5
+
+    with pytest.raises(ValueError):
+        AsyncLoader(max_concurrency=0)
+
+
+def test_modes():
+    async def main():
+        with pycff.lazy_validation():
+            lazy = await aload(_text)
+        with pooling() as pool:
+            first = await aload(_text)
+            second = await aload(_text)
+        with instrument() as metrics:
+            await aload(_text)
+        return lazy, first, second, pool, metrics
+
+    lazy, first, second, pool, metrics = _run(main())
+    assert type(lazy) is not pycff.CitationCFF
+    assert first.authors[0] is second.authors[0]
+    assert pool.num_objects == 1
+    assert metrics.objects['Person'] == 1
+    assert metrics.characters_parsed == len(_text)
@@ -0,0 +1,80 @@
+"""Tests for the pycff.batch module."""
+from io import StringIO
+
+import pytest
+
+from pycff import pycff
+from pycff.batch import load_many
+
+
+def _cff_text(title: str) -> str:
+    return (
+            'cff-version: "1.1.0"\n'
+            'message: Do cite this\n'
+            'title: {}\n'
+            'version: 0.0.1\n'
+            'authors: []\n'
+            'date-released: 2020-11-15\n').format(title)
+
+
+@pytest.fixture
+def cff_files(tmp_path):
+    paths = []
+    for i in range(5):
+        path = tmp_path / 'CITATION{}.cff'.format(i)
+        path.write_text(_cff_text('Project {}'.format(i)))
+        paths.append(path)
+
+    bad_path = tmp_path / 'BROKEN.cff'
+    bad_path.write_text(_cff_text('Broken').replace('1.1.0', '0.9'))
+    paths.insert(2, bad_path)
+
+    invalid_path = tmp_path / 'INVALID.cff'
+    invalid_path.write_text(_cff_text('Invalid').replace('0.0.1', '[1]'))
+    paths.append(invalid_path)
+    return paths
+
+
+def test_load_many_serial(cff_files):
+    results = load_many(cff_files, workers=1)
+    assert [result.source for result in results] == cff_files
+    assert [result.ok for result in results] == [
+            True, True, False, True, True, True, False]
+
+    assert isinstance(results[0].cff, pycff.CitationCFF)
+    assert results[0].cff.title == 'Project 0'
+    assert results[0].error is None
+    assert results[3].cff.title == 'Project 2'
+
+    assert results[2].cff is None
+    assert '0.9' in str(results[2].error)
+    assert str(cff_files[2]) in str(results[2].error)
+    assert str(cff_files[6]) in str(results[6].error)
+
+
+def test_load_many_parallel(cff_files):
+    sources = [str(path) for path in cff_files]
+    sources.append(StringIO(_cff_text('From a stream')))
+    with cff_files[6].open() as invalid:
+        sources.append(invalid)
+        results = load_many(sources, workers=2, chunksize=2)
+    assert [result.source for result in results] == sources
+    assert [result.ok for result in results] == [
+            True, True, False, True, True, True, False, True, False]
+    assert [result.cff.title for result in results if result.ok] == [
+            'Project 0', 'Project 1', 'Project 2', 'Project 3', 'Project 4',
+            'From a stream']
+    assert str(cff_files[6]) in str(results[6].error)
+    assert str(cff_files[6]) in str(results[8].error)
+
+
+def test_load_many_missing_file(tmp_path):
+    results = load_many([tmp_path / 'CITATION.cff'], workers=1)
+    assert isinstance(results[0].error, OSError)
+
+
+def test_load_many_arguments():
+    with pytest.raises(ValueError):
+        load_many([], workers=0)
+    with pytest.raises(ValueError):
+        load_many([], chunksize=0)
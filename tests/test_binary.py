@@ -0,0 +1,82 @@
+"""Tests for the pycff.binary module."""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from pycff import pycff
+from pycff.binary import decode, encode
+
+
+_team = pycff.Entity('Science & Us Ltd.', city='Amsterdam', country='NL')
+
+_cff = pycff.CitationCFF(
+        '1.1.0', 'Do cite this', 'pycff', '0.1.0',
+        [pycff.Person('Doe', 'John', country='NL'), _team],
+        date(2020, 11, 15),
+        identifiers=[pycff.Identifier('doi', '10.1234/abc')],
+        license='Apache-2.0',
+        references=[
+            pycff.Reference(
+                'article', [_team], 'Interesting results', year=2019,
+                start=10, end=20, license='Apache-2.0'),
+            pycff.BookReference(
+                'book', 'Introduction', _team, 2020, authors=[_team])])
+
+
+def test_round_trip():
+    data = encode(_cff)
+    assert data.startswith(b'PCFF\x02')
+    assert data.count(b'Science & Us Ltd.') == 1
+
+    cff = decode(data)
+    assert type(cff) is pycff.CitationCFF
+    assert [type(ref) for ref in cff.references] == [
+            pycff.Reference, pycff.BookReference]
+    assert not hasattr(cff.references[1], 'journal')
+    assert cff.references[0].authors[0] is cff.authors[1]
+    assert pycff.dumps(cff) == pycff.dumps(_cff)
+
+    new = pycff.CitationCFF12(
+            '1.2.0', 'Do cite this', 'pycff', [_team], typ='dataset')
+    assert decode(encode(new)).to_dict() == new.to_dict()
+
+    values = [0, -1, 300, -2 ** 70, 'Ünïcode', datetime(2020, 1, 1), None]
+    decoded = decode(encode(values))
+    assert decoded == values
+    assert type(decoded[5]) is datetime
+
+
+def test_datetime():
+    tz = timezone(timedelta(hours=-5, minutes=-30))
+    values = [
+            datetime(2020, 1, 1, 12, 34, 56),
+            datetime(2020, 1, 1, 12, 34, 56, 789, tzinfo=tz),
+            datetime(1, 1, 1, 23, 59, 59, 999999, tzinfo=timezone.utc)]
+    decoded = decode(encode(values))
+    assert decoded == values
+    assert decoded[0].tzinfo is None
+    assert [value.utcoffset() for value in decoded[1:]] == [
+            tz.utcoffset(None), timedelta(0)]
+
+    ref = pycff.Reference(
+            'article', [_team], 'Interesting results',
+            date_accessed=values[1])
+    assert decode(encode(ref)).date_accessed == values[1]
+
+
+def test_lazy():
+    with pycff.lazy_validation():
+        cff = pycff.load(pycff.dumps(_cff))
+    assert type(decode(encode(cff))) is pycff.CitationCFF
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        encode({'title': 'pycff'})
+
+    data = encode(_cff)
+    for damaged in (
+            b'YAML' + data[4:], data[:4] + b'\x01' + data[5:], data[:-1],
+            data + b'\x00', data[:5] + b'\x01\x05\xff'):
+        with pytest.raises(ValueError):
+            decode(damaged)
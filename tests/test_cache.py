@@ -0,0 +1,154 @@
+"""Tests for the pycff.cache module."""
+from io import StringIO
+
+import pytest
+import yatiml
+
+from pycff import pycff
+from pycff.cache import DiskCache, LoadCache, content_hash
+
+
+def _cff_text(title: str) -> str:
+    return (
+            'cff-version: "1.1.0"\n'
+            'message: Do cite this\n'
+            'title: {}\n'
+            'version: 0.0.1\n'
+            'authors: []\n'
+            'date-released: 2020-11-15\n').format(title)
+
+
+def test_content_hash():
+    assert content_hash('a') == content_hash('a')
+    assert content_hash('a') != content_hash('b')
+
+
+def test_load_cache(tmp_path):
+    cache = LoadCache()
+    cff = cache.load(_cff_text('One'))
+    assert isinstance(cff, pycff.CitationCFF)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    path = tmp_path / 'CITATION.cff'
+    path.write_text(_cff_text('One'))
+    assert cache.load(path) is cff
+    assert cache.load(StringIO(_cff_text('One'))) is cff
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    assert cache.load(_cff_text('Two')).title == 'Two'
+    assert len(cache) == 2
+    assert cache.size_bytes == 2 * len(_cff_text('One'))
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
+    assert cache.load(_cff_text('One')) is not cff
+
+
+def test_load_cache_copy():
+    cache = LoadCache(copy=True)
+    cff1 = cache.load(_cff_text('One'))
+    cff2 = cache.load(_cff_text('One'))
+    assert cff1 is not cff2
+    assert cff1.title == cff2.title
+    assert cache.hits == 1
+
+
+def test_load_cache_eviction():
+    cache = LoadCache(max_entries=2)
+    for title in ('One', 'Two', 'One', 'Three'):
+        cache.load(_cff_text(title))
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+    # Two was least recently used, so it should be gone
+    cache.load(_cff_text('One'))
+    assert cache.hits == 2
+    cache.load(_cff_text('Two'))
+    assert cache.misses == 4
+
+    cache = LoadCache(max_entries=None, max_bytes=len(_cff_text('One')))
+    cache.load(_cff_text('One'))
+    cache.load(_cff_text('Two'))
+    assert len(cache) == 1
+    assert cache.size_bytes == len(_cff_text('Two'))
+
+
+def test_load_cache_error():
+    cache = LoadCache()
+    with pytest.raises(yatiml.RecognitionError):
+        cache.load('title: Incomplete\n')
+    assert len(cache) == 0
+
+
+def test_disk_cache(tmp_path):
+    cache = DiskCache(tmp_path / 'cache')
+    cff = cache.load(_cff_text('One'))
+    assert cff.title == 'One'
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert len(list((tmp_path / 'cache').glob('*.pcff'))) == 1
+    assert list((tmp_path / 'cache').glob('*.tmp')) == []
+
+    cff = cache.load(_cff_text('One'))
+    assert cff.title == 'One'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # shared with another instance
+    cache2 = DiskCache(tmp_path / 'cache')
+    assert cache2.load(_cff_text('One')).title == 'One'
+    assert cache2.hits == 1
+
+    cache.clear()
+    assert list((tmp_path / 'cache').glob('*.pcff')) == []
+
+
+def test_disk_cache_versions(tmp_path):
+    cache = DiskCache(tmp_path)
+    text = (
+            'cff-version: "1.2.0"\n'
+            'message: Do cite this\n'
+            'title: One\n'
+            'authors: []\n')
+    assert type(cache.load(text)) is pycff.CitationCFF12
+    cff = cache.load(text)
+    assert type(cff) is pycff.CitationCFF12
+    assert cff.date_released is None
+    assert cache.hits == 1
+    assert next(tmp_path.glob('*.pcff')).read_bytes().startswith(b'PCFF')
+
+
+def test_disk_cache_eviction(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=None)
+    cache.load(_cff_text('One'))
+    entry_size = next(tmp_path.glob('*.pcff')).stat().st_size
+
+    cache = DiskCache(tmp_path, max_bytes=int(entry_size * 2.5))
+    for title in ('Two', 'Three', 'Four'):
+        cache.load(_cff_text(title))
+    assert len(list(tmp_path.glob('*.pcff'))) == 2
+
+    # the directory is only scanned when the cache is full
+    cache = DiskCache(tmp_path, max_bytes=entry_size * 40)
+    scans = list()
+    scan = cache._scan
+
+    def counting_scan():
+        scans.append(None)
+        return scan()
+
+    cache._scan = counting_scan
+    for i in range(100):
+        cache.load(_cff_text('Title {:03}'.format(i)))
+    assert 30 <= len(list(tmp_path.glob('*.pcff'))) <= 40
+    assert len(scans) <= 20
+
+
+def test_disk_cache_damaged(tmp_path):
+    cache = DiskCache(tmp_path)
+    cache.load(_cff_text('One'))
+    next(tmp_path.glob('*.pcff')).write_bytes(b'garbage')
+
+    assert cache.load(_cff_text('One')).title == 'One'
+    assert cache.misses == 2
+    with pytest.raises(yatiml.RecognitionError):
+        cache.load('title: Incomplete\n')
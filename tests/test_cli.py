@@ -0,0 +1,90 @@
+"""Tests for the pycff.cli module."""
+import json
+import os
+
+import pytest
+
+from pycff.cli import find_cff_files, main
+
+
+_text = (
+        'cff-version: "1.1.0"\n'
+        'message: Do cite this\n'
+        'title: Testing CFF!\n'
+        'version: 0.0.1\n'
+        'authors: []\n'
+        'date-released: 2020-11-15\n')
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for subdir in ('a', 'b/c', '.git/d'):
+        (tmp_path / subdir).mkdir(parents=True)
+        (tmp_path / subdir / 'CITATION.cff').write_text(_text)
+    (tmp_path / 'b' / 'CITATION.cff').write_text(_text.replace('1.1.0', 'x'))
+    (tmp_path / 'other.cff').write_text(_text)
+    return tmp_path
+
+
+def test_find_cff_files(tree):
+    found, not_found = find_cff_files([str(tree)])
+    assert found == [
+            os.path.join(str(tree), 'a', 'CITATION.cff'),
+            os.path.join(str(tree), 'b', 'CITATION.cff'),
+            os.path.join(str(tree), 'b', 'c', 'CITATION.cff')]
+    assert not_found == []
+
+    found, not_found = find_cff_files([
+        str(tree / '*.cff'), str(tree / 'a'), str(tree / 'a' / 'CITATION.cff'),
+        str(tree / 'nonexistent')])
+    assert found == [
+            str(tree / 'other.cff'),
+            os.path.join(str(tree / 'a'), 'CITATION.cff')]
+    assert not_found == [str(tree / 'nonexistent')]
+
+
+def test_validate(tree, capsys):
+    assert main(['validate', '-j', '1', str(tree / 'a')]) == 0
+    out = capsys.readouterr().out
+    assert out == '{}: ok\n'.format(tree / 'a' / 'CITATION.cff')
+
+    assert main(['validate', '-j', '2', str(tree)]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert sorted(line for line in lines if not line.startswith(' ')) == [
+            '{}: ok'.format(tree / 'a' / 'CITATION.cff'),
+            '{}: invalid'.format(tree / 'b' / 'CITATION.cff'),
+            '{}: ok'.format(tree / 'b' / 'c' / 'CITATION.cff')]
+
+
+def test_validate_json(tree, capsys):
+    assert main(['validate', '-f', 'json', str(tree / 'b')]) == 1
+    results = [
+            json.loads(line)
+            for line in capsys.readouterr().out.splitlines()]
+    results.sort(key=lambda result: result['path'])
+    assert [result['valid'] for result in results] == [False, True]
+    assert 'x' in results[0]['error']
+    assert results[1]['error'] is None
+
+    assert main(['validate', '-q', '-f', 'json', str(tree / 'b')]) == 1
+    results = [
+            json.loads(line)
+            for line in capsys.readouterr().out.splitlines()]
+    assert [result['path'] for result in results] == [
+            str(tree / 'b' / 'CITATION.cff')]
+
+
+def test_validate_quiet(tree, capsys):
+    assert main(['validate', '-q', str(tree / 'a')]) == 0
+    assert capsys.readouterr().out == ''
+
+
+def test_validate_not_found(tmp_path, capsys):
+    assert main(['validate', str(tmp_path / 'nonexistent')]) == 1
+    assert 'No such file' in capsys.readouterr().out
+
+    assert main(['validate', str(tmp_path)]) == 1
+    assert 'No CITATION.cff files found' in capsys.readouterr().err
+
+    with pytest.raises(SystemExit):
+        main(['validate', '-j', '0', str(tmp_path)])
@@ -0,0 +1,76 @@
+"""Tests for the pycff.columnar module."""
+from datetime import date
+
+import pytest
+
+from pycff import pycff
+from pycff.columnar import author_fields, reference_fields, to_columns
+
+
+_john = pycff.Person(
+        'Doe', 'John', orcid='https://orcid.org/0000-0002-1825-0097')
+
+_team = pycff.Entity('The Team', city='Amsterdam')
+
+_article = pycff.Reference(
+        'article', [_john, _team], 'Interesting results', journal='Journal',
+        year=2019, date_published=date(2019, 5, 1), doi='10.1234/abc')
+
+_book = pycff.BookReference(
+        'book', 'Introduction', _team, 2020, authors=[_team])
+
+
+def _cff(references):
+    return pycff.CitationCFF(
+            '1.1.0', 'Do cite this', 'pycff', '0.1.0', [_john],
+            date(2020, 11, 15), references=references)
+
+
+def test_to_columns():
+    columns = to_columns([_cff([_article, _book]), _cff(None), _article])
+    assert len(columns) == 3
+    assert list(columns.columns) == list(reference_fields) + ['document']
+    assert columns.columns['typ'] == ['article', 'book', 'article']
+    assert columns.columns['year'] == [2019, 2020, 2019]
+    assert columns.columns['journal'] == ['Journal', None, 'Journal']
+    assert columns.columns['publisher'] == [None, 'The Team', None]
+    assert columns.columns['date_published'][0] == date(2019, 5, 1)
+    assert columns.columns['document'] == [0, 0, 2]
+
+    assert columns.author_offsets == [0, 2, 3, 5]
+    assert list(columns.author_columns) == list(author_fields)
+    assert columns.author_columns['family_names'] == [
+            'Doe', None, None, 'Doe', None]
+    assert columns.author_columns['name'] == [
+            None, 'The Team', 'The Team', None, 'The Team']
+
+
+def test_to_columns_fields():
+    columns = to_columns(_article, ['year', 'typ'])
+    assert columns.columns == {
+            'year': [2019], 'typ': ['article'], 'document': [0]}
+
+    empty = to_columns([], ['doi'])
+    assert (len(empty), empty.columns['doi']) == (0, [])
+
+    with pytest.raises(ValueError):
+        to_columns(_article, ['authors'])
+
+
+def test_to_numpy():
+    numpy = pytest.importorskip('numpy')
+    arrays = to_columns([_article, _book]).to_numpy()
+    assert arrays.columns['year'].dtype == numpy.int64
+    assert numpy.isnan(arrays.columns['volume']).all()
+    assert arrays.columns['date_published'][0] == numpy.datetime64(
+            '2019-05-01')
+    assert list(arrays.author_offsets) == [0, 2, 3]
+
+
+def test_to_arrow():
+    pytest.importorskip('pyarrow')
+    table = to_columns([_article, _book]).to_arrow()
+    assert table.num_rows == 2
+    assert table.column('journal').to_pylist() == ['Journal', None]
+    assert [len(authors) for authors in table.column('authors').to_pylist()
+            ] == [2, 1]
@@ -0,0 +1,80 @@
+"""Tests for the pycff.dedup module."""
+from pycff import pycff
+from pycff.dedup import (
+        deduplicate, merge, most_complete, normalize_doi, normalize_isbn,
+        normalize_text, ReferenceIndex)
+
+
+def test_normalize():
+    assert normalize_doi('https://doi.org/10.1234/ABC') == '10.1234/abc'
+    assert normalize_doi('doi: 10.1234/abc') == '10.1234/abc'
+    assert normalize_isbn('0-306-40615-2') == '9780306406157'
+    assert normalize_isbn('978 0 306 40615 7') == '9780306406157'
+    assert normalize_isbn('12345') is None
+    assert normalize_isbn('0-306-4061X-2') is None
+    assert normalize_isbn('X-306-40615-2') is None
+    assert normalize_isbn('0-8044-2957-X') == '9780804429573'
+    assert normalize_text('Müller-Lüdenscheidt') == 'mullerludenscheidt'
+    assert normalize_text('Interesting  Results!') == 'interestingresults'
+
+
+def _article(title, doi=None, year=2020, family_names='Doe', **kwargs):
+    return pycff.Reference(
+            'article', [pycff.Person(family_names, 'John')], title,
+            doi=doi, year=year, **kwargs)
+
+
+def test_reference_index():
+    publisher = pycff.Entity('Science \'r Us Ltd.')
+    references = [
+            _article('Interesting results', '10.1234/abc'),
+            _article('Other results', '10.1234/ABC'),
+            _article('Unrelated results', '10.1234/xyz'),
+            _article('INTERESTING RESULTS.', family_names='DOE'),
+            _article('Interesting results', year=2019),
+            pycff.BookReference(
+                'book', 'A book', publisher, 2000, authors=[],
+                isbn='0-306-40615-2'),
+            pycff.BookReference(
+                'book', 'A Book', publisher, 2001, authors=[],
+                isbn='978-0-306-40615-7')]
+
+    index = ReferenceIndex(references)
+    assert len(index) == 7
+    assert index.duplicates() == [[0, 1, 3], [5, 6]]
+    assert index.roots() == [0, 0, 2, 0, 4, 5, 5]
+    assert index.group_of(3) == 0
+
+    index.add(_article('Unrelated results', '10.1234/XYZ'))
+    assert index.group_of(7) == 2
+
+    index.add(pycff.BookReference(
+            'book', 'Another book', publisher, 2000, authors=[],
+            isbn='0-306-4061X-2'))
+    assert index.group_of(8) == 8
+
+
+def test_merge():
+    sparse = _article('Interesting results', '10.1234/abc')
+    full = _article(
+            'Interesting Results', '10.1234/ABC', journal='Journal',
+            volume=42)
+
+    merged = merge([sparse, full])
+    assert merged.title == 'Interesting results'
+    assert merged.doi == '10.1234/abc'
+    assert merged.journal == 'Journal'
+    assert merged.volume == 42
+
+    merged = merge([sparse, full], most_complete)
+    assert merged.title == 'Interesting Results'
+
+    merged = merge(
+            [sparse, full], most_complete, {'doi': lambda r: r is full})
+    assert merged.title == 'Interesting Results'
+    assert merged.doi == '10.1234/abc'
+
+    result = deduplicate([sparse, _article('Other results'), full])
+    assert len(result) == 2
+    assert result[0].journal == 'Journal'
+    assert result[1].title == 'Other results'
@@ -0,0 +1,132 @@
+"""Tests for the pycff.export module."""
+from datetime import date
+import io
+import json
+
+import pytest
+
+from pycff import pycff, versions
+from pycff.export import export, iter_export
+
+
+_john = pycff.Person('Doe', 'John Paul', name_particle='van')
+
+_stacey = pycff.Person('Wu', 'Stacey')
+
+_publisher = pycff.Entity('Science & Us Ltd.', city='Amsterdam')
+
+_article = pycff.Reference(
+        'article', [_john, _stacey], 'Interesting results',
+        journal='Journal of Results', volume=12, issue=3, start=10, end=20,
+        year=2019, month=5, doi='10.1234/abc')
+
+_book = pycff.BookReference(
+        'book', 'Introduction to Interesting Things', _publisher, 2019,
+        authors=[_publisher], edition='2')
+
+
+def _cff(references):
+    return pycff.CitationCFF(
+            '1.1.0', 'Do cite this', 'pycff', '0.1.0', [_stacey],
+            date(2020, 11, 15), references=references,
+            repository_code='https://github.com/citation-file-format/pycff')
+
+
+def test_export_bibtex():
+    assert export(_cff([_article, _book]), 'bibtex') == (
+            '@misc{wu2020,\n'
+            '  author = {Wu, Stacey},\n'
+            '  title = {pycff},\n'
+            '  version = {0.1.0},\n'
+            '  year = {2020},\n'
+            '  month = nov,\n'
+            '  url = {https://github.com/citation-file-format/pycff}\n'
+            '}\n'
+            '\n'
+            '@article{doe2019,\n'
+            '  author = {van Doe, John Paul and Wu, Stacey},\n'
+            '  title = {Interesting results},\n'
+            '  journal = {Journal of Results},\n'
+            '  volume = {12},\n'
+            '  number = {3},\n'
+            '  pages = {10--20},\n'
+            '  year = {2019},\n'
+            '  month = may,\n'
+            '  doi = {10.1234/abc}\n'
+            '}\n'
+            '\n'
+            '@book{science2019,\n'
+            '  author = {{Science \\& Us Ltd.}},\n'
+            '  title = {Introduction to Interesting Things},\n'
+            '  publisher = {Science \\& Us Ltd.},\n'
+            '  address = {Amsterdam},\n'
+            '  edition = {2},\n'
+            '  year = {2019}\n'
+            '}\n')
+
+
+def test_export_csl_json():
+    items = json.loads(export(_cff([_article]), 'csl-json'))
+    assert [item['type'] for item in items] == ['software', 'article-journal']
+    assert items[1]['author'][0] == {
+            'family': 'Doe', 'given': 'John Paul',
+            'non-dropping-particle': 'van'}
+    assert items[1]['issued'] == {'date-parts': [[2019, 5]]}
+    assert items[1]['page'] == '10-20'
+    assert json.loads(export([], 'csl-json')) == []
+
+
+def test_export_ris_apa():
+    ris = export(_article, 'ris')
+    assert ris.startswith('TY  - JOUR\nAU  - van Doe, John Paul\n')
+    assert 'SP  - 10\nEP  - 20\n' in ris
+    assert ris.endswith('ID  - doe2019\nER  - \n')
+
+    assert export([_article, _book], 'apa') == (
+            'van Doe, J. P., & Wu, S. (2019). Interesting results. Journal'
+            ' of Results, 12(3), 10–20. https://doi.org/10.1234/abc\n'
+            'Science & Us Ltd. (2019). Introduction to Interesting Things'
+            ' (2 ed.). Science & Us Ltd.\n')
+
+
+def test_export_cff12():
+    text = (
+            'cff-version: "1.2.0"\n'
+            'message: Do cite this\n'
+            'title: pycff\n'
+            'version: 0.1.0\n'
+            'authors:\n'
+            '  - family-names: Wu\n'
+            '    given-names: Stacey\n')
+    software = versions.load(text)
+    assert type(software) is pycff.CitationCFF12
+    assert export(software, 'apa') == (
+            'Wu, S. (n.d.). pycff (Version 0.1.0) [Computer software].\n')
+    assert export(software, 'ris').startswith('TY  - COMP\n')
+
+    dataset = versions.load(text + 'type: dataset\n')
+    items = json.loads(export(dataset, 'csl-json'))
+    assert items[0]['type'] == 'dataset'
+
+
+def test_export_batch():
+    documents = (_cff([_article]) for _ in range(3))
+    stream = io.StringIO()
+    assert export(documents, 'bibtex', stream, references=False) is None
+    keys = [line for line in stream.getvalue().splitlines() if '@' in line]
+    assert keys == ['@misc{wu2020,', '@misc{wu2020a,', '@misc{wu2020b,']
+
+    chunks = list(iter_export([_cff([_article]), _article], 'ris'))
+    assert len(chunks) == 5
+    assert 'ID  - doe2019a\n' in chunks[3]
+
+    anonymous = pycff.Reference('generic', [], 'Anonymous')
+    refa = pycff.Reference('generic', [pycff.Person('Refa', 'A.')], 'Refa')
+    ris = export([refa] + [anonymous] * 30, 'ris')
+    keys = [line[6:] for line in ris.splitlines() if line.startswith('ID')]
+    assert keys[:3] == ['refa', 'ref', 'refb']
+    assert keys[-1] == 'refad'
+    assert len(set(keys)) == 31
+
+    with pytest.raises(ValueError):
+        iter_export(_article, 'word')
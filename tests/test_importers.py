@@ -0,0 +1,128 @@
+"""Tests for the pycff.importers module."""
+import io
+import json
+
+import pytest
+import yatiml
+
+from pycff import pycff
+from pycff.export import export
+from pycff.importers import (
+        _bibtex_types, _csl_types, iter_bibtex, iter_csl_json)
+
+
+_bibtex = r'''
+@string{jr = "Journal of R{\'e}sults"}
+
+Text outside of entries is ignored, also with an @ in it.
+
+@Article{muller2019,
+  author = {M{\"u}ller, J{\"o}rg and Anna van der Berg and {The Team}
+            and others},
+  title = "{Testing} \& more: 50\% off",
+  journal = jr # " Letters",
+  year = 2019, month = feb,
+  number = 3,
+  pages = {10--20},
+  doi = {https://doi.org/10.1234/ab_c},
+  url = {http://example.com/~user/a--b},
+}
+
+@comment{This is not an entry}
+
+@book(intro,
+  title = {Introduction to Interesting Things},
+  author = {Wu, Jr., Stacey},
+  publisher = {Science 'r Us Ltd.}, address = {Amsterdam},
+  year = {2019}
+)
+'''
+
+
+def test_iter_bibtex():
+    article, book = iter_bibtex(io.StringIO(_bibtex))
+    assert article.to_dict() == {
+            'type': 'article',
+            'authors': [
+                {'family-names': 'Müller', 'given-names': 'Jörg'},
+                {'family-names': 'Berg', 'given-names': 'Anna',
+                 'name-particle': 'van der'},
+                {'name': 'The Team'}],
+            'title': 'Testing & more: 50% off',
+            'doi': '10.1234/ab_c',
+            'end': 20,
+            'issue': 3,
+            'journal': 'Journal of Résults Letters',
+            'month': 2,
+            'start': 10,
+            'url': 'http://example.com/~user/a--b',
+            'year': 2019}
+
+    assert isinstance(book, pycff.BookReference)
+    assert book.publisher.city == 'Amsterdam'
+    assert book.authors[0].name_suffix == 'Jr.'
+
+
+def test_iter_bibtex_invalid():
+    text = '@article{a, title={A}, doi={11.1234/a}}\n@misc{b, title={B}}\n'
+    with pytest.raises(yatiml.RecognitionError):
+        list(iter_bibtex(text))
+    assert [ref.title for ref in iter_bibtex(text, skip_invalid=True)] == [
+            'B']
+
+    with pytest.raises(yatiml.RecognitionError):
+        list(iter_bibtex('@misc{b, title={B}'))
+    with pytest.raises(yatiml.RecognitionError):
+        list(iter_bibtex('@misc{b, title={B} # }'))
+
+
+def test_iter_csl_json():
+    items = [
+            {'id': 'a', 'type': 'article-journal', 'title': 'A',
+             'author': [{'family': 'Doe', 'given': 'John'}],
+             'container-title': 'Journal', 'issued': {
+                 'date-parts': [[2019, 5, 1]]}, 'page': '1-5'},
+            {'id': 'b', 'type': 'thesis', 'title': 'B', 'genre': 'PhD',
+             'author': [{'literal': 'The Team'}], 'publisher': 'Uni'}]
+    a, b = iter_csl_json(json.dumps(items))
+    assert (a.typ, a.journal, a.year, a.month, a.start, a.end) == (
+            'article', 'Journal', 2019, 5, 1, 5)
+    assert a.date_published.day == 1
+    assert (b.typ, b.thesis_type, b.authors[0].name, b.publisher.name) == (
+            'thesis', 'PhD', 'The Team', 'Uni')
+
+    with pytest.raises(yatiml.RecognitionError):
+        list(iter_csl_json('[{"title": "A"}, {"title": '))
+
+
+def test_round_trip():
+    references = [
+            pycff.Reference(
+                'article', [pycff.Person('Doe', 'John')], 'A',
+                journal='J', volume=1, issue=2, start=3, end=4, year=2019,
+                doi='10.1234/a'),
+            pycff.Reference(
+                'conference-paper', [pycff.Entity('The Team')], 'B',
+                collection_title='Proceedings', year=2020),
+            pycff.Reference('software', [], 'C', version='1.0')]
+
+    for output_format, iter_import in (
+            ('bibtex', iter_bibtex), ('csl-json', iter_csl_json)):
+        imported = list(iter_import(export(references, output_format)))
+        assert [ref.to_dict() for ref in imported] == [
+                ref.to_dict() for ref in references]
+
+
+def test_type_tables():
+    for typ, _ in _bibtex_types.values():
+        assert typ in pycff._valid_reference_types
+    for typ in _csl_types.values():
+        assert typ in pycff._valid_reference_types
+
+
+def test_process_pool(monkeypatch):
+    monkeypatch.setattr('pycff.importers._chunk_size', 2)
+    text = '\n'.join(
+            '@misc{{k{0}, title={{T{0}}}}}'.format(i) for i in range(7))
+    titles = [ref.title for ref in iter_bibtex(text, jobs=2)]
+    assert titles == ['T{}'.format(i) for i in range(7)]
@@ -0,0 +1,106 @@
+"""Tests for the pycff.incremental module."""
+import pytest
+import yatiml
+
+from pycff import pycff
+from pycff.incremental import IncrementalLoader
+
+
+_text = (
+        'cff-version: "1.1.0"\n'
+        'message: Do cite this\n'
+        'title: Testing CFF!\n'
+        'version: 0.0.1\n'
+        'authors:\n'
+        '  - family-names: Doe\n'
+        '    given-names: John\n'
+        'date-released: 2020-11-15\n'
+        'references:\n'
+        '  - type: article\n'
+        '    title: Interesting results\n'
+        '    authors: []\n'
+        '  - type: book\n'
+        '    title: Introduction to Interesting Things\n'
+        '    authors: []\n'
+        '    year: 2019\n'
+        '    publisher:\n'
+        '      name: Science \'r Us Ltd.\n')
+
+
+def test_incremental_loader():
+    loader = IncrementalLoader()
+    first = loader.load(_text)
+    assert loader.rebuilt_references == 2
+    assert first.to_dict() == pycff.load(_text).to_dict()
+
+    second = loader.load(_text)
+    assert loader.changed == []
+    assert loader.rebuilt_references == 0
+    assert second.authors is first.authors
+    assert second.references[1] is first.references[1]
+
+    text = _text.replace('year: 2019', 'year: 2020').replace(
+            'Testing CFF!', 'Testing CFF')
+    third = loader.load(text)
+    assert loader.changed == ['title']
+    assert loader.rebuilt_references == 1
+    assert third.to_dict() == pycff.load(text).to_dict()
+    assert third.references[0] is first.references[0]
+    assert third.references[1].year == 2020
+
+    # moving a reference does not rebuild it
+    lines = text.splitlines(True)
+    text = ''.join(lines[:9] + lines[12:] + lines[9:12])
+    fourth = loader.load(text)
+    assert loader.rebuilt_references == 0
+    assert fourth.references[1] is first.references[0]
+
+
+def test_incremental_loader_errors():
+    loader = IncrementalLoader()
+    first = loader.load(_text)
+
+    with pytest.raises(yatiml.RecognitionError):
+        loader.load(_text.replace('year: 2019', 'year: soon'))
+    with pytest.raises(yatiml.RecognitionError):
+        loader.load(_text.replace('2020-11-15', 'yesterday'))
+    with pytest.raises(yatiml.RecognitionError):
+        loader.load(_text + 'nonsense: 1\n')
+    assert loader.cff is first
+
+    # anchors are supported, but need a full load
+    text = _text.replace('authors: []', 'authors: &no_one []', 1).replace(
+            '    authors: []\n    year', '    authors: *no_one\n    year')
+    assert loader.load(text).to_dict() == first.to_dict()
+    assert loader.rebuilt_references == 2
+
+
+def test_incremental_loader_versions():
+    loader = IncrementalLoader()
+    text = _text.replace('"1.1.0"', '"1.2.0"').replace(
+            'version: 0.0.1\n', 'type: software\n').replace(
+            'date-released: 2020-11-15\n', '')
+    first = loader.load(text)
+    assert isinstance(first, pycff.CitationCFF12)
+    assert first.typ == 'software'
+    assert first.version is None
+
+    second = loader.load(text.replace('Testing CFF!', 'Testing CFF'))
+    assert isinstance(second, pycff.CitationCFF12)
+    assert loader.changed == ['title']
+    assert second.authors is first.authors
+
+    with pytest.raises(yatiml.RecognitionError):
+        loader.load(text.replace('type: software', 'type: sofware'))
+    assert loader.cff is second
+
+    # switching versions rebuilds everything
+    third = loader.load(_text)
+    assert not isinstance(third, pycff.CitationCFF12)
+    assert loader.rebuilt_references == 2
+    assert third.authors is not first.authors
+    assert third.to_dict() == pycff.load(_text).to_dict()
+
+    with pytest.raises(yatiml.RecognitionError):
+        loader.load(_text.replace('"1.1.0"', '"0.9.0"'))
+    assert loader.cff is third
@@ -0,0 +1,92 @@
+"""Tests for the pycff.instrumentation module."""
+import threading
+
+from pycff import instrumentation, pycff
+from pycff.instrumentation import instrument
+
+
+_text = (
+        'cff-version: "1.1.0"\n'
+        'message: Do cite this\n'
+        'title: Testing CFF!\n'
+        'version: 0.0.1\n'
+        'authors:\n'
+        '  - family-names: Doe\n'
+        '    given-names: John\n'
+        '    orcid: https://orcid.org/0000-0002-1825-0097\n'
+        '  - name: Science \'r Us Ltd.\n'
+        'date-released: 2020-11-15\n'
+        'url: https://example.com\n')
+
+
+def test_instrument():
+    reported = list()
+    with instrument(reported.append) as metrics:
+        cff = pycff.load(_text)
+        pycff.dumps(cff)
+
+    assert reported == [metrics]
+    assert metrics.objects == {'CitationCFF': 1, 'Person': 1, 'Entity': 1}
+    assert metrics.validations == {
+            'cff_version': 1, 'date': 1, 'url': 1, 'orcid': 1}
+    assert metrics.characters_parsed == len(_text)
+    assert all(seconds > 0.0 for seconds in metrics.timings.values())
+
+    values = metrics.as_dict()
+    assert values['objects.Person'] == 1
+    assert values['validations.orcid'] == 1
+    assert values['time.parse'] == metrics.timings['parse']
+
+
+def test_instrument_nested():
+    with instrument() as outer:
+        pycff.Person('Doe', 'John')
+        with instrument() as inner:
+            pycff.Entity('Science \'r Us Ltd.', email='info@example.com')
+    assert inner.objects == {'Entity': 1}
+    assert outer.objects == {'Person': 1, 'Entity': 1}
+    assert outer.validations == {'email': 1}
+
+
+def test_threads():
+    # two overlapping contexts in different threads, entered and left in
+    # an interleaved order
+    entered = threading.Barrier(2)
+    left = threading.Event()
+    results = dict()
+
+    def run(name, count, leave_first):
+        with instrument() as metrics:
+            entered.wait()
+            for _ in range(count):
+                pycff.Person('Doe', 'John')
+            if leave_first:
+                left.set()
+            else:
+                left.wait()
+        results[name] = metrics
+        results[name + '_after'] = getattr(
+                instrumentation._active, 'metrics', None)
+
+    threads = [
+            threading.Thread(target=run, args=('a', 2, True)),
+            threading.Thread(target=run, args=('b', 3, False))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results['a'].objects == {'Person': 2}
+    assert results['b'].objects == {'Person': 3}
+    assert results['a_after'] is None
+    assert results['b_after'] is None
+
+
+def test_disabled():
+    assert getattr(instrumentation._active, 'metrics', None) is None
+    with instrument() as metrics:
+        pass
+    pycff.load(_text)
+    assert getattr(instrumentation._active, 'metrics', None) is None
+    assert not metrics.objects
+    assert metrics.characters_parsed == 0
@@ -0,0 +1,76 @@
+"""Tests for the pycff.people module."""
+from datetime import date
+
+import pytest
+
+from pycff import pycff
+from pycff.people import PersonIndex
+
+
+_orcid = 'https://orcid.org/0000-0002-1825-0097'
+
+_other_orcid = 'https://orcid.org/0000-0001-5109-3700'
+
+
+def _cff(authors, references=None):
+    return pycff.CitationCFF(
+            '1.1.0', 'Do cite this', 'Testing CFF!', '0.0.1', authors,
+            date(2020, 11, 15), references=references)
+
+
+def _reference(authors):
+    return pycff.Reference('article', authors, 'Interesting results')
+
+
+def test_person_index():
+    jd = pycff.Person('Doe', 'John', orcid=_orcid)
+    jd_name = pycff.Person('doe', 'J.')
+    jd_email = pycff.Person('Doe', 'Johnny', email='J.Doe@example.com')
+    other_jd = pycff.Person('Doe', 'Jane', orcid=_other_orcid)
+    wu = pycff.Person('Wu', 'Stacey', email='j.doe@example.com')
+    entity = pycff.Entity('Science \'r Us Ltd.')
+
+    index = PersonIndex()
+    assert index.add(_cff([jd, entity], [_reference([wu])])) == 0
+    assert index.add(
+            _cff([jd_name], [_reference([jd]), _reference([other_jd])]),
+            'second') == 'second'
+    with pytest.raises(ValueError):
+        index.add(_cff([]), 'second')
+
+    assert len(index) == 3
+    identity = index.resolve(jd)
+    assert identity.orcid == '0000-0002-1825-0097'
+    assert index.resolve(jd_name) is identity
+    assert index.resolve(other_jd) is not identity
+    assert index.resolve(wu) is not identity
+    assert index.resolve(pycff.Person('Nobody', 'Known')) is None
+
+    assert index.documents_involving(jd) == {0, 'second'}
+    assert index.references_involving(jd) == {('second', 0)}
+    assert index.references_involving(other_jd) == {('second', 1)}
+    assert index.documents_involving(wu) == set()
+
+    # email identifies the same person as wu, although the name differs
+    assert index.resolve(jd_email) is index.resolve(wu)
+    index.add(_cff([jd_email]))
+    assert index.documents_involving(wu) == {2}
+
+
+def test_person_index_given_names():
+    john = pycff.Person('Doe', 'John')
+    jane = pycff.Person('Doe', 'Jane')
+    jp = pycff.Person('Doe', 'J.P.')
+
+    index = PersonIndex([_cff([john, jane])])
+    assert len(index) == 2
+    assert index.resolve(john) is not index.resolve(jane)
+    assert index.resolve(pycff.Person('DOE', 'jane')) is index.resolve(jane)
+    assert index.resolve(pycff.Person('Doe', 'Jo')) is None
+
+    index = PersonIndex([_cff([jp, john])])
+    assert len(index) == 1
+    assert index.resolve(pycff.Person('Doe', 'John Paul')) is not None
+    assert index.resolve(pycff.Person('Doe', 'John Peter')) is not None
+    assert index.resolve(pycff.Person('Doe', 'John Mark')) is None
+    assert index.resolve(jane) is None
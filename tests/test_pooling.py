@@ -0,0 +1,70 @@
+"""Tests for the pycff.pooling module."""
+import copy
+import io
+import pickle
+
+import pytest
+
+from pycff import pycff
+from pycff.batch import load_many
+from pycff.pooling import Pool, pooling
+
+
+_text = (
+        'cff-version: "1.1.0"\n'
+        'message: Please cite this\n'
+        'title: {}\n'
+        'version: "1.0"\n'
+        'date-released: 2020-11-15\n'
+        'license: Apache-2.0\n'
+        'authors:\n'
+        '  - family-names: Doe\n'
+        '    given-names: John\n'
+        '    country: NL\n'
+        '  - name: Science \'r Us Ltd.\n'
+        'identifiers:\n'
+        '  - type: doi\n'
+        '    value: 10.1234/abc\n')
+
+
+def test_pooling():
+    with pooling() as pool:
+        first = pycff.load(_text.format('first'))
+        second = pycff.load(_text.format('second'))
+        third = pycff.from_dict(first.to_dict())
+    assert pycff.load(_text.format('first')).authors[0] is not (
+            first.authors[0])
+
+    assert first.authors[0] is second.authors[0] is third.authors[0]
+    assert first.authors[1] is second.authors[1]
+    assert first.identifiers[0] is second.identifiers[0]
+    assert first.license is second.license
+    assert first is not third
+    assert (pool.num_objects, pool.num_strings) == (3, 12)
+
+    with pytest.raises(AttributeError):
+        first.authors[0].country = 'BE'
+    assert isinstance(first.authors[0], pycff.Person)
+    assert pycff.dumps(first) == pycff.dumps(
+            pycff.load(_text.format('first')))
+
+    for copied in (
+            copy.deepcopy(first), pickle.loads(pickle.dumps(first))):
+        assert type(copied.authors[0]) is pycff.Person
+        copied.authors[0].country = 'BE'
+
+
+def test_pool_add():
+    pool = Pool()
+    with pycff.lazy_validation():
+        cff = pool.add(pycff.load(_text.format('first')))
+    assert cff.validated and cff.authors[0].validated
+    with pooling(pool):
+        result, = load_many([io.StringIO(_text.format('second'))], workers=1)
+    assert result.cff.authors[0] is cff.authors[0]
+
+    other = Pool()
+    person = pycff.Person('Doe', 'John', country='NL')
+    assert other.add([person, person]) == [person, person]
+    assert pool.add(person) is cff.authors[0]
+    assert other.add(cff.authors[0]) is person
@@ -0,0 +1,78 @@
+"""Tests for the pycff.streaming module."""
+from io import StringIO
+
+import pytest
+import yatiml
+
+from pycff import pycff
+from pycff.streaming import iter_references
+
+
+_text = (
+        'cff-version: "1.1.0"\n'
+        'message: Do cite this\n'
+        'title: Testing CFF!\n'
+        'authors:\n'
+        '  - family-names: Doe\n'
+        '    given-names: John\n'
+        'references:\n'
+        '  - type: article\n'
+        '    title: Interesting results\n'
+        '    doi: 10.1234/123-4-567\n'
+        '    collection-title: Journal of Interesting Results\n'
+        '    authors:\n'
+        '      - family-names: Doe\n'
+        '        given-names: Jane\n'
+        '  - type: book\n'
+        '    title: Introduction to Basic Stuff\n'
+        '    publisher:\n'
+        '      name: Science \'r Us Ltd.\n'
+        '    year: 2019\n'
+        '    authors:\n'
+        '      - family-names: Wu\n'
+        '        given-names: Stacey\n'
+        'version: 0.0.1\n'
+        'date-released: 2020-11-15\n')
+
+
+def test_iter_references():
+    references = iter_references(StringIO(_text))
+    assert not isinstance(references, list)
+
+    ref = next(references)
+    assert type(ref) is pycff.Reference
+    assert ref.typ == 'article'
+    assert ref.doi == '10.1234/123-4-567'
+    assert ref.collection_title == 'Journal of Interesting Results'
+    assert ref.authors[0].given_names == 'Jane'
+
+    ref = next(references)
+    assert isinstance(ref, pycff.BookReference)
+    assert ref.publisher.name == 'Science \'r Us Ltd.'
+    assert ref.year == 2019
+
+    with pytest.raises(StopIteration):
+        next(references)
+
+
+def test_iter_references_file(tmp_path):
+    path = tmp_path / 'CITATION.cff'
+    path.write_text(_text)
+    assert [ref.typ for ref in iter_references(path)] == ['article', 'book']
+    assert [ref.typ for ref in iter_references(_text)] == ['article', 'book']
+
+
+def test_iter_references_no_references():
+    assert list(iter_references('title: Testing CFF!\n')) == []
+
+
+def test_iter_references_errors():
+    references = iter_references(_text.replace('10.1234', '11.1234'))
+    with pytest.raises(yatiml.RecognitionError, match='line 8'):
+        next(references)
+
+    with pytest.raises(yatiml.RecognitionError):
+        list(iter_references('references: 42\n'))
+
+    with pytest.raises(yatiml.RecognitionError):
+        list(iter_references('- type: article\n'))
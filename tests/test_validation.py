@@ -0,0 +1,130 @@
+"""Tests for the pycff.validation module."""
+from datetime import date
+
+from pycff import pycff, versions
+from pycff.validation import check, check_object
+
+
+_text = (
+        'cff-version: "1.1.0"\n'
+        'message: Do cite this\n'
+        'title: Testing CFF!\n'
+        'version: 0.0.1\n'
+        'authors:\n'
+        '  - family-names: Doe\n'
+        '    given-names: John\n'
+        '    orcid: https://orcid.org/0000-0002-1825-0097\n'
+        '  - name: Science \'r Us Ltd.\n'
+        'date-released: 2020-11-15\n'
+        'identifiers:\n'
+        '  - type: doi\n'
+        '    value: 10.1234/123\n'
+        'references:\n'
+        '  - type: article\n'
+        '    title: Interesting results\n'
+        '    doi: 10.1234/123-4-567\n'
+        '    authors:\n'
+        '      - family-names: Doe\n'
+        '        given-names: Jane\n')
+
+
+def test_check_valid():
+    assert check(_text) == []
+    assert check_object(pycff.load(_text)) == []
+
+
+def test_check_all_problems():
+    text = (
+            _text
+            .replace('"1.1.0"', '"1.3.0"')
+            .replace('0000-0002-1825-0097', '0000-0002-1825')
+            .replace('type: doi', 'type: dio')
+            .replace('10.1234/123-4-567', 'doi:10.1234/123-4-567')
+            .replace('        given-names: Jane\n', '        colour: blue\n'))
+    problems = check(text)
+    assert [(p.path, p.rule, p.line, p.column) for p in problems] == [
+            ('cff-version', 'cff_version', 1, 14),
+            ('authors[0].orcid', 'orcid', 8, 12),
+            ('identifiers[0].type', 'identifier_type', 12, 11),
+            ('references[0].doi', 'doi', 17, 10),
+            ('references[0].authors[0].colour', 'unknown_key', 20, 9),
+            ('references[0].authors[0].given-names', 'missing_key', 19, 9)]
+    assert problems[0].value == '1.3.0'
+    assert 'did you mean "doi"' in problems[2].message
+    assert str(problems[3]).startswith('17:10: references[0].doi: ')
+
+
+def test_check_versions():
+    text = (
+            'cff-version: 1.2.0\n'
+            'message: Do cite this\n'
+            'title: Testing CFF!\n'
+            'authors: []\n')
+    assert check(text) == []
+    problems = check(text + 'type: book\n')
+    assert [(p.path, p.rule) for p in problems] == [('type', 'cff_type')]
+
+    problems = check(text.replace('1.2.0', '1.1.0'))
+    assert [(p.path, p.rule) for p in problems] == [
+            ('version', 'missing_key'), ('date-released', 'missing_key')]
+
+
+def test_check_structure():
+    problems = check('title: [1, 2]\nauthors: 42\nfoo: bar\n')
+    rules = [(p.path, p.rule) for p in problems]
+    assert ('title', 'type') in rules
+    assert ('authors', 'type') in rules
+    assert ('foo', 'unknown_key') in rules
+    assert ('message', 'missing_key') in rules
+    assert ('date-released', 'missing_key') in rules
+
+    problems = check('title: [unclosed\n')
+    assert len(problems) == 1
+    assert problems[0].rule == 'syntax'
+    assert problems[0].line == 2
+
+    problems = check('title: control \x07 character\n')
+    assert [p.rule for p in problems] == ['syntax']
+
+
+def test_check_file(tmp_path):
+    path = tmp_path / 'CITATION.cff'
+    path.write_text(_text.replace('2020-11-15', 'yesterday'))
+    problems = check(path)
+    assert [(p.path, p.rule, p.value) for p in problems] == [
+            ('date-released', 'type', 'yesterday')]
+
+
+def test_check_object():
+    cff = pycff.load(_text)
+    cff.doi = '10.1234'
+    cff.authors[0].email = 'nobody'
+    cff.references[0].title = None
+    cff.date_released = date(2020, 11, 15)
+
+    problems = check_object(cff)
+    assert [(p.path, p.rule, p.value) for p in problems] == [
+            ('authors[0].email', 'email', 'nobody'),
+            ('references[0].title', 'missing_key', None),
+            ('doi', 'doi', '10.1234')]
+    assert problems[0].line is None
+
+
+def test_check_object_versions():
+    cff = versions.load(
+            'cff-version: 1.2.0\n'
+            'message: Do cite this\n'
+            'title: Testing CFF!\n'
+            'authors: []\n')
+    assert check_object(cff) == []
+    cff.typ = 'book'
+    cff.cff_version = '1.1.0'
+    problems = check_object(cff)
+    assert [(p.path, p.rule) for p in problems] == [
+            ('cff-version', 'cff_version_12'), ('type', 'cff_type')]
+
+    cff = pycff.load(_text)
+    cff.cff_version = '1.2.0'
+    problems = check_object(cff)
+    assert [(p.path, p.rule) for p in problems] == [
+            ('cff-version', 'cff_version')]
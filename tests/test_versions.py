@@ -0,0 +1,62 @@
+"""Tests for the pycff.versions module."""
+import io
+
+import pytest
+import yatiml
+
+from pycff import pycff
+from pycff.batch import load_many
+from pycff.versions import _load_function, load, peek_version
+
+
+_header = (
+        'cff-version: {}\n'
+        'message: Please cite this\n'
+        'title: pycff\n'
+        'authors:\n'
+        '  - family-names: Doe\n'
+        '    given-names: John\n')
+
+_dated = 'version: "1.0"\ndate-released: 2020-11-15\n'
+
+
+def test_peek_version():
+    assert peek_version(_header.format('"1.2.0"')) == '1.2.0'
+    assert peek_version("# cff-version: 1.0.3\ncff-version: '1.1.0'") == (
+            '1.1.0')
+    assert peek_version('cff-version: 1.0.3  # old\n') == '1.0.3'
+    assert peek_version('references:\n  - cff-version: 1.2.0\n') is None
+    assert peek_version('{"cff-version": "1.2.0"}') is None
+
+
+def test_load_versions():
+    old = load(_header.format('1.0.3') + _dated)
+    assert type(old) is pycff.CitationCFF
+    assert old.cff_version == '1.0.3'
+
+    new = load(
+            _header.format('1.2.0') + 'type: dataset\n'
+            'preferred-citation:\n'
+            '  type: article\n'
+            '  authors: []\n'
+            '  title: Interesting results\n')
+    assert type(new) is pycff.CitationCFF12
+    assert new.version is None
+    assert new.preferred_citation.title == 'Interesting results'
+    assert new.to_dict()['type'] == 'dataset'
+    assert type(load(pycff.dumps(new))) is pycff.CitationCFF12
+
+    with pytest.raises(yatiml.RecognitionError):
+        load(_header.format('1.3.0') + _dated)
+    with pytest.raises(yatiml.RecognitionError):
+        load(_header.format('1.1.0'))
+
+
+def test_load_many_mixed():
+    streams = [
+            io.StringIO(_header.format(version) + _dated)
+            for version in ('1.0.1', '1.1.0', '1.2.0') * 3]
+    results = load_many(streams, workers=1)
+    assert [result.cff.cff_version for result in results] == [
+            '1.0.1', '1.1.0', '1.2.0'] * 3
+    assert _load_function.cache_info().currsize <= 2